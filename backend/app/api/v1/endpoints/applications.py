@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from typing import List, Optional
+from app.core.config import settings
 from app.core.security import get_current_user, CurrentUser
 from app.services.firebase.application_service import application_service
+from app.services.matching import application_ranker
+from app.services.documents import document_parser
+from app.utils.upload import read_upload, CV_KINDS, CV_TYPE_ERROR
+from .cv_documents import get_cv_document_text
 from app.schemas.application import (
     ApplicationCreate,
     ApplicationUpdate,
     ApplicationResponse,
+    RankedApplication,
 )
 
 router = APIRouter()
@@ -29,6 +35,59 @@ async def get_applications(
     return await application_service.get_applications(current_user.uid, limit)
 
 
+@router.post("/rank", response_model=List[RankedApplication])
+async def rank_applications(
+    file: Optional[UploadFile] = File(None),
+    cv_document_id: Optional[str] = Form(None),
+    limit: int = Form(50, ge=1, le=200),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Sort the current user's applications by how well a CV fits each job.
+
+    Pass either the CV file or the `cv_document_id` of a stored CV.
+    Scoring uses local text embeddings of the saved job descriptions (or the
+    position title when none was saved); it is not an AI use.
+    """
+    if cv_document_id:
+        cv_text = await get_cv_document_text(current_user.uid, cv_document_id)
+    else:
+        if file is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A CV file or cv_document_id is required.",
+            )
+
+        # Read and validate file
+        file_content, content_type = await read_upload(
+            file, CV_KINDS, settings.CV_MAX_UPLOAD_MB, CV_TYPE_ERROR
+        )
+
+        # Extract text
+        try:
+            cv_text = await document_parser.extract_text(
+                file_content, content_type, file.filename
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+
+        if not cv_text.strip():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not extract text from the CV.",
+            )
+
+    applications = await application_service.get_applications(current_user.uid, limit)
+    ranked = application_ranker.rank(current_user.uid, cv_text, applications)
+    return [
+        RankedApplication(application=application, fit_score=score)
+        for application, score in ranked
+    ]
+
+
 @router.get("/{app_id}", response_model=ApplicationResponse)
 async def get_application(
     app_id: str,
@@ -1,12 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from app.core.security import get_current_user, CurrentUser
 from app.services.firebase import user_service, cover_letter_service
 from app.services.firebase.usage_gate import authorize_ai_feature
-from app.services.ai import generate_cover_letter
+from app.services.ai import (
+    CVContext,
+    generate_cover_letter,
+    generate_cover_letter_variants,
+    stream_cover_letter,
+    context_cache,
+)
+from app.services.ai.cover_letter_generator import build_cover_letter_response
+from app.services.ai.prompts import prompt_registry
+from app.utils.single_flight import fingerprint
+from app.utils.sse import format_sse, SSE_HEADERS
+from .cv_documents import get_cv_document_text
 from app.schemas.cover_letter import (
     CoverLetterRequest,
+    CoverLetterVariantsRequest,
     CoverLetterResponse,
+    CoverLetterVariantsResponse,
     CoverLetterUpdate,
     CoverLetterListItem,
 )
@@ -14,27 +28,49 @@ from app.schemas.cover_letter import (
 router = APIRouter()
 
 
+async def _cv_context(user_id: str, stored_text: Optional[str]) -> Optional[CVContext]:
+    """The stored CV's context (skills, latest analysis) to ground a letter in."""
+    if stored_text is None:
+        return None
+    return await context_cache.open(user_id, stored_text)
+
+
+async def _stored_cv_text(user_id: str, cv_document_id: Optional[str]) -> Optional[str]:
+    """Text of the requested stored CV (checked before a use is charged)."""
+    if not cv_document_id:
+        return None
+    return await get_cv_document_text(user_id, cv_document_id)
+
+
 @router.post("/generate", response_model=CoverLetterResponse)
 async def generate_cover_letter_endpoint(
     request: CoverLetterRequest,
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Generate a personalized cover letter using AI."""
-    # Check free uses / subscription
+    stored_text = await _stored_cv_text(current_user.uid, request.cv_document_id)
+    # Check free uses / subscription; identical in-flight requests are charged once
     user = await user_service.get_user(current_user.uid)
     plan = user.plan if user else "free"
 
-    await authorize_ai_feature(current_user.uid, plan)
-
-    # Generate cover letter
-    cover_letter = await generate_cover_letter(
-        job_title=request.job_title,
-        company_name=request.company_name,
-        job_description=request.job_description,
-        tone=request.tone,
-        additional_context=request.additional_context,
+    charge = await authorize_ai_feature(
+        current_user.uid,
+        plan,
+        request_key=fingerprint("cover_letter", request.model_dump_json()),
     )
 
+    # Generate cover letter, grounded in the stored CV when one is given
+    with charge:
+        context = await _cv_context(current_user.uid, stored_text)
+        cover_letter = await generate_cover_letter(
+            job_title=request.job_title,
+            company_name=request.company_name,
+            job_description=request.job_description,
+            tone=request.tone,
+            additional_context=request.additional_context,
+            context=context,
+        )
+
     # Save to Firestore
     letter_id = await cover_letter_service.save_cover_letter(
         current_user.uid, cover_letter
@@ -45,6 +81,120 @@ async def generate_cover_letter_endpoint(
     return cover_letter
 
 
+@router.post("/generate/variants", response_model=CoverLetterVariantsResponse)
+async def generate_cover_letter_variants_endpoint(
+    request: CoverLetterVariantsRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Generate the same cover letter in several tones to compare them.
+
+    The tones are generated concurrently and saved together, and the
+    request counts as a single use.
+    """
+    stored_text = await _stored_cv_text(current_user.uid, request.cv_document_id)
+    user = await user_service.get_user(current_user.uid)
+    plan = user.plan if user else "free"
+
+    charge = await authorize_ai_feature(
+        current_user.uid,
+        plan,
+        request_key=fingerprint("cover_letter_variants", request.model_dump_json()),
+    )
+
+    with charge:
+        context = await _cv_context(current_user.uid, stored_text)
+        cover_letters = await generate_cover_letter_variants(
+            job_title=request.job_title,
+            company_name=request.company_name,
+            job_description=request.job_description,
+            tones=list(dict.fromkeys(request.tones)),
+            additional_context=request.additional_context,
+            context=context,
+        )
+
+    # Save all variants in one batched write
+    letter_ids = await cover_letter_service.save_cover_letters(
+        current_user.uid, cover_letters
+    )
+    for cover_letter, letter_id in zip(cover_letters, letter_ids):
+        cover_letter.id = letter_id
+        cover_letter.user_id = current_user.uid
+
+    return CoverLetterVariantsResponse(letters=cover_letters)
+
+
+@router.post("/generate/stream")
+async def stream_cover_letter_endpoint(
+    request: CoverLetterRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Generate a cover letter, streaming it as Server-Sent Events.
+
+    Events:
+    - `chunk`: `{"text": "..."}` for each generated fragment
+    - `done`: the saved CoverLetterResponse once generation completes
+    - `error`: `{"detail": "..."}` if generation fails mid-stream
+    """
+    stored_text = await _stored_cv_text(current_user.uid, request.cv_document_id)
+    # Check free uses / subscription before opening the stream
+    user = await user_service.get_user(current_user.uid)
+    plan = user.plan if user else "free"
+
+    await authorize_ai_feature(current_user.uid, plan)
+
+    context = await _cv_context(current_user.uid, stored_text)
+
+    template = prompt_registry.select("cover_letter")
+
+    async def event_stream():
+        parts: list[str] = []
+        try:
+            async for chunk in stream_cover_letter(
+                job_title=request.job_title,
+                company_name=request.company_name,
+                job_description=request.job_description,
+                tone=request.tone,
+                additional_context=request.additional_context,
+                context=context,
+                template=template,
+            ):
+                parts.append(chunk)
+                yield format_sse("chunk", {"text": chunk})
+        except HTTPException as e:
+            yield format_sse("error", {"detail": e.detail})
+            return
+        except Exception:
+            yield format_sse(
+                "error", {"detail": "Failed to generate cover letter. Please try again."}
+            )
+            return
+
+        cover_letter = build_cover_letter_response(
+            request.job_title,
+            request.company_name,
+            request.tone,
+            "".join(parts),
+            template.version,
+        )
+
+        # Save to Firestore once the full letter is available
+        letter_id = await cover_letter_service.save_cover_letter(
+            current_user.uid, cover_letter
+        )
+        cover_letter.id = letter_id
+        cover_letter.user_id = current_user.uid
+
+        yield format_sse("done", cover_letter.model_dump(mode="json"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get("/", response_model=List[CoverLetterListItem])
 async def get_cover_letters(
     limit: int = 20,
@@ -1,77 +1,276 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from typing import Optional, Union, List
+from app.core.config import settings
+from app.core.rate_limit import ROUTE_COSTS, charge_rate_limit
 from app.core.security import get_current_user, get_optional_user, CurrentUser
 from app.services.firebase import user_service, cv_service
-from app.services.firebase.usage_gate import authorize_ai_feature
-from app.services.ai import analyze_cv, optimize_cv
-from app.utils.document_parser import extract_text_from_file, validate_file
+from app.services.firebase.usage_gate import authorize_ai_feature, set_user_priority
+from app.services.ai import analyze_cv, analyze_cv_batch, optimize_cv, context_cache
+from app.services.jobs import job_queue
+from app.services.documents import document_parser
 from app.utils.pdf_generator import generate_cv_pdf
+from app.utils.single_flight import fingerprint
+from app.utils.sse import format_sse, SSE_HEADERS
+from app.utils.upload import read_upload, CV_KINDS, CV_TYPE_ERROR
+from .cv_documents import get_cv_document_text
 from app.schemas.cv import (
     CVAnalysisRequest,
     CVAnalysisResult,
     CVAnalysisPreview,
+    BatchAnalysisRanking,
     OptimizedCV,
     CVExportRequest,
 )
+from app.schemas.job import JobAccepted
 
 router = APIRouter()
 
 
-@router.post("/analyze", response_model=Union[CVAnalysisResult, CVAnalysisPreview])
+async def _accept_job(
+    user_id: str, kind: str, runner, webhook_url: Optional[str]
+) -> JSONResponse:
+    """Queue `runner` as a background job and answer 202 with its URLs."""
+    job = await job_queue.submit(user_id, kind, runner, webhook_url)
+    status_url = f"{settings.API_V1_PREFIX}/jobs/{job.id}"
+    accepted = JobAccepted(
+        job_id=job.id,
+        status=job.status,
+        status_url=status_url,
+        events_url=f"{status_url}/events",
+    )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=accepted.model_dump(),
+        headers={"Location": status_url},
+    )
+
+
+@router.post(
+    "/analyze",
+    response_model=Union[CVAnalysisResult, CVAnalysisPreview],
+    responses={202: {"model": JobAccepted}},
+)
 async def analyze_cv_endpoint(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     job_description: str = Form(..., min_length=50),
+    cv_document_id: Optional[str] = Form(None),
+    webhook_url: Optional[str] = Form(None),
+    background: bool = False,
     current_user: Optional[CurrentUser] = Depends(get_optional_user),
 ):
     """
     Analyze a CV against a job description.
 
     For authenticated users: Returns full analysis and saves to history.
+    Later optimize and cover letter requests for the same CV reuse it.
     For unauthenticated users: Returns limited preview.
     ATS analysis is always free — no usage gate.
-    """
-    # Read file content
-    file_content = await file.read()
 
-    # Validate file
-    is_valid, error = validate_file(file_content, file.content_type or "")
-    if not is_valid:
+    Signed-in users can pass the `cv_document_id` of a stored CV (see
+    `/cv/documents`) instead of uploading the file.
+
+    With `?background=true` (authenticated users), the analysis runs as a
+    background job: the response is 202 with a job id to poll at
+    `/jobs/{id}`, follow at `/jobs/{id}/events` or receive at `webhook_url`.
+    """
+    stored_text = None
+    file_content = b""
+    content_type = ""
+    filename = None
+    if cv_document_id:
+        if current_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Sign in to use a stored CV.",
+            )
+        stored_text = await get_cv_document_text(current_user.uid, cv_document_id)
+    elif file is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error,
+            detail="A CV file or cv_document_id is required.",
+        )
+    else:
+        # Read and validate file
+        file_content, content_type = await read_upload(
+            file, CV_KINDS, settings.CV_MAX_UPLOAD_MB, CV_TYPE_ERROR
         )
+        filename = file.filename
+
+    async def run() -> Union[CVAnalysisResult, CVAnalysisPreview]:
+        if stored_text is not None:
+            cv_text = stored_text
+        else:
+            # Extract text from CV
+            try:
+                cv_text = await document_parser.extract_text(file_content, content_type, filename)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e),
+                )
+
+            if not cv_text.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Could not extract text from the CV. Please ensure the file is not empty or corrupted.",
+                )
 
-    # Extract text from CV
-    try:
-        cv_text = extract_text_from_file(
-            file_content,
-            file.content_type or "",
-            file.filename,
+        # Analyze CV
+        is_preview = current_user is None
+        context = (
+            await context_cache.open(current_user.uid, cv_text)
+            if current_user and settings.LLM_CONTEXT_CACHE_ENABLED
+            else None
         )
-    except ValueError as e:
+        analysis = await analyze_cv(cv_text, job_description, is_preview=is_preview)
+
+        # For authenticated users, save analysis
+        if current_user and isinstance(analysis, CVAnalysisResult):
+            analysis_id = await cv_service.save_analysis(current_user.uid, analysis)
+            analysis.id = analysis_id
+            analysis.user_id = current_user.uid
+            if context is not None:
+                context_cache.remember_analysis(
+                    context, analysis.summary, analysis.missing_keywords
+                )
+
+        return analysis
+
+    await set_user_priority(current_user.uid if current_user else None)
+
+    # Previews are scored locally and never worth queueing
+    if background and current_user:
+        return await _accept_job(current_user.uid, "cv_analyze", run, webhook_url)
+
+    return await run()
+
+
+@router.post("/analyze/batch")
+async def analyze_cv_batch_endpoint(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    job_descriptions: List[str] = Form(...),
+    cv_document_id: Optional[str] = Form(None),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Analyze one CV against several job descriptions, streaming Server-Sent Events.
+
+    Pass the CV file or the `cv_document_id` of a stored CV. The CV is parsed
+    once and the analyses run concurrently. Each analysis is saved to history
+    as it completes. Every job costs as much rate limit as a single
+    `/cv/analyze` request.
+
+    Events:
+    - `result`: `{"index": i, "analysis": CVAnalysisResult}` per completed job
+    - `error`: `{"index": i, "detail": "..."}` per failed job
+    - `done`: `{"ranking": [BatchAnalysisRanking, ...]}` sorted best match first
+    """
+    if len(job_descriptions) > settings.BATCH_ANALYSIS_MAX_JOBS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
+            detail=f"At most {settings.BATCH_ANALYSIS_MAX_JOBS} job descriptions per batch.",
         )
+    for index, job_description in enumerate(job_descriptions):
+        if not 50 <= len(job_description) <= 10000:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Job description {index} must be between 50 and 10000 characters.",
+            )
 
-    if not cv_text.strip():
+    # The middleware charged the first job
+    await charge_rate_limit(
+        request, ROUTE_COSTS[("POST", "/cv/analyze")] * (len(job_descriptions) - 1)
+    )
+
+    if cv_document_id:
+        cv_text = await get_cv_document_text(current_user.uid, cv_document_id)
+    elif file is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not extract text from the CV. Please ensure the file is not empty or corrupted.",
+            detail="A CV file or cv_document_id is required.",
+        )
+    else:
+        # Read and validate file
+        file_content, content_type = await read_upload(
+            file, CV_KINDS, settings.CV_MAX_UPLOAD_MB, CV_TYPE_ERROR
         )
 
-    # Analyze CV
-    is_preview = current_user is None
-    analysis = await analyze_cv(cv_text, job_description, is_preview=is_preview)
+        # Extract text once for the whole batch
+        try:
+            cv_text = await document_parser.extract_text(
+                file_content, content_type, file.filename
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
 
-    # For authenticated users, save analysis
-    if current_user and isinstance(analysis, CVAnalysisResult):
-        analysis_id = await cv_service.save_analysis(current_user.uid, analysis)
-        analysis.id = analysis_id
-        analysis.user_id = current_user.uid
+        if not cv_text.strip():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not extract text from the CV.",
+            )
 
-    return analysis
+    await set_user_priority(current_user.uid)
+    context = (
+        await context_cache.open(current_user.uid, cv_text)
+        if settings.LLM_CONTEXT_CACHE_ENABLED
+        else None
+    )
+
+    async def event_stream():
+        ranking: list[BatchAnalysisRanking] = []
+        async for index, result in analyze_cv_batch(
+            cv_text, job_descriptions, settings.BATCH_ANALYSIS_CONCURRENCY
+        ):
+            if isinstance(result, Exception):
+                detail = (
+                    result.detail
+                    if isinstance(result, HTTPException)
+                    else "Failed to analyze CV. Please try again."
+                )
+                yield format_sse("error", {"index": index, "detail": detail})
+                continue
+
+            try:
+                result.id = await cv_service.save_analysis(current_user.uid, result)
+            except Exception:
+                yield format_sse(
+                    "error",
+                    {"index": index, "detail": "Failed to save the analysis. Please try again."},
+                )
+                continue
+            result.user_id = current_user.uid
+            if context is not None:
+                # The latest completed analysis is what optimize will reuse
+                context_cache.remember_analysis(
+                    context, result.summary, result.missing_keywords
+                )
+            ranking.append(
+                BatchAnalysisRanking(
+                    index=index,
+                    analysis_id=result.id,
+                    overall_score=result.overall_score,
+                    ats_compatibility=result.ats_compatibility,
+                )
+            )
+            yield format_sse(
+                "result", {"index": index, "analysis": result.model_dump(mode="json")}
+            )
+
+        ranking.sort(key=lambda r: (-r.overall_score, -r.ats_compatibility, r.index))
+        yield format_sse(
+            "done", {"ranking": [r.model_dump(mode="json") for r in ranking]}
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
 
 @router.get("/analyses", response_model=List[CVAnalysisResult])
@@ -118,65 +317,117 @@ async def delete_analysis(
     return None
 
 
-@router.post("/optimize", response_model=OptimizedCV)
+@router.post(
+    "/optimize",
+    response_model=OptimizedCV,
+    responses={202: {"model": JobAccepted}},
+)
 async def optimize_cv_endpoint(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     job_description: str = Form(..., min_length=50),
     analysis_id: Optional[str] = Form(None),
+    cv_document_id: Optional[str] = Form(None),
+    webhook_url: Optional[str] = Form(None),
+    background: bool = False,
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Generate an AI-optimized version of a CV.
     This is a premium AI feature (uses free uses or requires Pro plan).
-    """
-    # Usage gate — counts as an AI use
-    user = await user_service.get_user(current_user.uid)
-    plan = user.plan if user else "free"
-    await authorize_ai_feature(current_user.uid, plan)
 
-    # Read and validate file
-    file_content = await file.read()
-    is_valid, error = validate_file(file_content, file.content_type or "")
-    if not is_valid:
+    Pass the CV file or the `cv_document_id` of a stored CV. Without an
+    `analysis_id`, the latest analysis of the same CV is used, if any.
+    With `?background=true` the optimization runs as a background job (see
+    `/cv/analyze`); the usage gate is still applied before it is queued.
+    """
+    stored_text = None
+    file_content = b""
+    content_type = ""
+    filename = None
+    if cv_document_id:
+        stored_text = await get_cv_document_text(current_user.uid, cv_document_id)
+    elif file is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error,
-        )
-
-    # Extract text
-    try:
-        cv_text = extract_text_from_file(
-            file_content, file.content_type or "", file.filename
+            detail="A CV file or cv_document_id is required.",
         )
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
+    else:
+        # Read and validate file
+        file_content, content_type = await read_upload(
+            file, CV_KINDS, settings.CV_MAX_UPLOAD_MB, CV_TYPE_ERROR
         )
+        filename = file.filename
 
-    if not cv_text.strip():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not extract text from the CV.",
-        )
+    if background:
+        await job_queue.ensure_accepting(webhook_url)
 
-    # Optionally load prior analysis for context
-    analysis_summary = ""
-    missing_keywords: list[str] = []
-    if analysis_id:
-        analysis = await cv_service.get_analysis(current_user.uid, analysis_id)
-        if analysis:
-            analysis_summary = analysis.summary
-            missing_keywords = analysis.missing_keywords
-
-    optimized = await optimize_cv(
-        cv_text=cv_text,
-        job_description=job_description,
-        analysis_summary=analysis_summary,
-        missing_keywords=missing_keywords,
+    # Usage gate — counts as an AI use; identical in-flight requests are charged once
+    user = await user_service.get_user(current_user.uid)
+    plan = user.plan if user else "free"
+    charge = await authorize_ai_feature(
+        current_user.uid,
+        plan,
+        request_key=fingerprint(
+            "cv_optimize",
+            cv_document_id or file_content,
+            job_description,
+            analysis_id,
+        ),
     )
 
-    return optimized
+    async def run() -> OptimizedCV:
+        if stored_text is not None:
+            cv_text = stored_text
+        else:
+            # Extract text
+            try:
+                cv_text = await document_parser.extract_text(file_content, content_type, filename)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e),
+                )
+
+            if not cv_text.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Could not extract text from the CV.",
+                )
+
+        # Optionally load prior analysis for context
+        analysis_summary = ""
+        missing_keywords: list[str] = []
+        if analysis_id:
+            analysis = await cv_service.get_analysis(current_user.uid, analysis_id)
+            if analysis:
+                analysis_summary = analysis.summary
+                missing_keywords = analysis.missing_keywords
+        elif settings.LLM_CONTEXT_CACHE_ENABLED:
+            context = context_cache.get(current_user.uid, cv_text)
+            if context is not None:
+                analysis_summary = context.analysis_summary
+                missing_keywords = context.missing_keywords
+
+        optimized = await optimize_cv(
+            cv_text=cv_text,
+            job_description=job_description,
+            analysis_summary=analysis_summary,
+            missing_keywords=missing_keywords,
+        )
+
+        return optimized
+
+    if background:
+        try:
+            return await _accept_job(
+                current_user.uid, "cv_optimize", charge.wrap(run), webhook_url
+            )
+        except BaseException:
+            charge.release()
+            raise
+
+    with charge:
+        return await run()
 
 
 @router.post("/export")
@@ -0,0 +1,113 @@
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from typing import List
+from app.core.config import settings
+from app.core.security import get_current_user, CurrentUser
+from app.services.firebase import cv_document_service
+from app.services.documents import document_parser
+from app.services.ai.prompt_budget import normalize_document_text
+from app.utils.upload import read_upload, CV_KINDS, CV_TYPE_ERROR
+from app.schemas.cv import CVDocument
+
+router = APIRouter()
+
+
+async def get_cv_document_text(user_id: str, cv_document_id: str) -> str:
+    """
+    Text of one of the user's stored CVs, for AI endpoints given a `cv_document_id`.
+
+    Raises:
+        HTTPException: 404 if the document does not exist.
+    """
+    text = await cv_document_service.get_document_text(user_id, cv_document_id)
+    if not text:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV document not found",
+        )
+    return text
+
+
+@router.post("/", response_model=CVDocument, status_code=status.HTTP_201_CREATED)
+async def upload_cv_document(
+    file: UploadFile = File(...),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Upload a CV once to reuse it by id.
+
+    The text is extracted, normalized and stored; pass the returned `id` as
+    `cv_document_id` to `/cv/analyze`, `/cv/optimize` or the cover letter
+    endpoints instead of uploading the file again. Uploading the same file
+    twice returns the same document.
+    """
+    file_content, content_type = await read_upload(
+        file, CV_KINDS, settings.CV_MAX_UPLOAD_MB, CV_TYPE_ERROR
+    )
+
+    try:
+        cv_text = await document_parser.extract_text(file_content, content_type, file.filename)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    cv_text = normalize_document_text(cv_text)
+    if not cv_text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not extract text from the CV.",
+        )
+
+    return await cv_document_service.save_document(
+        current_user.uid,
+        filename=file.filename,
+        content_type=content_type,
+        size_bytes=len(file_content),
+        content_hash=hashlib.sha256(file_content).hexdigest(),
+        text=cv_text,
+    )
+
+
+@router.get("/", response_model=List[CVDocument])
+async def get_cv_documents(
+    limit: int = 20,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Get the current user's stored CVs."""
+    return await cv_document_service.get_user_documents(current_user.uid, limit)
+
+
+@router.get("/{document_id}", response_model=CVDocument)
+async def get_cv_document(
+    document_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Get a stored CV's details."""
+    document = await cv_document_service.get_document(current_user.uid, document_id)
+
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV document not found",
+        )
+
+    return document
+
+
+@router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_cv_document(
+    document_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Delete a stored CV."""
+    deleted = await cv_document_service.delete_document(current_user.uid, document_id)
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CV document not found",
+        )
+
+    return None
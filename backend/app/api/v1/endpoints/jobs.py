@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.core.security import get_current_user, CurrentUser
+from app.services.jobs import Job, job_store, to_response
+from app.utils.sse import format_sse, SSE_HEADERS
+from app.schemas.job import JobResponse
+
+router = APIRouter()
+
+# Seconds between keep-alive comments on an idle event stream
+_KEEPALIVE_SECONDS = 15.0
+
+
+async def _get_own_job(job_id: str, user_id: str) -> Job:
+    job = await job_store.get(job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Get the status of a background job, and its result once finished."""
+    return to_response(await _get_own_job(job_id, current_user.uid))
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Follow a background job with Server-Sent Events.
+
+    Events:
+    - `status`: `JobResponse` whenever the job changes state
+    - `done`: `JobResponse` with the result or error, then the stream ends
+    """
+    job = await _get_own_job(job_id, current_user.uid)
+
+    async def event_stream():
+        current = job
+        yield format_sse("status", to_response(current).model_dump(mode="json"))
+        while not current.finished:
+            updated = await job_store.wait_for_update(
+                job_id, current.version, _KEEPALIVE_SECONDS
+            )
+            if updated is None:
+                yield format_sse("error", {"detail": "Job expired"})
+                return
+            if updated.version == current.version:
+                yield ": keep-alive\n\n"
+                continue
+            current = updated
+            if not current.finished:
+                yield format_sse("status", to_response(current).model_dump(mode="json"))
+        yield format_sse("done", to_response(current).model_dump(mode="json"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
+from typing import List
 from app.core.security import get_current_user, CurrentUser
 from app.core.firebase import get_firestore_client
-from app.schemas.stats import UserStats, CompletenessStatus
+from app.services.firebase.usage_ledger import usage_ledger
+from app.schemas.stats import UserStats, CompletenessStatus, UsageMonth
 
 router = APIRouter()
 
@@ -51,3 +53,15 @@ async def get_user_stats(
             has_application=application_count > 0,
         ),
     )
+
+
+@router.get("/me/usage", response_model=List[UsageMonth])
+async def get_user_usage(
+    months: int = 12,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Get the current user's monthly LLM usage (tokens and estimated cost).
+    Recorded only while LLM_COST_LEDGER_ENABLED is set.
+    """
+    return await usage_ledger.get_usage(current_user.uid, months)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.core.security import get_current_user, CurrentUser
 from app.core.firebase import delete_user
 from app.services.firebase import user_service
+from app.services.matching import application_ranker
 from app.schemas.user import UserResponse, UserUpdate
 
 router = APIRouter()
@@ -66,6 +67,7 @@ async def delete_current_user(
     """
     # Delete user data from Firestore
     await user_service.delete_user_data(current_user.uid)
+    application_ranker.forget(current_user.uid)
 
     # Delete Firebase Auth account
     try:
@@ -1,5 +1,15 @@
 from fastapi import APIRouter
-from .endpoints import users, cv, cover_letter, subscription, stats, applications, photo
+from .endpoints import (
+    users,
+    cv,
+    cv_documents,
+    cover_letter,
+    subscription,
+    stats,
+    applications,
+    photo,
+    jobs,
+)
 
 api_router = APIRouter()
 
@@ -9,6 +19,12 @@ api_router.include_router(
     tags=["users"],
 )
 
+api_router.include_router(
+    cv_documents.router,
+    prefix="/cv/documents",
+    tags=["cv"],
+)
+
 api_router.include_router(
     cv.router,
     prefix="/cv",
@@ -44,3 +60,9 @@ api_router.include_router(
     prefix="/photos",
     tags=["photos"],
 )
+
+api_router.include_router(
+    jobs.router,
+    prefix="/jobs",
+    tags=["jobs"],
+)
@@ -21,9 +21,91 @@ class Settings(BaseSettings):
     FIREBASE_PROJECT_ID: str = ""
     FIREBASE_SERVICE_ACCOUNT_PATH: Optional[str] = None
 
+    # LLM backend: "gemini", or "fake" for offline load tests and benchmarks
+    LLM_BACKEND: str = "gemini"
+    FAKE_LLM_LATENCY_MEAN_SECONDS: float = 0.5
+    FAKE_LLM_LATENCY_STDDEV_SECONDS: float = 0.1
+    FAKE_LLM_ERROR_RATE: float = 0.0  # fraction of calls failing with a 503
+    FAKE_LLM_SEED: int = 0
+
     # Gemini AI
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-1.5-pro"
+    GEMINI_MAX_CONCURRENCY: int = 8  # simultaneous upstream calls per worker
+    GEMINI_TIMEOUT_SECONDS: float = 60.0  # per-call upstream timeout
+    GEMINI_QUEUE_TIMEOUT_SECONDS: float = 30.0  # max wait for a free slot
+    LLM_PRIORITY_WEIGHT_PREMIUM: float = 6.0  # weighted fair share of queued slots
+    LLM_PRIORITY_WEIGHT_FREE: float = 3.0
+    LLM_PRIORITY_WEIGHT_ANONYMOUS: float = 1.0
+    LLM_PREMIUM_RESERVED_SLOTS: int = 2  # slots only premium calls may use
+
+    # Bearer token for /metrics and /metrics/prometheus; unset disables them
+    METRICS_TOKEN: str = ""
+
+    # LLM telemetry (/metrics/prometheus) and optional per-user cost ledger
+    LLM_PRICE_INPUT_PER_MTOK: float = 1.25  # USD per million prompt tokens
+    LLM_PRICE_CACHED_INPUT_PER_MTOK: float = 0.3125
+    LLM_PRICE_OUTPUT_PER_MTOK: float = 5.0
+    LLM_COST_LEDGER_ENABLED: bool = False  # monthly per-user totals in Firestore
+    LLM_INPUT_TOKEN_BUDGET: int = 12000  # CV + job description tokens per prompt
+    LLM_STRUCTURED_OUTPUT: bool = True  # request schema-constrained JSON output
+    BATCH_ANALYSIS_MAX_JOBS: int = 50  # job descriptions per batch request
+    BATCH_ANALYSIS_CONCURRENCY: int = 4  # analyses in flight per batch request
+    GEMINI_MAX_RETRIES: int = 2
+    GEMINI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    GEMINI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    GEMINI_HEDGE_ENABLED: bool = False  # duplicate slow calls past the percentile
+    GEMINI_HEDGE_PERCENTILE: float = 0.95
+    GEMINI_HEDGE_MIN_SAMPLES: int = 20
+    GEMINI_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures to open
+    GEMINI_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    LLM_CACHE_SQLITE_PATH: Optional[str] = None  # enables the on-disk tier
+
+    # Prompt A/B tests: prompt name -> {variant label: weight}. Prompts not
+    # listed use their latest registered variant.
+    PROMPT_AB_TESTS: dict[str, dict[str, float]] = {}
+
+    # CV context cache (analysis and skills reused by optimize and cover letters)
+    LLM_CONTEXT_CACHE_ENABLED: bool = True
+    LLM_CONTEXT_TTL_SECONDS: int = 3600
+    LLM_CONTEXT_MAX_ENTRIES: int = 1024
+
+    # Job description profiles (requirements shared across users and features)
+    JOB_PROFILE_MAX_ENTRIES: int = 5000
+    JOB_PROFILE_TTL_SECONDS: int = 604800  # 7 days
+    JOB_PROFILE_SIMHASH_DISTANCE: int = 3  # max differing bits for a near-duplicate
+
+    # Background jobs (async analyze/optimize with polling, SSE and webhooks)
+    JOB_WORKERS: int = 4  # pipelines executed concurrently per process
+    JOB_QUEUE_MAX_PENDING: int = 1000  # queued jobs before submissions get 503
+    JOB_MAX_ENTRIES: int = 10000
+    JOB_TTL_SECONDS: int = 86400  # how long job results can be fetched
+    JOB_WEBHOOK_SECRET: str = ""  # signs webhook bodies (X-Webhook-Signature) if set
+    JOB_WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    JOB_WEBHOOK_RETRIES: int = 3
+
+    # Local embedding index (ranking saved applications by fit, no LLM calls)
+    EMBEDDING_DIM: int = 1024
+    EMBEDDING_INDEX_MAX_USERS: int = 2048
+    EMBEDDING_INDEX_TTL_SECONDS: int = 3600
+
+    # Uploads
+    MAX_REQUEST_BODY_MB: int = 12  # larger request bodies are refused with 413
+    CV_MAX_UPLOAD_MB: int = 10
+
+    # CV text extraction in worker processes
+    DOCUMENT_PARSER_WORKERS: int = 2  # 0 parses in a thread instead
+    DOCUMENT_PARSE_TIMEOUT_SECONDS: float = 10.0  # CPU time per document
+    DOCUMENT_MAX_PAGES: int = 20  # longer PDFs are rejected
+    DOCUMENT_TEXT_CACHE_ENABLED: bool = True  # reuse text of re-uploaded files
+    DOCUMENT_TEXT_CACHE_MAX_ENTRIES: int = 1024
+    DOCUMENT_TEXT_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    DOCUMENT_TEXT_CACHE_SQLITE_PATH: Optional[str] = None  # enables the on-disk tier
 
     # Stripe
     STRIPE_SECRET_KEY: str = ""
@@ -33,9 +115,16 @@ class Settings(BaseSettings):
     # Freemium limits
     FREE_AI_USES: int = 3
 
-    # Rate Limiting
-    RATE_LIMIT_REQUESTS: int = 100
-    RATE_LIMIT_PERIOD: int = 60  # seconds
+    # Rate Limiting (token bucket per uid or client IP)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REQUESTS: int = 100  # bucket size, in tokens
+    RATE_LIMIT_PERIOD: int = 60  # seconds to refill an empty bucket
+    RATE_LIMIT_DEFAULT_COST: int = 1  # tokens per request not in ROUTE_COSTS
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared)
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000  # clients tracked by the memory backend
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # key by X-Forwarded-For (behind a proxy)
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 1  # proxies in front that append to X-Forwarded-For
 
     class Config:
         env_file = ".env"
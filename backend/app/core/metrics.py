@@ -0,0 +1,20 @@
+from typing import Callable
+
+
+_stats_providers: dict[str, Callable[[], dict]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], dict]) -> None:
+    """
+    Register a callable that reports runtime statistics for a component.
+
+    Args:
+        name: Key under which the stats appear in the /metrics payload.
+        provider: Zero-argument callable returning a JSON-serializable dict.
+    """
+    _stats_providers[name] = provider
+
+
+def collect_stats() -> dict:
+    """Collect the current statistics from every registered provider."""
+    return {name: provider() for name, provider in _stats_providers.items()}
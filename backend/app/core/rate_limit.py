@@ -0,0 +1,318 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import HTTPException, Request, status
+from app.utils.cache import LRUCache
+from .config import settings
+from .firebase import verify_firebase_token
+from .metrics import register_stats
+
+
+logger = logging.getLogger(__name__)
+
+# Token cost per (method, path under API_V1_PREFIX); anything else costs
+# RATE_LIMIT_DEFAULT_COST. AI endpoints cost more than CRUD, and the Stripe
+# webhook is exempt since Stripe retries on 429. A batch analysis is charged
+# for its first job here and for the rest by the endpoint (charge_rate_limit).
+ROUTE_COSTS: dict[tuple[str, str], int] = {
+    ("POST", "/cv/analyze"): 5,
+    ("POST", "/cv/analyze/batch"): 5,
+    ("POST", "/cv/optimize"): 10,
+    ("POST", "/cv/documents"): 2,
+    ("POST", "/cover-letters/generate"): 10,
+    ("POST", "/cover-letters/generate/stream"): 10,
+    ("POST", "/cover-letters/generate/variants"): 25,
+    ("POST", "/photos/enhance"): 10,
+    ("POST", "/applications/rank"): 2,
+    ("POST", "/subscriptions/webhook"): 0,
+}
+
+# Unversioned paths outside the limiter
+EXEMPT_PATHS = frozenset({"/health", "/metrics", "/metrics/prometheus", "/"})
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    remaining: float  # tokens left after this request
+    retry_after: float  # seconds until `cost` tokens are available (0 if allowed)
+
+
+class RateLimitBackend(ABC):
+    """Token bucket state, either per process or shared between workers."""
+
+    @abstractmethod
+    async def consume(
+        self, key: str, cost: float, capacity: float, refill_per_second: float
+    ) -> RateLimitDecision:
+        """Take `cost` tokens from `key`'s bucket if it holds enough."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Buckets held in this process.
+
+    Each worker enforces the limit on its own, so with N workers a client
+    can get up to N times the configured rate.
+    """
+
+    def __init__(self, max_keys: int, idle_seconds: float):
+        # Idle buckets are full again by the time they expire
+        self._buckets = LRUCache(max_keys, idle_seconds)
+
+    async def consume(
+        self, key: str, cost: float, capacity: float, refill_per_second: float
+    ) -> RateLimitDecision:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+
+        if tokens >= cost:
+            tokens -= cost
+            self._buckets.set(key, (tokens, now))
+            return RateLimitDecision(True, tokens, 0.0)
+
+        self._buckets.set(key, (tokens, now))
+        return RateLimitDecision(False, tokens, (cost - tokens) / refill_per_second)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Atomic token bucket update: KEYS[1] = bucket, ARGV = cost, capacity,
+# refill per second, TTL in ms. Uses the Redis clock so workers agree.
+_REDIS_TOKEN_BUCKET = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Buckets shared by every worker through Redis (needs the `redis` package).
+
+    The whole refill-and-take step runs as one Lua script, so concurrent
+    requests from different workers cannot overspend a bucket.
+    """
+
+    def __init__(self, url: str, idle_seconds: float, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package"
+            ) from e
+
+        self._redis = redis_asyncio.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+        self._ttl_ms = int(idle_seconds * 1000)
+        self._prefix = prefix
+
+    async def consume(
+        self, key: str, cost: float, capacity: float, refill_per_second: float
+    ) -> RateLimitDecision:
+        allowed, tokens = await self._script(
+            keys=[self._prefix + key],
+            args=[cost, capacity, refill_per_second, self._ttl_ms],
+        )
+        tokens = float(tokens)
+        if allowed:
+            return RateLimitDecision(True, tokens, 0.0)
+        return RateLimitDecision(False, tokens, (cost - tokens) / refill_per_second)
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Backend selected by RATE_LIMIT_BACKEND ("memory" or "redis")."""
+    idle_seconds = settings.RATE_LIMIT_PERIOD * 2
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL, idle_seconds)
+    return InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS, idle_seconds)
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing RATE_LIMIT_REQUESTS per RATE_LIMIT_PERIOD.
+
+    Each client has a token bucket holding RATE_LIMIT_REQUESTS tokens that
+    refills continuously over RATE_LIMIT_PERIOD seconds, so short bursts are
+    allowed but the sustained rate is capped. Requests take ROUTE_COSTS
+    tokens. Clients are keyed by Firebase uid when they send a valid ID
+    token, and by IP address otherwise; the verified claims are kept on the
+    request so the auth dependencies don't verify the token again. Endpoints
+    whose cost depends on the body take more tokens with `charge_rate_limit`.
+
+    Rejected requests get 429 with `Retry-After`; every response carries
+    `X-RateLimit-Limit` and `X-RateLimit-Remaining`. If the backend fails,
+    requests are let through.
+    """
+
+    def __init__(self, app, backend: Optional[RateLimitBackend] = None):
+        self.app = app
+        self.backend = backend if backend is not None else create_rate_limit_backend()
+        self.capacity = float(settings.RATE_LIMIT_REQUESTS)
+        self.refill_per_second = settings.RATE_LIMIT_REQUESTS / settings.RATE_LIMIT_PERIOD
+        self.allowed = 0
+        self.limited = 0
+        self.backend_errors = 0
+        register_stats("rate_limit", self.stats)
+
+    def _cost(self, method: str, path: str) -> int:
+        if path in EXEMPT_PATHS:
+            return 0
+        if path.startswith(settings.API_V1_PREFIX):
+            route = path[len(settings.API_V1_PREFIX):].rstrip("/") or "/"
+            cost = ROUTE_COSTS.get((method, route))
+            if cost is not None:
+                return cost
+        return settings.RATE_LIMIT_DEFAULT_COST
+
+    async def _client_key(self, scope) -> str:
+        headers = dict(scope.get("headers") or [])
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                # Verification can fetch Google's signing keys; keep it off the loop
+                claims = await asyncio.to_thread(verify_firebase_token, token)
+            except Exception:
+                claims = None  # the auth dependency reports the error
+            if claims is not None:
+                scope.setdefault("state", {})["firebase_claims"] = (token, claims)
+                return f"user:{claims['uid']}"
+
+        hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+        if settings.RATE_LIMIT_TRUST_FORWARDED and hops > 0:
+            forwarded = headers.get(b"x-forwarded-for", b"").decode("latin-1")
+            addresses = [a.strip() for a in forwarded.split(",") if a.strip()]
+            # Each proxy appends the address it saw, so only the entry added
+            # by the outermost trusted proxy is not under the client's control
+            if len(addresses) >= hops:
+                return f"ip:{addresses[-hops]}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def charge(self, key: str, cost: float) -> None:
+        """
+        Take `cost` more tokens from `key`'s bucket.
+
+        Raises:
+            HTTPException: 429 with Retry-After if the bucket is short.
+        """
+        try:
+            decision = await self.backend.consume(
+                key, min(cost, self.capacity), self.capacity, self.refill_per_second
+            )
+        except Exception as e:
+            self.backend_errors += 1
+            logger.warning("Rate limit backend failed, allowing request: %s", e)
+            return
+
+        if not decision.allowed:
+            self.limited += 1
+            retry_after = max(1, math.ceil(decision.retry_after))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many requests. Please retry in {retry_after} seconds.",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            return await self.app(scope, receive, send)
+
+        cost = min(self._cost(scope["method"], scope["path"]), self.capacity)
+        if cost == 0:
+            return await self.app(scope, receive, send)
+
+        key = await self._client_key(scope)
+        try:
+            decision = await self.backend.consume(
+                key, cost, self.capacity, self.refill_per_second
+            )
+        except Exception as e:
+            self.backend_errors += 1
+            logger.warning("Rate limit backend failed, allowing request: %s", e)
+            return await self.app(scope, receive, send)
+
+        limit_headers = [
+            (b"x-ratelimit-limit", str(settings.RATE_LIMIT_REQUESTS).encode()),
+            (b"x-ratelimit-remaining", str(int(decision.remaining)).encode()),
+        ]
+
+        if not decision.allowed:
+            self.limited += 1
+            retry_after = max(1, math.ceil(decision.retry_after))
+            body = json.dumps({
+                "detail": f"Too many requests. Please retry in {retry_after} seconds.",
+            }).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    *limit_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        self.allowed += 1
+        scope.setdefault("state", {})["rate_limit"] = (self, key)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def stats(self) -> dict:
+        stats = {
+            "backend": type(self.backend).__name__,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "backend_errors": self.backend_errors,
+        }
+        if isinstance(self.backend, InMemoryRateLimitBackend):
+            stats["clients"] = len(self.backend)
+        return stats
+
+
+async def charge_rate_limit(request: Request, cost: float) -> None:
+    """
+    Take `cost` more tokens from the caller's rate limit bucket.
+
+    For endpoints whose cost depends on the request body (e.g. the number
+    of jobs in a batch), which the middleware cannot see. Does nothing when
+    the middleware did not limit this request.
+
+    Raises:
+        HTTPException: 429 with Retry-After if the bucket is short.
+    """
+    limited = getattr(request.state, "rate_limit", None)
+    if limited is None or cost <= 0:
+        return
+    limiter, key = limited
+    await limiter.charge(key, cost)
@@ -1,13 +1,24 @@
-from fastapi import HTTPException, Depends, status
+import secrets
+from fastapi import HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from firebase_admin import auth
 from typing import Optional
+from .config import settings
 from .firebase import verify_firebase_token
+from .telemetry import bind_user
 
 
 security = HTTPBearer()
 
 
+def _decode_token(request: Request, token: str) -> dict:
+    """Verified claims of `token`, reusing the rate limiter's verification."""
+    verified = getattr(request.state, "firebase_claims", None)
+    if verified is not None and verified[0] == token:
+        return verified[1]
+    return verify_firebase_token(token)
+
+
 class CurrentUser:
     """Represents the currently authenticated user."""
 
@@ -18,12 +29,14 @@ class CurrentUser:
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> CurrentUser:
     """
     Dependency to get the current authenticated user from Firebase token.
 
     Args:
+        request: The incoming request (may carry claims verified by the rate limiter).
         credentials: The HTTP authorization credentials containing the Bearer token.
 
     Returns:
@@ -35,7 +48,8 @@ async def get_current_user(
     token = credentials.credentials
 
     try:
-        decoded_token = verify_firebase_token(token)
+        decoded_token = _decode_token(request, token)
+        bind_user(decoded_token["uid"])
         return CurrentUser(
             uid=decoded_token["uid"],
             email=decoded_token.get("email"),
@@ -62,6 +76,7 @@ async def get_current_user(
 
 
 async def get_optional_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         HTTPBearer(auto_error=False)
     ),
@@ -74,7 +89,8 @@ async def get_optional_user(
         return None
 
     try:
-        decoded_token = verify_firebase_token(credentials.credentials)
+        decoded_token = _decode_token(request, credentials.credentials)
+        bind_user(decoded_token["uid"])
         return CurrentUser(
             uid=decoded_token["uid"],
             email=decoded_token.get("email"),
@@ -82,3 +98,26 @@ async def get_optional_user(
         )
     except Exception:
         return None
+
+
+async def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(
+        HTTPBearer(auto_error=False)
+    ),
+) -> None:
+    """
+    Dependency guarding the operational metrics endpoints.
+
+    The endpoints are hidden (404) unless METRICS_TOKEN is set, and then
+    require it as a Bearer token.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,248 @@
+import math
+import threading
+from contextvars import ContextVar
+from typing import Optional
+from .config import settings
+from .metrics import collect_stats
+
+
+_user_id: ContextVar[Optional[str]] = ContextVar("telemetry_user_id", default=None)
+
+
+def bind_user(user_id: Optional[str]) -> None:
+    """Attribute LLM usage in the current request (and tasks it spawns) to a user."""
+    _user_id.set(user_id)
+
+
+def current_user_id() -> Optional[str]:
+    """User the current request's LLM usage is attributed to, if any."""
+    return _user_id.get()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                )
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> (per-bucket counts, sum, count)
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+                    )
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+_TOKEN_BUCKETS = (64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+llm_calls = Counter(
+    "llm_calls_total",
+    "Upstream LLM calls (including retries and hedges) by outcome.",
+    ("feature", "model", "prompt_version", "outcome"),
+)
+llm_latency = Histogram(
+    "llm_call_duration_seconds",
+    "Latency of upstream LLM calls.",
+    ("feature", "model", "prompt_version"),
+    _LATENCY_BUCKETS,
+)
+llm_tokens = Histogram(
+    "llm_call_tokens",
+    "Tokens per successful LLM call (direction: input, output or cached).",
+    ("feature", "model", "prompt_version", "direction"),
+    _TOKEN_BUCKETS,
+)
+llm_tokens_total = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by LLM calls.",
+    ("feature", "model", "direction"),
+)
+llm_cost = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM spend from token counts and the configured prices.",
+    ("feature", "model"),
+)
+llm_retries = Counter(
+    "llm_retries_total",
+    "Retried LLM calls after a transient upstream error.",
+    ("feature",),
+)
+llm_json_parses = Counter(
+    "llm_json_parse_total",
+    "JSON responses parsed cleanly, repaired or failed.",
+    ("feature", "outcome"),
+)
+
+_METRICS: list = [
+    llm_calls, llm_latency, llm_tokens, llm_tokens_total, llm_cost, llm_retries, llm_json_parses,
+]
+
+
+def register_metric(metric) -> None:
+    """Include a Counter or Histogram defined elsewhere in the Prometheus output."""
+    _METRICS.append(metric)
+
+
+def estimate_cost(input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+    """USD cost of a call at the configured per-million-token prices."""
+    uncached = max(0, input_tokens - cached_tokens)
+    return (
+        uncached * settings.LLM_PRICE_INPUT_PER_MTOK
+        + cached_tokens * settings.LLM_PRICE_CACHED_INPUT_PER_MTOK
+        + output_tokens * settings.LLM_PRICE_OUTPUT_PER_MTOK
+    ) / 1_000_000
+
+
+def record_llm_call(
+    feature: str,
+    model: str,
+    outcome: str,
+    seconds: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cached_tokens: int = 0,
+    prompt_version: str = "",
+) -> float:
+    """
+    Record one upstream LLM call.
+
+    Args:
+        feature: Calling feature (e.g. "cv_analysis", "cover_letter").
+        model: Model name.
+        outcome: "success", "timeout", "error" or "cancelled".
+        seconds: Wall-clock latency of the call.
+        input_tokens: Prompt tokens, including cached ones.
+        output_tokens: Generated tokens.
+        cached_tokens: Prompt tokens served from a cached prefix.
+        prompt_version: Version of the prompt template, so A/B variants
+            can be compared on latency and tokens.
+
+    Returns:
+        The estimated cost of the call in USD.
+    """
+    llm_calls.inc(feature=feature, model=model, prompt_version=prompt_version, outcome=outcome)
+    llm_latency.observe(seconds, feature=feature, model=model, prompt_version=prompt_version)
+    if outcome != "success":
+        return 0.0
+
+    for direction, tokens in (
+        ("input", input_tokens), ("output", output_tokens), ("cached", cached_tokens)
+    ):
+        if tokens or direction != "cached":
+            llm_tokens.observe(
+                tokens,
+                feature=feature,
+                model=model,
+                prompt_version=prompt_version,
+                direction=direction,
+            )
+            llm_tokens_total.inc(tokens, feature=feature, model=model, direction=direction)
+
+    cost = estimate_cost(input_tokens, output_tokens, cached_tokens)
+    llm_cost.inc(cost, feature=feature, model=model)
+    return cost
+
+
+def _stats_gauges() -> list[str]:
+    """Numeric values from the /metrics stats providers, as untyped gauges."""
+    lines = []
+
+    def walk(prefix: str, value) -> None:
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            lines.append(f"{prefix} {_format_value(value)}")
+        elif isinstance(value, dict):
+            for key, child in value.items():
+                name = "".join(ch if ch.isalnum() else "_" for ch in str(key))
+                walk(f"{prefix}_{name}", child)
+
+    for name, stats in collect_stats().items():
+        walk(f"app_{name}", stats)
+    return lines
+
+
+def render_prometheus() -> str:
+    """All telemetry, plus the /metrics stats as gauges, in Prometheus text format."""
+    lines: list[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    lines.extend(_stats_gauges())
+    return "\n".join(lines) + "\n"
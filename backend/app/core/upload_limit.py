@@ -0,0 +1,69 @@
+import json
+from fastapi import HTTPException, status
+from .config import settings
+from .metrics import register_stats
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"Request too large. Maximum size is {max_bytes // (1024 * 1024)}MB."
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware rejecting request bodies over MAX_REQUEST_BODY_MB with 413.
+
+    Requests declaring a larger Content-Length are refused before any of the
+    body is read. Otherwise (e.g. chunked uploads) the body is counted as it
+    streams in, and reading fails with 413 as soon as it passes the limit,
+    so an oversized upload is never received, spooled or parsed in full.
+    """
+
+    def __init__(self, app, max_bytes: int = 0):
+        self.app = app
+        self.max_bytes = max_bytes or settings.MAX_REQUEST_BODY_MB * 1024 * 1024
+        self.rejected = 0
+        register_stats("request_size_limit", self.stats)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            self.rejected += 1
+            body = json.dumps({"detail": _too_large_detail(self.max_bytes)}).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    self.rejected += 1
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=_too_large_detail(self.max_bytes),
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def stats(self) -> dict:
+        return {
+            "max_bytes": self.max_bytes,
+            "rejected": self.rejected,
+        }
@@ -1,10 +1,19 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.firebase import init_firebase
+from app.core.metrics import collect_stats
+from app.core.telemetry import render_prometheus
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.security import require_metrics_token
+from app.core.upload_limit import RequestSizeLimitMiddleware
 from app.api.v1 import api_router
+from app.services.matching import get_skill_index
+from app.services.jobs import job_queue
+from app.services.documents import document_parser
 
 
 @asynccontextmanager
@@ -12,8 +21,12 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
     # Startup
     init_firebase()
+    get_skill_index()  # build the skill automaton before the first request
+    await job_queue.start()
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    await job_queue.stop()
+    document_parser.stop()
 
 
 app = FastAPI(
@@ -25,6 +38,13 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Request body size limit (innermost, so rate limiting still applies first)
+app.add_middleware(RequestSizeLimitMiddleware)
+
+# Rate limiting (added first so CORS, the outer layer, also covers 429s)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -47,6 +67,24 @@ async def health_check():
     }
 
 
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """Runtime statistics (LLM pool utilization, queue depth, ...)."""
+    return collect_stats()
+
+
+@app.get(
+    "/metrics/prometheus",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_metrics_token)],
+)
+async def prometheus_metrics():
+    """LLM call, token and cost telemetry in Prometheus text format."""
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
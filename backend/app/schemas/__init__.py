@@ -3,13 +3,17 @@ from .cv import (
     CVAnalysisRequest,
     CVAnalysisResult,
     CVAnalysisPreview,
+    BatchAnalysisRanking,
     CVUploadResponse,
+    CVDocument,
     KeywordMatch,
     CVSection,
 )
 from .cover_letter import (
     CoverLetterRequest,
+    CoverLetterVariantsRequest,
     CoverLetterResponse,
+    CoverLetterVariantsResponse,
     CoverLetterUpdate,
     CoverLetterListItem,
 )
@@ -20,6 +24,7 @@ from .subscription import (
     PortalSessionResponse,
     PlanStatus,
 )
+from .job import JobAccepted, JobResponse
 
 __all__ = [
     # User
@@ -30,12 +35,16 @@ __all__ = [
     "CVAnalysisRequest",
     "CVAnalysisResult",
     "CVAnalysisPreview",
+    "BatchAnalysisRanking",
     "CVUploadResponse",
+    "CVDocument",
     "KeywordMatch",
     "CVSection",
     # Cover Letter
     "CoverLetterRequest",
+    "CoverLetterVariantsRequest",
     "CoverLetterResponse",
+    "CoverLetterVariantsResponse",
     "CoverLetterUpdate",
     "CoverLetterListItem",
     # Subscription
@@ -44,4 +53,7 @@ __all__ = [
     "CheckoutSessionResponse",
     "PortalSessionResponse",
     "PlanStatus",
+    # Jobs
+    "JobAccepted",
+    "JobResponse",
 ]
@@ -12,6 +12,7 @@ class ApplicationCreate(BaseModel):
     position: str = Field(..., min_length=1, max_length=200)
     status: ApplicationStatus = "saved"
     job_url: Optional[str] = Field(None, max_length=2000)
+    job_description: Optional[str] = Field(None, max_length=10000)
     cv_analysis_id: Optional[str] = None
     cover_letter_id: Optional[str] = None
     notes: Optional[str] = Field(None, max_length=5000)
@@ -23,6 +24,7 @@ class ApplicationUpdate(BaseModel):
     position: Optional[str] = Field(None, min_length=1, max_length=200)
     status: Optional[ApplicationStatus] = None
     job_url: Optional[str] = Field(None, max_length=2000)
+    job_description: Optional[str] = Field(None, max_length=10000)
     cv_analysis_id: Optional[str] = None
     cover_letter_id: Optional[str] = None
     notes: Optional[str] = Field(None, max_length=5000)
@@ -36,8 +38,15 @@ class ApplicationResponse(BaseModel):
     position: str
     status: ApplicationStatus
     job_url: Optional[str] = None
+    job_description: Optional[str] = None
     cv_analysis_id: Optional[str] = None
     cover_letter_id: Optional[str] = None
     notes: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+
+
+class RankedApplication(BaseModel):
+    """An application scored by how well a CV fits the job."""
+    application: ApplicationResponse
+    fit_score: float = Field(..., ge=0, le=100)
@@ -10,6 +10,19 @@ class CoverLetterRequest(BaseModel):
     job_description: str = Field(..., min_length=50, max_length=10000)
     tone: Literal["classic", "startup", "corporate"] = "classic"
     additional_context: Optional[str] = Field(None, max_length=2000)
+    cv_document_id: Optional[str] = Field(None, max_length=128)  # A stored CV
+
+
+class CoverLetterVariantsRequest(BaseModel):
+    """Request schema for generating the same cover letter in several tones."""
+    job_title: str = Field(..., min_length=2, max_length=200)
+    company_name: str = Field(..., min_length=2, max_length=200)
+    job_description: str = Field(..., min_length=50, max_length=10000)
+    tones: list[Literal["classic", "startup", "corporate"]] = Field(
+        ["classic", "startup", "corporate"], min_length=1, max_length=3
+    )
+    additional_context: Optional[str] = Field(None, max_length=2000)
+    cv_document_id: Optional[str] = Field(None, max_length=128)  # A stored CV
 
 
 class CoverLetterResponse(BaseModel):
@@ -21,12 +34,18 @@ class CoverLetterResponse(BaseModel):
     tone: str
     content: str
     word_count: int
+    prompt_version: Optional[str] = None  # Prompt template version that produced it
     created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class CoverLetterVariantsResponse(BaseModel):
+    """Cover letters generated together, one per requested tone."""
+    letters: list[CoverLetterResponse]
+
+
 class CoverLetterUpdate(BaseModel):
     """Schema for updating a cover letter."""
     content: str = Field(..., min_length=100, max_length=10000)
@@ -35,6 +35,7 @@ class CVAnalysisResult(BaseModel):
     sections: list[CVSection] = []
     summary: str
     improvement_tips: list[str] = []
+    prompt_version: Optional[str] = None  # Prompt template version that produced it
     created_at: Optional[datetime] = None
 
     class Config:
@@ -49,6 +50,14 @@ class CVAnalysisPreview(BaseModel):
     upgrade_message: str = "Create an account for the full analysis with all keywords, detailed section feedback, and personalized improvement tips."
 
 
+class BatchAnalysisRanking(BaseModel):
+    """One job's entry in the ranked result of a batch analysis."""
+    index: int  # Position of the job description in the request
+    analysis_id: Optional[str] = None
+    overall_score: int = Field(..., ge=0, le=100)
+    ats_compatibility: int = Field(..., ge=0, le=100)
+
+
 class OptimizedCVSection(BaseModel):
     """A section entry in the optimized CV (experience or education)."""
     title: str
@@ -71,6 +80,7 @@ class OptimizedCV(BaseModel):
     skills: list[str] = []
     certifications: list[str] = []
     estimated_score: int = Field(0, ge=0, le=100)
+    prompt_version: Optional[str] = None  # Prompt template version that produced it
 
 
 class CVExportRequest(BaseModel):
@@ -85,3 +95,14 @@ class CVUploadResponse(BaseModel):
     content_type: str
     size_bytes: int
     upload_url: Optional[str] = None
+
+
+class CVDocument(BaseModel):
+    """A CV uploaded once and stored, referenced by id in AI requests."""
+    id: str
+    filename: Optional[str] = None
+    content_type: str
+    size_bytes: int
+    content_hash: str  # SHA-256 of the uploaded file
+    word_count: int
+    created_at: Optional[datetime] = None
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional, Literal, Any
+from datetime import datetime
+
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class JobAccepted(BaseModel):
+    """Schema for a queued background job (202 response)."""
+    job_id: str
+    status: JobStatus
+    status_url: str
+    events_url: str
+
+
+class JobResponse(BaseModel):
+    """Schema for background job status."""
+    id: str
+    kind: str
+    status: JobStatus
+    result: Optional[dict] = None  # the endpoint's normal response body
+    error: Optional[Any] = None  # the error detail the endpoint would have returned
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -17,3 +17,18 @@ class UserStats(BaseModel):
     application_count: int = 0
     latest_cv_score: int | None = None
     completeness: CompletenessStatus = CompletenessStatus()
+
+
+class FeatureUsage(BaseModel):
+    """LLM calls, tokens and estimated cost."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+class UsageMonth(BaseModel):
+    """A user's LLM usage for one month (YYYY-MM), overall and per feature."""
+    month: str
+    total: FeatureUsage
+    features: dict[str, FeatureUsage] = {}
@@ -1,12 +1,37 @@
-from .gemini_client import get_gemini_model, generate_content
-from .cv_analyzer import analyze_cv
-from .cover_letter_generator import generate_cover_letter
+from .gemini_client import get_gemini_model, generate_content, stream_content, llm_pool
+from .scheduler import PriorityScheduler, set_priority, current_priority, tier_for_plan
+from .context_cache import CVContext, context_cache
+from .prompts import PromptTemplate, prompt_registry
+from .llm_backend import LLMBackend, GeminiBackend, FakeBackend, get_llm_backend
+from .cv_analyzer import analyze_cv, analyze_cv_batch
+from .cover_letter_generator import (
+    generate_cover_letter,
+    generate_cover_letter_variants,
+    stream_cover_letter,
+)
 from .cv_optimizer import optimize_cv
 
 __all__ = [
     "get_gemini_model",
     "generate_content",
+    "stream_content",
+    "llm_pool",
+    "PriorityScheduler",
+    "set_priority",
+    "current_priority",
+    "tier_for_plan",
+    "CVContext",
+    "context_cache",
+    "PromptTemplate",
+    "prompt_registry",
+    "LLMBackend",
+    "GeminiBackend",
+    "FakeBackend",
+    "get_llm_backend",
     "analyze_cv",
+    "analyze_cv_batch",
     "generate_cover_letter",
+    "generate_cover_letter_variants",
+    "stream_cover_letter",
     "optimize_cv",
 ]
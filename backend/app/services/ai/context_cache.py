@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.services.matching.skill_index import get_skill_index
+from app.utils.cache import LRUCache
+from app.utils.single_flight import fingerprint
+from .prompt_budget import estimate_tokens, normalize_document_text
+
+
+@dataclass
+class CVContext:
+    """What later AI calls need to know about a user's CV, without its text."""
+    context_id: str
+    user_id: str
+    cv_tokens: int  # estimated prompt tokens of the CV text
+    skills: list[str] = field(default_factory=list)  # taxonomy skills in the CV
+    analysis_summary: str = ""
+    missing_keywords: list[str] = field(default_factory=list)
+
+
+class ContextCache:
+    """
+    Per-user memo of CV contexts, keyed by the CV's normalized text.
+
+    A CV is identified by its content, however it arrives (uploaded again
+    or referenced by `cv_document_id`), so there is no separate handle for
+    clients to keep. `analyze` records its result here; `optimize` reuses
+    that analysis, and the cover letter generator sends the compact
+    candidate profile (skills and summary) instead of the whole CV.
+    Contexts expire after LLM_CONTEXT_TTL_SECONDS.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._contexts = LRUCache(max_entries, ttl_seconds)
+        self.created = 0
+        self.hits = 0
+        self.misses = 0
+        self.profile_prompts = 0
+        self.input_tokens_saved = 0
+
+    async def open(self, user_id: str, cv_text: str) -> CVContext:
+        """Return the context for this user's CV, creating it if needed."""
+        text = normalize_document_text(cv_text)
+        context_id = fingerprint("cv_context", user_id, text)
+
+        context = self._contexts.get(context_id)
+        if context is not None:
+            self.hits += 1
+            return context
+
+        skills = {match.skill: None for match in get_skill_index().scan(text)}
+        context = CVContext(
+            context_id=context_id,
+            user_id=user_id,
+            # What sending the CV would cost: plan_prompt gives it at most
+            # 60% of the input budget
+            cv_tokens=min(
+                estimate_tokens(text), int(settings.LLM_INPUT_TOKEN_BUDGET * 0.6)
+            ),
+            skills=list(skills),
+        )
+        self._contexts.set(context_id, context)
+        self.created += 1
+        return context
+
+    def get(self, user_id: str, cv_text: str) -> Optional[CVContext]:
+        """The context of this user's CV; None if it was not seen or has expired."""
+        context_id = fingerprint("cv_context", user_id, normalize_document_text(cv_text))
+        context = self._contexts.get(context_id)
+        if context is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return context
+
+    @staticmethod
+    def remember_analysis(
+        context: CVContext, summary: str, missing_keywords: list[str]
+    ) -> None:
+        """Attach the latest analysis so optimize and cover letters can reuse it."""
+        context.analysis_summary = summary
+        context.missing_keywords = list(missing_keywords)
+
+    def record_profile_prompt(self, context: CVContext, profile_tokens: int) -> None:
+        """Count a prompt that sent the candidate profile in place of the CV."""
+        self.profile_prompts += 1
+        self.input_tokens_saved += max(context.cv_tokens - profile_tokens, 0)
+
+    def stats(self) -> dict:
+        """Context reuse counters and the prompt input tokens they saved."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.LLM_CONTEXT_CACHE_ENABLED,
+            "contexts": len(self._contexts),
+            "created": self.created,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "profile_prompts": self.profile_prompts,
+            "input_tokens_saved": self.input_tokens_saved,
+        }
+
+
+context_cache = ContextCache(
+    max_entries=settings.LLM_CONTEXT_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CONTEXT_TTL_SECONDS,
+)
+register_stats("llm_context_cache", context_cache.stats)
@@ -1,6 +1,11 @@
-from typing import Optional
-from .gemini_client import generate_content
+import asyncio
+from typing import AsyncIterator, Optional
+from .context_cache import CVContext, context_cache
+from .gemini_client import generate_content, stream_content
+from .prompt_budget import estimate_tokens, plan_prompt
+from .prompts import PromptTemplate, prompt_registry
 from app.schemas.cover_letter import CoverLetterResponse
+from app.services.matching import job_profiles
 
 
 TONE_PROMPTS = {
@@ -15,7 +20,7 @@ Use sophisticated language. Focus on achievements and impact. Maintain gravitas.
 }
 
 
-COVER_LETTER_PROMPT = """You are an expert cover letter writer. Create a compelling, personalized cover letter based on the following information.
+COVER_LETTER_TEMPLATE = """You are an expert cover letter writer. Create a compelling, personalized cover letter based on the following information.
 
 ## Job Title: {job_title}
 ## Company: {company_name}
@@ -23,16 +28,19 @@ COVER_LETTER_PROMPT = """You are an expert cover letter writer. Create a compell
 ## Job Description:
 {job_description}
 
+## Key Skills Required:
+{key_skills}
+
 ## Tone Style:
 {tone_instructions}
 
 ## Additional Context (if provided):
 {additional_context}
-
+{candidate_profile}
 ## Instructions:
 1. Write a complete cover letter (3-4 paragraphs)
 2. Start with a strong opening that shows enthusiasm for the role
-3. Highlight relevant skills and experiences that match the job description
+3. Highlight relevant skills and experiences that match the job description and its key skills, taken from the candidate profile when provided
 4. Show knowledge of the company and why you want to work there
 5. End with a confident call to action
 6. Keep the letter between 250-400 words
@@ -42,6 +50,22 @@ COVER_LETTER_PROMPT = """You are an expert cover letter writer. Create a compell
 Write only the cover letter content, no additional commentary.
 """
 
+# A few lines about the candidate instead of the whole CV text
+CANDIDATE_PROFILE_SECTION = """
+## Candidate Profile (from their CV):
+Skills matching the job: {matching_skills}
+Other skills: {other_skills}
+CV review summary: {summary}
+"""
+
+# Tone instructions and the profile section are part of the prompt's version
+COVER_LETTER_PROMPT = prompt_registry.register(
+    "cover_letter",
+    "v1",
+    COVER_LETTER_TEMPLATE,
+    fragments=(CANDIDATE_PROFILE_SECTION, *TONE_PROMPTS.values()),
+)
+
 
 async def generate_cover_letter(
     job_title: str,
@@ -49,6 +73,7 @@ async def generate_cover_letter(
     job_description: str,
     tone: str = "classic",
     additional_context: Optional[str] = None,
+    context: Optional[CVContext] = None,
 ) -> CoverLetterResponse:
     """
     Generate a cover letter using Gemini AI.
@@ -59,22 +84,112 @@ async def generate_cover_letter(
         job_description: The full job description.
         tone: The tone style (classic, startup, corporate).
         additional_context: Optional additional context about the candidate.
+        context: Optional CV context; the candidate's skills and latest
+            CV review are added to the prompt.
 
     Returns:
         CoverLetterResponse with the generated content.
     """
-    tone_instructions = TONE_PROMPTS.get(tone, TONE_PROMPTS["classic"])
+    template = prompt_registry.select("cover_letter")
+    prompt, max_tokens = _build_prompt(
+        template, job_title, company_name, job_description, tone, additional_context, context
+    )
 
-    prompt = COVER_LETTER_PROMPT.format(
-        job_title=job_title,
-        company_name=company_name,
-        job_description=job_description,
-        tone_instructions=tone_instructions,
-        additional_context=additional_context or "No additional context provided.",
+    content = await generate_content(
+        prompt,
+        max_tokens=max_tokens,
+        feature="cover_letter",
+        prompt_version=template.version,
+    )
+
+    return build_cover_letter_response(
+        job_title, company_name, tone, content, template.version
+    )
+
+
+async def generate_cover_letter_variants(
+    job_title: str,
+    company_name: str,
+    job_description: str,
+    tones: list[str],
+    additional_context: Optional[str] = None,
+    context: Optional[CVContext] = None,
+) -> list[CoverLetterResponse]:
+    """
+    Generate the same cover letter in several tones at once.
+
+    One generation per tone runs concurrently, so the whole set takes about
+    as long as a single letter. All letters use the same prompt template
+    variant and share the candidate profile, if given.
+
+    Args:
+        tones: Tone styles to generate, in the order results are returned.
+        Other arguments as for `generate_cover_letter`.
+
+    Returns:
+        One CoverLetterResponse per tone.
+    """
+    template = prompt_registry.select("cover_letter")
+
+    async def generate(tone: str) -> CoverLetterResponse:
+        prompt, max_tokens = _build_prompt(
+            template, job_title, company_name, job_description, tone, additional_context, context
+        )
+        content = await generate_content(
+            prompt,
+            max_tokens=max_tokens,
+            feature="cover_letter",
+            prompt_version=template.version,
+        )
+        return build_cover_letter_response(
+            job_title, company_name, tone, content, template.version
+        )
+
+    return list(await asyncio.gather(*(generate(tone) for tone in tones)))
+
+
+async def stream_cover_letter(
+    job_title: str,
+    company_name: str,
+    job_description: str,
+    tone: str = "classic",
+    additional_context: Optional[str] = None,
+    context: Optional[CVContext] = None,
+    template: Optional[PromptTemplate] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a cover letter from Gemini as it is generated.
+
+    Takes the same arguments as `generate_cover_letter`, plus the prompt
+    `template` (default: `prompt_registry.select("cover_letter")`). Callers
+    accumulate the fragments and pass the full text and the template's
+    version to `build_cover_letter_response`.
+
+    Yields:
+        Text fragments of the letter in generation order.
+    """
+    template = template or prompt_registry.select("cover_letter")
+    prompt, max_tokens = _build_prompt(
+        template, job_title, company_name, job_description, tone, additional_context, context
     )
 
-    content = await generate_content(prompt, max_tokens=2048)
+    async for chunk in stream_content(
+        prompt,
+        max_tokens=max_tokens,
+        feature="cover_letter",
+        prompt_version=template.version,
+    ):
+        yield chunk
+
 
+def build_cover_letter_response(
+    job_title: str,
+    company_name: str,
+    tone: str,
+    content: str,
+    prompt_version: Optional[str] = None,
+) -> CoverLetterResponse:
+    """Clean up generated text and wrap it in a CoverLetterResponse."""
     # Clean up the response
     content = content.strip()
 
@@ -87,4 +202,52 @@ async def generate_cover_letter(
         tone=tone,
         content=content,
         word_count=word_count,
+        prompt_version=prompt_version,
+    )
+
+
+def _build_prompt(
+    template: PromptTemplate,
+    job_title: str,
+    company_name: str,
+    job_description: str,
+    tone: str,
+    additional_context: Optional[str],
+    context: Optional[CVContext] = None,
+) -> tuple[str, int]:
+    """
+    Fill a cover letter prompt template and pick its output budget.
+
+    Returns:
+        Tuple of (prompt, max_output_tokens).
+    """
+    tone_instructions = TONE_PROMPTS.get(tone, TONE_PROMPTS["classic"])
+    plan = plan_prompt("cover_letter", "", job_description)
+
+    profile = job_profiles.get(job_description)
+    key_skills = ", ".join(
+        job_skill.skill for job_skill in profile.skills if job_skill.importance != "low"
+    )
+
+    candidate_profile = ""
+    if context is not None:
+        job_skills = {job_skill.skill for job_skill in profile.skills}
+        matching = [skill for skill in context.skills if skill in job_skills]
+        other = [skill for skill in context.skills if skill not in job_skills]
+        candidate_profile = CANDIDATE_PROFILE_SECTION.format(
+            matching_skills=", ".join(matching) or "None detected.",
+            other_skills=", ".join(other) or "None detected.",
+            summary=context.analysis_summary or "Not reviewed yet.",
+        )
+        context_cache.record_profile_prompt(context, estimate_tokens(candidate_profile))
+
+    prompt = template.render(
+        job_title=job_title,
+        company_name=company_name,
+        job_description=plan.job_description,
+        key_skills=key_skills or "See job description.",
+        tone_instructions=tone_instructions,
+        additional_context=additional_context or "No additional context provided.",
+        candidate_profile=candidate_profile,
     )
+    return prompt, plan.max_output_tokens
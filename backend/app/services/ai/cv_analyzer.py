@@ -1,11 +1,29 @@
-import json
-import re
-from typing import Optional, Union
+import asyncio
+from typing import AsyncIterator, Union
 from .gemini_client import generate_content
+from .json_parser import require_llm_json
+from .prompt_budget import plan_prompt, estimate_tokens
+from .prompts import prompt_registry
+from .response_cache import response_cache
+from .response_schema import response_schema_for
+from app.core.config import settings
+from app.services.matching import (
+    SkillHit,
+    build_preview,
+    get_skill_index,
+    job_profiles,
+    prescore_cv,
+)
 from app.schemas.cv import CVAnalysisResult, CVAnalysisPreview, KeywordMatch, CVSection
 
 
-CV_ANALYSIS_PROMPT = """You are an expert ATS (Applicant Tracking System) analyzer and career coach. Analyze the following CV against the job description and provide a detailed analysis.
+# Structured-output schema: the analysis fields the model must generate
+CV_ANALYSIS_SCHEMA = response_schema_for(
+    CVAnalysisResult,
+    exclude=("id", "user_id", "prompt_version", "created_at"),
+)
+
+CV_ANALYSIS_PROMPT = prompt_registry.register("cv_analysis", "v1", """You are an expert ATS (Applicant Tracking System) analyzer and career coach. Analyze the following CV against the job description and provide a detailed analysis.
 
 ## CV Content:
 {cv_text}
@@ -41,7 +59,7 @@ Analyze the CV and provide your response in the following JSON format only (no a
 }}
 
 Be thorough but constructive. Focus on ATS optimization and relevance to the job description.
-"""
+""")
 
 
 async def analyze_cv(
@@ -52,6 +70,10 @@ async def analyze_cv(
     """
     Analyze a CV against a job description using Gemini AI.
 
+    Previews are scored locally by the ATS pre-scorer with no LLM call.
+    For full analyses, keyword matches for taxonomy skills are checked
+    against the shared job profile and skills the model missed are added.
+
     Args:
         cv_text: The extracted text content from the CV.
         job_description: The job description to match against.
@@ -60,15 +82,45 @@ async def analyze_cv(
     Returns:
         Full CVAnalysisResult or limited CVAnalysisPreview.
     """
-    prompt = CV_ANALYSIS_PROMPT.format(
-        cv_text=cv_text,
-        job_description=job_description,
+    if is_preview:
+        return build_preview(prescore_cv(cv_text, job_description))
+
+    plan = plan_prompt("cv_analysis", cv_text, job_description)
+    template = prompt_registry.select("cv_analysis")
+
+    cache_key = response_cache.make_key(
+        "cv_analysis",
+        template.version,
+        cv_text=plan.cv_text,
+        job_description=plan.job_description,
+    )
+    analysis_data = (
+        await response_cache.get(cache_key) if settings.LLM_CACHE_ENABLED else None
     )
 
-    response_text = await generate_content(prompt, max_tokens=4096)
+    if analysis_data is None:
+        prompt = template.render(
+            cv_text=plan.cv_text,
+            job_description=plan.job_description,
+        )
+
+        response_text = await generate_content(
+            prompt,
+            max_tokens=plan.max_output_tokens,
+            response_schema=(
+                CV_ANALYSIS_SCHEMA if settings.LLM_STRUCTURED_OUTPUT else None
+            ),
+            feature="cv_analysis",
+            prompt_version=template.version,
+        )
 
-    # Parse JSON from response
-    analysis_data = _parse_json_response(response_text)
+        # Parse JSON from response, repairing truncated output; only
+        # complete analyses are cached
+        analysis_data, complete = require_llm_json(response_text, "cv_analysis")
+        if complete and settings.LLM_CACHE_ENABLED:
+            await response_cache.set(
+                cache_key, analysis_data, estimate_tokens(prompt + response_text)
+            )
 
     # Build keyword matches
     keyword_matches = [
@@ -92,50 +144,105 @@ async def analyze_cv(
         for s in analysis_data.get("sections", [])
     ]
 
-    if is_preview:
-        # Return limited preview for free/unauthenticated users
-        return CVAnalysisPreview(
-            overall_score=analysis_data.get("overall_score", 0),
-            preview_keywords=keyword_matches[:3],  # Only first 3 keywords
-            summary_preview=_truncate_text(analysis_data.get("summary", ""), 150),
-        )
+    keyword_matches, missing_keywords = _reconcile_keywords(
+        keyword_matches,
+        analysis_data.get("missing_keywords", []),
+        job_profiles.get(job_description).skill_hits(cv_text),
+    )
 
     return CVAnalysisResult(
         overall_score=analysis_data.get("overall_score", 0),
         ats_compatibility=analysis_data.get("ats_compatibility", 0),
         keyword_matches=keyword_matches,
-        missing_keywords=analysis_data.get("missing_keywords", []),
+        missing_keywords=missing_keywords,
         sections=sections,
         summary=analysis_data.get("summary", ""),
         improvement_tips=analysis_data.get("improvement_tips", []),
+        prompt_version=template.version,
     )
 
 
-def _parse_json_response(response_text: str) -> dict:
-    """Parse JSON from Gemini response, handling potential formatting issues."""
-    # Try to find JSON in the response
-    json_match = re.search(r'\{[\s\S]*\}', response_text)
-
-    if json_match:
-        try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-
-    # Return default structure if parsing fails
-    return {
-        "overall_score": 50,
-        "ats_compatibility": 50,
-        "keyword_matches": [],
-        "missing_keywords": [],
-        "sections": [],
-        "summary": "Unable to analyze CV. Please try again.",
-        "improvement_tips": [],
-    }
-
-
-def _truncate_text(text: str, max_length: int) -> str:
-    """Truncate text to max length, adding ellipsis if needed."""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 3] + "..."
+async def analyze_cv_batch(
+    cv_text: str,
+    job_descriptions: list[str],
+    concurrency: int,
+) -> AsyncIterator[tuple[int, Union[CVAnalysisResult, Exception]]]:
+    """
+    Analyze one CV against several job descriptions concurrently.
+
+    At most `concurrency` analyses run at once. Results are yielded in
+    completion order as (index into job_descriptions, result); a failed
+    analysis yields its exception instead so the rest of the batch continues.
+    Closing the generator early cancels the analyses still running.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index: int, job_description: str):
+        async with semaphore:
+            try:
+                return index, await analyze_cv(cv_text, job_description)
+            except Exception as e:
+                return index, e
+
+    tasks = [
+        asyncio.ensure_future(run(index, job_description))
+        for index, job_description in enumerate(job_descriptions)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _reconcile_keywords(
+    keyword_matches: list[KeywordMatch],
+    missing_keywords: list[str],
+    skill_hits: list[SkillHit],
+) -> tuple[list[KeywordMatch], list[str]]:
+    """
+    Check the model's keyword results against the skill index.
+
+    Keywords that name a taxonomy skill get their `found` flag from an exact
+    scan of the CV. Required skills the model did not list are appended,
+    and `missing_keywords` is corrected to match.
+
+    Returns:
+        Tuple of (keyword_matches, missing_keywords).
+    """
+    index = get_skill_index()
+    hits = {hit.skill: hit for hit in skill_hits}
+
+    def skill_of(keyword: str):
+        matches = index.scan(keyword)
+        return matches[0].skill if len(matches) == 1 else None
+
+    covered: set[str] = set()
+    for km in keyword_matches:
+        skill = skill_of(km.keyword)
+        if skill in hits:
+            covered.add(skill)
+            km.found = hits[skill].found
+            if km.found:
+                km.suggestion = None
+
+    for hit in skill_hits:
+        if hit.skill not in covered:
+            keyword_matches.append(
+                KeywordMatch(
+                    keyword=hit.skill,
+                    found=hit.found,
+                    importance=hit.importance,
+                    suggestion=None if hit.found else f"Mention {hit.skill} if it reflects your experience.",
+                )
+            )
+
+    found_skills = {hit.skill for hit in skill_hits if hit.found}
+    missing = [kw for kw in missing_keywords if skill_of(kw) not in found_skills]
+    listed = {skill_of(kw) for kw in missing}
+    missing += [
+        hit.skill for hit in skill_hits
+        if not hit.found and hit.skill not in listed
+    ]
+    return keyword_matches, missing
@@ -1,11 +1,19 @@
-import json
-import re
 from typing import Optional
 from .gemini_client import generate_content
+from .json_parser import require_llm_json
+from .prompt_budget import plan_prompt, estimate_tokens
+from .prompts import prompt_registry
+from .response_cache import response_cache
+from .response_schema import response_schema_for
+from app.core.config import settings
+from app.services.matching import job_profiles
 from app.schemas.cv import OptimizedCV, OptimizedCVSection
 
 
-CV_OPTIMIZE_PROMPT = """You are an expert CV writer and ATS optimization specialist. Based on the original CV content and the job description, create an optimized version of the CV that maximizes ATS compatibility while remaining honest and accurate.
+# Structured-output schema: the optimized CV exactly as returned to clients
+CV_OPTIMIZE_SCHEMA = response_schema_for(OptimizedCV, exclude=("prompt_version",))
+
+CV_OPTIMIZE_PROMPT = prompt_registry.register("cv_optimize", "v2", """You are an expert CV writer and ATS optimization specialist. Based on the original CV content and the job description, create an optimized version of the CV that maximizes ATS compatibility while remaining honest and accurate.
 
 ## Original CV Content:
 {cv_text}
@@ -30,27 +38,27 @@ CV_OPTIMIZE_PROMPT = """You are an expert CV writer and ATS optimization special
 Respond in the following JSON format only (no additional text):
 
 {{
-    "contact": {{
-        "name": "<full name>",
-        "email": "<email if found>",
-        "phone": "<phone if found>",
-        "location": "<city, country if found>",
-        "linkedin": "<linkedin URL if found>"
-    }},
+    "contact_name": "<full name>",
+    "contact_email": "<email if found, null otherwise>",
+    "contact_phone": "<phone if found, null otherwise>",
+    "contact_location": "<city, country if found, null otherwise>",
+    "contact_linkedin": "<linkedin URL if found, null otherwise>",
     "summary": "<2-3 sentence professional summary optimized for the role>",
     "experience": [
         {{
             "title": "<job title>",
-            "company": "<company name>",
+            "organization": "<company name>",
             "period": "<date range>",
-            "bullets": ["<achievement-focused bullet points with metrics>"]
+            "bullets": ["<achievement-focused bullet points with metrics>"],
+            "details": null
         }}
     ],
     "education": [
         {{
-            "degree": "<degree name>",
-            "institution": "<school name>",
+            "title": "<degree name>",
+            "organization": "<school name>",
             "period": "<date range>",
+            "bullets": [],
             "details": "<honors, GPA, relevant coursework if applicable>"
         }}
     ],
@@ -58,7 +66,7 @@ Respond in the following JSON format only (no additional text):
     "certifications": ["<list of certifications if any>"],
     "estimated_score": <number 0-100, estimated ATS score after optimization>
 }}
-"""
+""")
 
 
 async def optimize_cv(
@@ -75,71 +83,85 @@ async def optimize_cv(
         job_description: The job description to optimize for.
         analysis_summary: Summary from the ATS analysis.
         missing_keywords: Keywords that were not found in the original CV.
+            Defaults to the job profile's required skills missing from the CV.
 
     Returns:
         OptimizedCV with structured, optimized content.
     """
-    prompt = CV_OPTIMIZE_PROMPT.format(
-        cv_text=cv_text,
-        job_description=job_description,
-        analysis_summary=analysis_summary or "No prior analysis available.",
-        missing_keywords=", ".join(missing_keywords) if missing_keywords else "None identified.",
+    if not missing_keywords:
+        missing_keywords = [
+            hit.skill
+            for hit in job_profiles.get(job_description).skill_hits(cv_text)
+            if not hit.found
+        ]
+
+    plan = plan_prompt("cv_optimize", cv_text, job_description)
+    analysis_summary = analysis_summary or "No prior analysis available."
+    missing = ", ".join(missing_keywords) if missing_keywords else "None identified."
+
+    template = prompt_registry.select("cv_optimize")
+
+    cache_key = response_cache.make_key(
+        "cv_optimize",
+        template.version,
+        cv_text=plan.cv_text,
+        job_description=plan.job_description,
+        analysis_summary=analysis_summary,
+        missing_keywords=missing,
     )
+    data = await response_cache.get(cache_key) if settings.LLM_CACHE_ENABLED else None
+
+    if data is None:
+        prompt = template.render(
+            cv_text=plan.cv_text,
+            job_description=plan.job_description,
+            analysis_summary=analysis_summary,
+            missing_keywords=missing,
+        )
 
-    response_text = await generate_content(prompt, max_tokens=4096)
+        response_text = await generate_content(
+            prompt,
+            max_tokens=plan.max_output_tokens,
+            response_schema=(
+                CV_OPTIMIZE_SCHEMA if settings.LLM_STRUCTURED_OUTPUT else None
+            ),
+            feature="cv_optimize",
+            prompt_version=template.version,
+        )
 
-    data = _parse_json_response(response_text)
+        # Repair truncated output instead of discarding it; only complete
+        # responses are cached
+        data, complete = require_llm_json(response_text, "cv_optimize")
+        if complete and settings.LLM_CACHE_ENABLED:
+            await response_cache.set(
+                cache_key, data, estimate_tokens(prompt + response_text)
+            )
 
-    contact = data.get("contact", {})
-    experience = [
-        OptimizedCVSection(
-            title=exp.get("title", ""),
-            organization=exp.get("company", ""),
-            period=exp.get("period", ""),
-            bullets=exp.get("bullets", []),
-        )
-        for exp in data.get("experience", [])
-    ]
-    education = [
-        OptimizedCVSection(
-            title=edu.get("degree", ""),
-            organization=edu.get("institution", ""),
-            period=edu.get("period", ""),
-            details=edu.get("details"),
-        )
-        for edu in data.get("education", [])
-    ]
+    experience = [_build_section(exp) for exp in data.get("experience", [])]
+    education = [_build_section(edu) for edu in data.get("education", [])]
 
     return OptimizedCV(
-        contact_name=contact.get("name", ""),
-        contact_email=contact.get("email"),
-        contact_phone=contact.get("phone"),
-        contact_location=contact.get("location"),
-        contact_linkedin=contact.get("linkedin"),
-        summary=data.get("summary", ""),
+        contact_name=data.get("contact_name") or "",
+        contact_email=data.get("contact_email"),
+        contact_phone=data.get("contact_phone"),
+        contact_location=data.get("contact_location"),
+        contact_linkedin=data.get("contact_linkedin"),
+        summary=data.get("summary") or "",
         experience=experience,
         education=education,
         skills=data.get("skills", []),
         certifications=data.get("certifications", []),
         estimated_score=data.get("estimated_score", 80),
+        prompt_version=template.version,
     )
 
 
-def _parse_json_response(response_text: str) -> dict:
-    """Parse JSON from Gemini response."""
-    json_match = re.search(r'\{[\s\S]*\}', response_text)
-    if json_match:
-        try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-
-    return {
-        "contact": {},
-        "summary": "Unable to optimize CV. Please try again.",
-        "experience": [],
-        "education": [],
-        "skills": [],
-        "certifications": [],
-        "estimated_score": 50,
-    }
+def _build_section(entry: dict) -> OptimizedCVSection:
+    """Build an experience/education entry from the model output."""
+    return OptimizedCVSection(
+        title=entry.get("title") or "",
+        organization=entry.get("organization") or "",
+        period=entry.get("period") or "",
+        bullets=entry.get("bullets") or [],
+        details=entry.get("details"),
+    )
@@ -1,43 +1,348 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
 import google.generativeai as genai
-from typing import Optional
+from google.api_core import exceptions as google_exceptions
+from fastapi import HTTPException, status
+from typing import AsyncIterator, Optional
+from app.core import telemetry
 from app.core.config import settings
+from app.core.metrics import register_stats
+from app.services.firebase.usage_ledger import usage_ledger
+from app.utils.single_flight import SingleFlight, fingerprint
+from .llm_backend import GeminiBackend, LLMBackend, TokenUsage, get_llm_backend
+from .resilience import CircuitBreaker, LatencyTracker, hedged, retry_with_backoff
+from .scheduler import PriorityScheduler, current_priority
 
 
-_model: Optional[genai.GenerativeModel] = None
+# Upstream concurrency shared across plan tiers (premium > free > anonymous)
+llm_pool = PriorityScheduler(
+    settings.GEMINI_MAX_CONCURRENCY,
+    weights={
+        "premium": settings.LLM_PRIORITY_WEIGHT_PREMIUM,
+        "free": settings.LLM_PRIORITY_WEIGHT_FREE,
+        "anonymous": settings.LLM_PRIORITY_WEIGHT_ANONYMOUS,
+    },
+    premium_reserved=settings.LLM_PREMIUM_RESERVED_SLOTS,
+)
+register_stats("llm_pool", llm_pool.stats)
 
+# Identical prompts in flight at the same time share one upstream call
+_inflight = SingleFlight()
+register_stats("llm_single_flight", _inflight.stats)
+
+# Transient upstream errors worth retrying (429, 5xx, timeouts)
+_RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.GatewayTimeout,
+)
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.GEMINI_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.GEMINI_CIRCUIT_RESET_SECONDS,
+)
+_latency = LatencyTracker()
+_resilience_counters = {"retries": 0, "hedges": 0}
+
+
+def _hedge_delay() -> Optional[float]:
+    """Seconds after which a slow call is hedged, or None if disabled."""
+    if not settings.GEMINI_HEDGE_ENABLED:
+        return None
+    return _latency.percentile(
+        settings.GEMINI_HEDGE_PERCENTILE, settings.GEMINI_HEDGE_MIN_SAMPLES
+    )
 
-def get_gemini_model() -> genai.GenerativeModel:
-    """Get or initialize the Gemini model."""
-    global _model
 
-    if _model is None:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        _model = genai.GenerativeModel(settings.GEMINI_MODEL)
+def _resilience_stats() -> dict:
+    return {
+        "circuit": circuit_breaker.stats(),
+        "retries": _resilience_counters["retries"],
+        "hedges": _resilience_counters["hedges"],
+        "hedge_after_seconds": _hedge_delay(),
+    }
 
-    return _model
+
+register_stats("llm_resilience", _resilience_stats)
+
+
+@dataclass
+class _Completion:
+    """Result of one upstream generation, shared by collapsed callers."""
+    text: str
+    usage: TokenUsage
+    cost: float  # estimated USD
+
+
+def get_gemini_model() -> genai.GenerativeModel:
+    """Get or initialize the Gemini model (requires LLM_BACKEND=gemini)."""
+    backend = get_llm_backend()
+    if not isinstance(backend, GeminiBackend):
+        raise RuntimeError(f"LLM_BACKEND is '{backend.name}', not 'gemini'")
+    return backend.model
 
 
-async def generate_content(prompt: str, max_tokens: int = 4096) -> str:
+async def generate_content(
+    prompt: str,
+    max_tokens: int = 4096,
+    response_schema: Optional[dict] = None,
+    feature: str = "unknown",
+    prompt_version: str = "",
+) -> str:
     """
-    Generate content using Gemini.
+    Generate content without blocking the event loop.
+
+    The call goes to the backend selected by LLM_BACKEND (Gemini's native
+    async API by default, or the offline fake backend), waits for a slot in the
+    bounded pool, and is cancelled after GEMINI_TIMEOUT_SECONDS. Concurrent
+    calls with the same prompt and scheduling tier are collapsed onto a
+    single upstream request; every caller sharing it is charged the call's
+    usage in its own ledger.
+    Transient errors are retried with exponential backoff, slow calls can be
+    hedged, and a circuit breaker fails fast while Gemini is unhealthy.
 
     Args:
-        prompt: The prompt to send to Gemini.
+        prompt: The prompt to send to the model.
         max_tokens: Maximum tokens in the response.
+        response_schema: Optional Gemini response schema; when given the
+            model is asked for JSON output matching it.
+        feature: Calling feature, used to label telemetry (latency, tokens,
+            cost, retries).
+        prompt_version: Version of the prompt template, for telemetry.
 
     Returns:
         The generated text response.
+
+    Raises:
+        HTTPException: 503 if the pool is saturated, the circuit is open or
+            retries are exhausted; 504 on upstream timeout.
     """
-    model = get_gemini_model()
+    # The flight is scheduled at the tier of the caller that starts it, so
+    # callers only share flights within their own tier
+    key = fingerprint(
+        settings.GEMINI_MODEL,
+        current_priority(),
+        str(max_tokens),
+        json.dumps(response_schema, sort_keys=True) if response_schema else None,
+        prompt,
+    )
+    completion = await _inflight.do(
+        key,
+        lambda: _generate(
+            prompt, max_tokens, response_schema, feature, prompt_version
+        ),
+    )
+    _charge_ledger(feature, completion.usage, completion.cost)
+    return completion.text
+
+
+async def _generate(
+    prompt: str,
+    max_tokens: int,
+    response_schema: Optional[dict],
+    feature: str,
+    prompt_version: str,
+) -> _Completion:
+    """Call Gemini with retries, optional hedging and the circuit breaker."""
+    _check_circuit()
+
+    def on_retry(attempt: int, error: BaseException) -> None:
+        _resilience_counters["retries"] += 1
+        telemetry.llm_retries.inc(feature=feature)
+
+    def on_hedge() -> None:
+        _resilience_counters["hedges"] += 1
+
+    try:
+        completion = await retry_with_backoff(
+            lambda: hedged(
+                lambda: _call_once(
+                    prompt, max_tokens, response_schema, feature, prompt_version
+                ),
+                _hedge_delay(),
+                on_hedge,
+            ),
+            max_retries=settings.GEMINI_MAX_RETRIES,
+            base_delay=settings.GEMINI_RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.GEMINI_RETRY_MAX_DELAY_SECONDS,
+            is_retryable=lambda e: isinstance(e, _RETRYABLE_ERRORS),
+            on_retry=on_retry,
+        )
+    except _RETRYABLE_ERRORS as e:
+        circuit_breaker.record_failure()
+        raise _upstream_error(e)
+    except BaseException:
+        circuit_breaker.release()
+        raise
+
+    circuit_breaker.record_success()
+    return completion
 
-    generation_config = genai.GenerationConfig(
-        max_output_tokens=max_tokens,
-        temperature=0.7,
+
+async def _call_once(
+    prompt: str,
+    max_tokens: int,
+    response_schema: Optional[dict],
+    feature: str,
+    prompt_version: str,
+) -> _Completion:
+    """Perform one upstream call to the configured backend inside a pool slot."""
+    backend = get_llm_backend()
+
+    async with llm_pool.slot(settings.GEMINI_QUEUE_TIMEOUT_SECONDS):
+        started = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                backend.generate(prompt, max_tokens, response_schema),
+                timeout=settings.GEMINI_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            llm_pool.timeouts += 1
+            _record_call(backend, feature, prompt_version, "timeout", started)
+            raise
+        except Exception:
+            llm_pool.failures += 1
+            _record_call(backend, feature, prompt_version, "error", started)
+            raise
+
+        llm_pool.completed += 1
+        _latency.record(time.monotonic() - started)
+        cost = _record_call(
+            backend, feature, prompt_version, "success", started, response.usage
+        )
+
+    return _Completion(response.text, response.usage, cost)
+
+
+def _record_call(
+    backend: LLMBackend,
+    feature: str,
+    prompt_version: str,
+    outcome: str,
+    started: float,
+    usage: Optional[TokenUsage] = None,
+) -> float:
+    """Export telemetry for one upstream call; returns its estimated cost."""
+    usage = usage or TokenUsage()
+    return telemetry.record_llm_call(
+        feature,
+        backend.model_name,
+        outcome,
+        time.monotonic() - started,
+        usage.input_tokens,
+        usage.output_tokens,
+        usage.cached_tokens,
+        prompt_version,
     )
 
-    response = model.generate_content(
-        prompt,
-        generation_config=generation_config,
+
+def _charge_ledger(feature: str, usage: TokenUsage, cost: float) -> None:
+    """Charge a successful generation to the current request's user."""
+    user_id = telemetry.current_user_id()
+    if user_id and settings.LLM_COST_LEDGER_ENABLED:
+        usage_ledger.record_in_background(
+            user_id, feature, usage.input_tokens, usage.output_tokens, cost
+        )
+
+
+def _check_circuit() -> None:
+    """Fail fast with 503 while the circuit breaker is open."""
+    if not circuit_breaker.allow_request():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is temporarily unavailable. Please try again shortly.",
+        )
+
+
+def _upstream_error(error: BaseException) -> HTTPException:
+    """Map an exhausted upstream error to the HTTP error returned to clients."""
+    if isinstance(error, asyncio.TimeoutError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI service timed out. Please try again.",
+        )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="AI service is temporarily unavailable. Please try again.",
     )
 
-    return response.text
+
+async def stream_content(
+    prompt: str,
+    max_tokens: int = 4096,
+    feature: str = "unknown",
+    prompt_version: str = "",
+) -> AsyncIterator[str]:
+    """
+    Stream generated text from the configured backend as it is produced.
+
+    The pool slot is held for the lifetime of the stream. Each chunk must
+    arrive within GEMINI_TIMEOUT_SECONDS of the previous one.
+
+    Args:
+        prompt: The prompt to send to the model.
+        max_tokens: Maximum tokens in the response.
+        feature: Calling feature, used to label telemetry.
+        prompt_version: Version of the prompt template, for telemetry.
+
+    Yields:
+        Text fragments in generation order.
+
+    Raises:
+        HTTPException: 503 if the pool is saturated or the circuit is open,
+            504 on upstream timeout.
+    """
+    backend = get_llm_backend()
+    timeout = settings.GEMINI_TIMEOUT_SECONDS
+
+    # Fail fast before queueing for a slot while the circuit is open
+    _check_circuit()
+    acquired = False
+    try:
+        async with llm_pool.slot(settings.GEMINI_QUEUE_TIMEOUT_SECONDS):
+            acquired = True
+            started = time.monotonic()
+            usage = TokenUsage()
+            try:
+                chunks = backend.stream(prompt, max_tokens, usage).__aiter__()
+                while True:
+                    try:
+                        text = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    yield text
+            except _RETRYABLE_ERRORS as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    llm_pool.timeouts += 1
+                    _record_call(backend, feature, prompt_version, "timeout", started)
+                else:
+                    llm_pool.failures += 1
+                    _record_call(backend, feature, prompt_version, "error", started)
+                circuit_breaker.record_failure()
+                raise _upstream_error(e)
+            except BaseException as e:
+                # Includes client disconnects (GeneratorExit), which are no verdict
+                if isinstance(e, Exception):
+                    llm_pool.failures += 1
+                    _record_call(backend, feature, prompt_version, "error", started)
+                else:
+                    # Abandoned stream (e.g. the client disconnected)
+                    _record_call(backend, feature, prompt_version, "cancelled", started)
+                circuit_breaker.release()
+                raise
+
+            llm_pool.completed += 1
+            cost = _record_call(
+                backend, feature, prompt_version, "success", started, usage
+            )
+            _charge_ledger(feature, usage, cost)
+            circuit_breaker.record_success()
+    except BaseException:
+        if not acquired:
+            # Never reached the backend (e.g. no free slot): no verdict
+            circuit_breaker.release()
+        raise
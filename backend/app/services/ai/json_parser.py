@@ -0,0 +1,224 @@
+import json
+import re
+from typing import Optional
+from fastapi import HTTPException, status
+from app.core import telemetry
+from app.core.metrics import register_stats
+
+
+# Incomplete scalar at the end of truncated output: "-", "12.", "1e", "tr", "nul"...
+_PARTIAL_SCALAR_RE = re.compile(
+    r"(?<=[\[,:])\s*(-|-?\d+\.|-?\d+(\.\d+)?[eE][-+]?|t|tr|tru|f|fa|fal|fals|n|nu|nul)$"
+)
+
+
+class IncrementalJSONParser:
+    """
+    Streaming, truncation-tolerant parser for the JSON object in an LLM reply.
+
+    Text is fed in chunks as it arrives. The parser tracks string/escape state
+    and the stack of open containers as it goes, so `result()` never rescans
+    earlier chunks to find structure. Leading prose or markdown fences before
+    the first `{` and anything after the closing `}` are ignored.
+
+    If the reply was cut off, `result()` repairs it: it closes the open
+    string and containers after dropping a dangling key or partial scalar,
+    and if that still fails it falls back to the last point where a member
+    was complete.
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._length = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._safe_end: Optional[int] = None
+        self._safe_closers = ""
+
+    @property
+    def complete(self) -> bool:
+        """True once the outermost object has been closed."""
+        return self._end is not None
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next fragment of the response."""
+        self._chunks.append(chunk)
+        offset = self._length
+        self._length += len(chunk)
+        if self._end is not None:
+            return
+
+        for i, ch in enumerate(chunk):
+            pos = offset + i
+            if self._start is None:
+                if ch == "{":
+                    self._start = pos
+                    self._stack.append("}")
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._stack.append("}")
+            elif ch == "[":
+                self._stack.append("]")
+            elif ch in "}]":
+                if self._stack and self._stack[-1] == ch:
+                    self._stack.pop()
+                if not self._stack:
+                    self._end = pos + 1
+                    return
+                self._mark_safe(pos + 1)
+            elif ch == ",":
+                self._mark_safe(pos)
+
+    def _mark_safe(self, end: int) -> None:
+        """Remember a cut point where every member before it is complete."""
+        self._safe_end = end
+        self._safe_closers = "".join(reversed(self._stack))
+
+    def result(self) -> Optional[dict]:
+        """Return the parsed (possibly repaired) object, or None."""
+        if self._start is None:
+            return None
+
+        text = "".join(self._chunks)
+        if self._end is not None:
+            return _loads_object(text[self._start:self._end])
+
+        candidate = text[self._start:]
+        if self._in_string:
+            if self._escape:
+                candidate = candidate[:-1]
+            candidate += '"'
+        candidate = _strip_dangling(candidate) + "".join(reversed(self._stack))
+        data = _loads_object(candidate)
+        if data is not None or self._safe_end is None:
+            return data
+
+        return _loads_object(text[self._start:self._safe_end] + self._safe_closers)
+
+
+def _loads_object(text: str) -> Optional[dict]:
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _strip_dangling(text: str) -> str:
+    """Drop trailing commas, keys without values and partial scalars."""
+    while True:
+        text = text.rstrip()
+        if text.endswith(","):
+            text = text[:-1]
+        elif text.endswith(":"):
+            # Remove the key that has no value: `, "key":`
+            key_end = text.rstrip(":").rstrip()
+            if not key_end.endswith('"'):
+                return text
+            key_start = _string_start(key_end)
+            if key_start is None:
+                return text
+            text = key_end[:key_start]
+        else:
+            match = _PARTIAL_SCALAR_RE.search(text)
+            if not match:
+                return text
+            text = text[:match.start()]
+
+
+def _string_start(text: str) -> Optional[int]:
+    """Index of the opening quote of the string literal ending `text`."""
+    i = len(text) - 2
+    while i >= 0:
+        if text[i] == '"':
+            backslashes = 0
+            j = i - 1
+            while j >= 0 and text[j] == "\\":
+                backslashes += 1
+                j -= 1
+            if backslashes % 2 == 0:
+                return i
+        i -= 1
+    return None
+
+
+class ParseStats:
+    """Per-feature counts of clean, repaired and failed JSON parses."""
+
+    def __init__(self):
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def record(self, feature: str, outcome: str) -> None:
+        counts = self._counts.setdefault(feature, {"ok": 0, "repaired": 0, "failed": 0})
+        counts[outcome] += 1
+        telemetry.llm_json_parses.inc(feature=feature, outcome=outcome)
+
+    def stats(self) -> dict:
+        report = {}
+        for feature, counts in self._counts.items():
+            total = sum(counts.values())
+            report[feature] = {
+                **counts,
+                "failure_rate": round(counts["failed"] / total, 4) if total else 0.0,
+            }
+        return report
+
+
+parse_stats = ParseStats()
+register_stats("llm_json_parse", parse_stats.stats)
+
+
+def parse_llm_json(response_text: str, feature: str) -> tuple[Optional[dict], bool]:
+    """
+    Parse the JSON object in an LLM response, repairing truncated output.
+
+    Args:
+        response_text: The raw model output.
+        feature: Feature name used to label the parse metrics.
+
+    Returns:
+        Tuple of (data, complete). `data` is None if nothing could be
+        recovered; `complete` is False when the object had to be repaired.
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(response_text)
+    data = parser.result()
+
+    if data is None:
+        parse_stats.record(feature, "failed")
+        return None, False
+
+    parse_stats.record(feature, "ok" if parser.complete else "repaired")
+    return data, parser.complete
+
+
+def require_llm_json(response_text: str, feature: str) -> tuple[dict, bool]:
+    """
+    `parse_llm_json` for callers that cannot continue without the data.
+
+    Raises:
+        HTTPException: 502 if no JSON object could be recovered (counted as
+            a failed parse).
+    """
+    data, complete = parse_llm_json(response_text, feature)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="The AI service returned an unreadable response. Please try again.",
+        )
+    return data, complete
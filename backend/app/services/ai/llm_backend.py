@@ -0,0 +1,333 @@
+import asyncio
+import json
+import random
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from typing import AsyncIterator, Optional
+from dataclasses import dataclass
+from app.core.config import settings
+from .prompt_budget import estimate_tokens
+
+
+@dataclass
+class TokenUsage:
+    """Token counts of one LLM call, as reported by the backend."""
+    input_tokens: int = 0  # including cached tokens
+    output_tokens: int = 0
+    cached_tokens: int = 0
+
+
+@dataclass
+class LLMResponse:
+    """Completion text and its token usage."""
+    text: str
+    usage: TokenUsage
+
+
+class LLMBackend:
+    """
+    Text-generation backend used by gemini_client.
+
+    Backends only perform the raw call. Pooling, timeouts, retries and the
+    circuit breaker are applied by gemini_client around every backend.
+    """
+
+    name = "base"
+
+    @property
+    def model_name(self) -> str:
+        """Model label used in telemetry."""
+        return self.name
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: int,
+        response_schema: Optional[dict] = None,
+    ) -> LLMResponse:
+        """
+        Return the full completion for `prompt` with its token usage.
+
+        If `response_schema` is given the backend should constrain its output
+        to JSON matching that schema, where supported.
+        """
+        raise NotImplementedError
+
+    def stream(
+        self,
+        prompt: str,
+        max_tokens: int,
+        usage: Optional[TokenUsage] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the completion for `prompt` in fragments.
+
+        If `usage` is given it is filled in once the stream is exhausted.
+        """
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini via the google-generativeai async API."""
+
+    name = "gemini"
+
+    def __init__(self):
+        self._model: Optional[genai.GenerativeModel] = None
+
+    @property
+    def model_name(self) -> str:
+        return settings.GEMINI_MODEL
+
+    @property
+    def model(self) -> genai.GenerativeModel:
+        """Get or initialize the Gemini model."""
+        if self._model is None:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+            self._model = genai.GenerativeModel(settings.GEMINI_MODEL)
+        return self._model
+
+    @staticmethod
+    def _generation_config(
+        max_tokens: int, response_schema: Optional[dict] = None
+    ) -> genai.GenerationConfig:
+        if response_schema is None:
+            return genai.GenerationConfig(
+                max_output_tokens=max_tokens,
+                temperature=0.7,
+            )
+        return genai.GenerationConfig(
+            max_output_tokens=max_tokens,
+            temperature=0.7,
+            response_mime_type="application/json",
+            response_schema=response_schema,
+        )
+
+    @staticmethod
+    def _fill_usage(usage: TokenUsage, metadata) -> None:
+        """Copy Gemini usage metadata (if present) into `usage`."""
+        if metadata is None:
+            return
+        usage.input_tokens = getattr(metadata, "prompt_token_count", 0) or 0
+        usage.output_tokens = getattr(metadata, "candidates_token_count", 0) or 0
+        usage.cached_tokens = getattr(metadata, "cached_content_token_count", 0) or 0
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: int,
+        response_schema: Optional[dict] = None,
+    ) -> LLMResponse:
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(max_tokens, response_schema),
+        )
+        usage = TokenUsage()
+        self._fill_usage(usage, getattr(response, "usage_metadata", None))
+        return LLMResponse(response.text, usage)
+
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int,
+        usage: Optional[TokenUsage] = None,
+    ) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(max_tokens),
+            stream=True,
+        )
+        async for chunk in response:
+            if usage is not None:
+                # Running totals; the last chunk carries the final counts
+                self._fill_usage(usage, getattr(chunk, "usage_metadata", None))
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. finish metadata only)
+                continue
+            if text:
+                yield text
+
+
+FAKE_CV_ANALYSIS = {
+    "overall_score": 72,
+    "ats_compatibility": 80,
+    "keyword_matches": [
+        {"keyword": "Python", "found": True, "importance": "high", "suggestion": None},
+        {"keyword": "REST APIs", "found": True, "importance": "medium", "suggestion": None},
+        {
+            "keyword": "Kubernetes",
+            "found": False,
+            "importance": "high",
+            "suggestion": "Mention any container orchestration experience.",
+        },
+    ],
+    "missing_keywords": ["Kubernetes", "CI/CD"],
+    "sections": [
+        {
+            "name": "Experience",
+            "score": 75,
+            "feedback": "Relevant roles, but achievements lack metrics.",
+            "suggestions": ["Quantify impact in each bullet point."],
+        },
+        {
+            "name": "Skills",
+            "score": 68,
+            "feedback": "Core skills present; some required tools missing.",
+            "suggestions": ["Add Kubernetes and CI/CD tooling if applicable."],
+        },
+    ],
+    "summary": "Solid match for the role. Adding the missing infrastructure keywords and quantified results would raise the score.",
+    "improvement_tips": [
+        "Quantify achievements with numbers.",
+        "Mirror the job description's terminology.",
+    ],
+}
+
+FAKE_OPTIMIZED_CV = {
+    "contact_name": "Alex Candidate",
+    "contact_email": "alex@example.com",
+    "contact_phone": None,
+    "contact_location": "Remote",
+    "contact_linkedin": None,
+    "summary": "Backend engineer with 6 years of experience building reliable Python services and REST APIs.",
+    "experience": [
+        {
+            "title": "Senior Backend Engineer",
+            "organization": "Example Corp",
+            "period": "2020 - Present",
+            "bullets": [
+                "Cut API p95 latency by 40% by introducing caching and async I/O.",
+                "Led migration of 12 services to Kubernetes with CI/CD pipelines.",
+            ],
+            "details": None,
+        }
+    ],
+    "education": [
+        {
+            "title": "BSc Computer Science",
+            "organization": "Example University",
+            "period": "2012 - 2016",
+            "bullets": [],
+            "details": None,
+        }
+    ],
+    "skills": ["Python", "REST APIs", "Kubernetes", "CI/CD", "PostgreSQL"],
+    "certifications": [],
+    "estimated_score": 88,
+}
+
+FAKE_COVER_LETTER = (
+    "I am excited to apply for this role. Over the past six years I have built "
+    "and operated backend services that serve millions of requests a day, and "
+    "the responsibilities you describe match the work I enjoy most.\n\n"
+    "In my current position I reduced API latency by 40% and led the migration "
+    "of our services to a container platform with automated delivery pipelines. "
+    "I take pride in writing maintainable code and in mentoring the engineers "
+    "around me.\n\n"
+    "Your team's focus on reliability and user impact resonates with me, and I "
+    "would welcome the chance to discuss how I can contribute. Thank you for "
+    "your time and consideration."
+)
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic offline backend for load tests and benchmarks.
+
+    Returns canned responses shaped like the real prompts' expected output
+    (analysis JSON, optimized CV JSON or cover letter text). Latency is drawn
+    from a normal distribution and a configurable fraction of calls fail with
+    a retryable upstream error. The random sequence is seeded, so a run is
+    reproducible for a given request order.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_mean: float = 0.5,
+        latency_stddev: float = 0.1,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency_mean = latency_mean
+        self.latency_stddev = latency_stddev
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    @staticmethod
+    def canned_response(prompt: str) -> str:
+        """Pick the canned completion matching the prompt's expected output."""
+        if '"overall_score"' in prompt:
+            return json.dumps(FAKE_CV_ANALYSIS)
+        if '"estimated_score"' in prompt:
+            return json.dumps(FAKE_OPTIMIZED_CV)
+        return FAKE_COVER_LETTER
+
+    async def _simulate_call(self) -> float:
+        """Sleep for a sampled latency and maybe raise; returns the latency."""
+        latency = max(0.0, self._rng.gauss(self.latency_mean, self.latency_stddev))
+        fails = self._rng.random() < self.error_rate
+        await asyncio.sleep(latency)
+        if fails:
+            raise google_exceptions.ServiceUnavailable("Fake LLM backend error")
+        return latency
+
+    @staticmethod
+    def _usage(prompt: str, text: str) -> TokenUsage:
+        """Estimated counts, shaped like real usage metadata."""
+        return TokenUsage(input_tokens=estimate_tokens(prompt), output_tokens=estimate_tokens(text))
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: int,
+        response_schema: Optional[dict] = None,
+    ) -> LLMResponse:
+        await self._simulate_call()
+        text = self.canned_response(prompt)
+        return LLMResponse(text, self._usage(prompt, text))
+
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int,
+        usage: Optional[TokenUsage] = None,
+    ) -> AsyncIterator[str]:
+        latency = await self._simulate_call()
+        text = self.canned_response(prompt)
+        if usage is not None:
+            estimated = self._usage(prompt, text)
+            usage.input_tokens, usage.output_tokens = estimated.input_tokens, estimated.output_tokens
+        words = text.split(" ")
+        # Spread roughly half the sampled latency again over the chunks
+        delay = latency / 2 / max(1, len(words) // 8)
+        for start in range(0, len(words), 8):
+            fragment = " ".join(words[start:start + 8])
+            yield fragment if start == 0 else " " + fragment
+            await asyncio.sleep(delay)
+
+
+_backend: Optional[LLMBackend] = None
+
+
+def get_llm_backend() -> LLMBackend:
+    """Get or create the backend selected by settings.LLM_BACKEND."""
+    global _backend
+
+    if _backend is None:
+        if settings.LLM_BACKEND == "gemini":
+            _backend = GeminiBackend()
+        elif settings.LLM_BACKEND == "fake":
+            _backend = FakeBackend(
+                latency_mean=settings.FAKE_LLM_LATENCY_MEAN_SECONDS,
+                latency_stddev=settings.FAKE_LLM_LATENCY_STDDEV_SECONDS,
+                error_rate=settings.FAKE_LLM_ERROR_RATE,
+                seed=settings.FAKE_LLM_SEED,
+            )
+        else:
+            raise ValueError(f"Unknown LLM_BACKEND: {settings.LLM_BACKEND}")
+
+    return _backend
@@ -0,0 +1,223 @@
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from app.core.config import settings
+from app.core.metrics import register_stats
+
+
+logger = logging.getLogger(__name__)
+
+# Word-break hyphenation at a line end: "manage-\nment" -> "management"
+_HYPHENATION_RE = re.compile(r"(\w)-\n(\w)")
+# Standalone page markers: "3", "Page 3", "3 / 5", "Page 3 of 5", "- 3 -"
+_PAGE_NUMBER_RE = re.compile(
+    r"^[-\s]*(page\s+)?\d{1,3}(\s*(/|of)\s*\d{1,3})?[-\s]*$", re.IGNORECASE
+)
+_HORIZONTAL_WS_RE = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.]{1,}")
+
+# Job-ad boilerplate that carries little signal for matching
+_BOILERPLATE_RE = re.compile(
+    r"equal opportunity|eeo|regardless of (race|gender)|reasonable accommodation|"
+    r"privacy (policy|notice)|cookie|follow us|apply now|about us",
+    re.IGNORECASE,
+)
+
+_STOPWORDS = frozenset(
+    "the and for with you your our are will from this that have has into "
+    "their they them who what when where which while about able also been "
+    "being more most other such than then there these those very all any "
+    "can may must should would could not but its per via etc".split()
+)
+
+# Output token ranges per task: (minimum, maximum)
+_OUTPUT_LIMITS = {
+    "cv_analysis": (1536, 4096),
+    "cv_optimize": (2048, 8192),
+    "cover_letter": (1024, 1024),
+}
+
+# Lines repeated this many times are treated as page headers/footers
+_REPEATED_LINE_THRESHOLD = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def normalize_document_text(text: str) -> str:
+    """
+    Clean extracted document text before it is embedded in a prompt.
+
+    Joins hyphenated line breaks, drops page numbers, removes headers and
+    footers repeated on every page and duplicated paragraphs, and collapses
+    runs of whitespace.
+    """
+    text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
+    text = _HYPHENATION_RE.sub(r"\1\2", text)
+
+    lines = [_HORIZONTAL_WS_RE.sub(" ", line).strip() for line in text.split("\n")]
+    counts = Counter(line.lower() for line in lines if line)
+
+    kept: list[str] = []
+    seen: set[str] = set()
+    for line in lines:
+        if not line:
+            kept.append("")
+            continue
+        key = line.lower()
+        if _PAGE_NUMBER_RE.match(line):
+            continue
+        if key in seen and (
+            counts[key] >= _REPEATED_LINE_THRESHOLD or len(line) >= 60
+        ):
+            continue  # repeated header/footer or duplicated paragraph
+        seen.add(key)
+        kept.append(line)
+
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(kept)).strip()
+
+
+def trim_to_budget(text: str, max_tokens: int, reference: str = "") -> str:
+    """
+    Drop the lowest-value lines of `text` until it fits in `max_tokens`.
+
+    Lines are scored by how many terms they share with `reference` (e.g. the
+    job description when trimming a CV); boilerplate scores lowest. Headings
+    and the opening lines are kept. Surviving lines keep their order.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    reference_terms = _terms(reference)
+    lines = text.split("\n")
+    scored = []
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        terms = _terms(line)
+        score = len(terms & reference_terms) / (len(terms) ** 0.5 or 1)
+        if _BOILERPLATE_RE.search(line):
+            score -= 10
+        if index < 5 or (len(line) < 40 and line.rstrip().endswith(":")) or line.isupper():
+            score += 5  # contact block and section headings
+        scored.append((score, index))
+
+    budget_chars = max_tokens * 4
+    total_chars = len(text)
+    dropped: set[int] = set()
+    for _, index in sorted(scored):
+        if total_chars <= budget_chars:
+            break
+        dropped.add(index)
+        total_chars -= len(lines[index]) + 1
+
+    kept = [line for index, line in enumerate(lines) if index not in dropped]
+    trimmed = _BLANK_LINES_RE.sub("\n\n", "\n".join(kept)).strip()
+    # A single oversized line can still exceed the budget
+    return trimmed[:budget_chars]
+
+
+def _terms(text: str) -> set[str]:
+    """Lower-cased content words of `text`."""
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS}
+
+
+@dataclass
+class PromptPlan:
+    """Compacted prompt inputs and token budget for one LLM call."""
+    cv_text: str
+    job_description: str
+    max_output_tokens: int
+    input_tokens: int
+    tokens_saved: int
+
+
+class PromptBudgetStats:
+    """Running totals of input tokens removed by prompt compaction."""
+
+    def __init__(self):
+        self.requests = 0
+        self.trimmed_requests = 0
+        self.raw_input_tokens = 0
+        self.sent_input_tokens = 0
+
+    def record(self, raw_tokens: int, sent_tokens: int, trimmed: bool) -> None:
+        self.requests += 1
+        self.trimmed_requests += int(trimmed)
+        self.raw_input_tokens += raw_tokens
+        self.sent_input_tokens += sent_tokens
+
+    def stats(self) -> dict:
+        saved = self.raw_input_tokens - self.sent_input_tokens
+        return {
+            "requests": self.requests,
+            "trimmed_requests": self.trimmed_requests,
+            "raw_input_tokens": self.raw_input_tokens,
+            "sent_input_tokens": self.sent_input_tokens,
+            "tokens_saved": saved,
+            "avg_tokens_saved": round(saved / self.requests, 1) if self.requests else 0.0,
+        }
+
+
+budget_stats = PromptBudgetStats()
+register_stats("prompt_budget", budget_stats.stats)
+
+
+def plan_prompt(task: str, cv_text: str, job_description: str) -> PromptPlan:
+    """
+    Compact the prompt inputs for `task` and size its output budget.
+
+    The CV and job description are normalized, then trimmed if together they
+    exceed LLM_INPUT_TOKEN_BUDGET (the CV gets 60% of the budget, plus
+    whatever the job description does not use). The output limit scales
+    with the input size within per-task bounds.
+
+    Args:
+        task: One of "cv_analysis", "cv_optimize", "cover_letter".
+        cv_text: Raw extracted CV text (may be empty).
+        job_description: Raw job description.
+
+    Returns:
+        A PromptPlan with the text to send and the chosen max_output_tokens.
+    """
+    raw_tokens = estimate_tokens(cv_text) + estimate_tokens(job_description)
+
+    cv = normalize_document_text(cv_text)
+    job = normalize_document_text(job_description)
+
+    budget = settings.LLM_INPUT_TOKEN_BUDGET
+    trimmed = False
+    if estimate_tokens(cv) + estimate_tokens(job) > budget:
+        trimmed = True
+        job_budget = max(int(budget * 0.4), budget - estimate_tokens(cv))
+        job = trim_to_budget(job, job_budget, reference=cv)
+        cv = trim_to_budget(cv, budget - estimate_tokens(job), reference=job)
+
+    cv_tokens = estimate_tokens(cv)
+    input_tokens = cv_tokens + estimate_tokens(job)
+    low, high = _OUTPUT_LIMITS[task]
+    if task == "cv_optimize":
+        # The rewritten CV is roughly as long as the original
+        wanted = int(cv_tokens * 1.5) + 512
+    else:
+        wanted = 1024 + input_tokens // 4
+    max_output_tokens = max(low, min(high, wanted))
+
+    tokens_saved = max(0, raw_tokens - input_tokens)
+    budget_stats.record(raw_tokens, input_tokens, trimmed)
+    logger.info(
+        "prompt budget task=%s input_tokens=%d tokens_saved=%d max_output_tokens=%d",
+        task, input_tokens, tokens_saved, max_output_tokens,
+    )
+
+    return PromptPlan(
+        cv_text=cv,
+        job_description=job,
+        max_output_tokens=max_output_tokens,
+        input_tokens=input_tokens,
+        tokens_saved=tokens_saved,
+    )
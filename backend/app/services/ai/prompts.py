@@ -0,0 +1,150 @@
+import hashlib
+import random
+import string
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.core.telemetry import current_user_id
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A prompt template, parsed once when it is registered.
+
+    `version` combines the human label with a hash of the template text (and
+    of any fixed fragments inserted into it, such as tone instructions), so
+    editing a prompt changes its version even if nobody bumps the label.
+    """
+
+    name: str
+    label: str
+    text: str
+    version: str
+    fields: frozenset[str]
+    # (literal text, field name or None) in template order
+    _segments: tuple[tuple[str, Optional[str]], ...] = field(repr=False, default=())
+
+    @classmethod
+    def compile(
+        cls, name: str, label: str, text: str, fragments: Iterable[str] = ()
+    ) -> "PromptTemplate":
+        """
+        Parse `text` (str.format syntax, plain `{name}` fields only).
+
+        Raises:
+            ValueError: If a field uses indexing, a conversion or a format spec.
+        """
+        segments = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(text):
+            if field_name is not None and (
+                not field_name.isidentifier() or format_spec or conversion
+            ):
+                raise ValueError(f"Prompt {name!r}: unsupported field {{{field_name}}}")
+            segments.append((literal, field_name))
+
+        digest = hashlib.sha256(text.encode("utf-8"))
+        for fragment in fragments:
+            digest.update(b"\0" + fragment.encode("utf-8"))
+
+        return cls(
+            name=name,
+            label=label,
+            text=text,
+            version=f"{label}.{digest.hexdigest()[:8]}",
+            fields=frozenset(f for _, f in segments if f is not None),
+            _segments=tuple(segments),
+        )
+
+    def render(self, **values: str) -> str:
+        """
+        Fill in the template.
+
+        Raises:
+            KeyError: If a field has no value.
+        """
+        return "".join(
+            literal + (str(values[name]) if name is not None else "")
+            for literal, name in self._segments
+        )
+
+
+class PromptRegistry:
+    """
+    Versioned prompt templates, with A/B selection between versions.
+
+    Each prompt name has one or more registered variants. `select` returns
+    the variant to use for the current request: by default the most
+    recently registered one, or, when PROMPT_AB_TESTS assigns weights to
+    several labels of a prompt, a weighted choice. The choice is a stable
+    hash of the signed-in user, so a user keeps seeing the same variant;
+    anonymous requests are assigned at random.
+
+    The selected template's `version` is stamped on results and included
+    in response cache keys, and labels LLM telemetry, so variants can be
+    compared on latency and token use.
+    """
+
+    def __init__(self):
+        self._variants: dict[str, dict[str, PromptTemplate]] = {}
+        self._selections: dict[str, int] = {}
+
+    def register(
+        self, name: str, label: str, text: str, fragments: Iterable[str] = ()
+    ) -> PromptTemplate:
+        """Compile and register a variant of prompt `name`."""
+        variants = self._variants.setdefault(name, {})
+        if label in variants:
+            raise ValueError(f"Prompt {name!r} already has a variant {label!r}")
+        template = PromptTemplate.compile(name, label, text, fragments)
+        variants[label] = template
+        return template
+
+    def get(self, name: str, label: Optional[str] = None) -> PromptTemplate:
+        """A specific variant of `name`, or its default (latest) variant."""
+        variants = self._variants[name]
+        if label is None:
+            return next(reversed(variants.values()))
+        return variants[label]
+
+    def select(self, name: str) -> PromptTemplate:
+        """Variant of `name` to use for the current request."""
+        weights = {
+            label: weight
+            for label, weight in settings.PROMPT_AB_TESTS.get(name, {}).items()
+            if label in self._variants[name] and weight > 0
+        }
+        if len(weights) < 2:
+            template = self.get(name, next(iter(weights), None))
+        else:
+            user_id = current_user_id()
+            if user_id:
+                digest = hashlib.sha256(f"{name}:{user_id}".encode("utf-8")).digest()
+                point = int.from_bytes(digest[:8], "big") / 2 ** 64
+            else:
+                point = random.random()
+            point *= sum(weights.values())
+            for label, weight in weights.items():
+                point -= weight
+                if point < 0:
+                    break
+            template = self.get(name, label)
+
+        key = f"{name}:{template.version}"
+        self._selections[key] = self._selections.get(key, 0) + 1
+        return template
+
+    def stats(self) -> dict:
+        """Registered versions per prompt and how often each was selected."""
+        return {
+            name: {
+                template.version: self._selections.get(f"{name}:{template.version}", 0)
+                for template in variants.values()
+            }
+            for name, variants in self._variants.items()
+        }
+
+
+prompt_registry = PromptRegistry()
+register_stats("prompts", prompt_registry.stats)
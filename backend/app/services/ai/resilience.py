@@ -0,0 +1,186 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream dependency is unhealthy.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected for `reset_timeout` seconds. It then goes half-open
+    and lets a single trial call through: success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed, False to fail fast."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit past the threshold."""
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Release a half-open trial that ended without a verdict."""
+        self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        """Current state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to derive hedging thresholds."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int = 1) -> Optional[float]:
+        """Return the p-th percentile (0-1), or None with too few samples."""
+        if len(self._samples) < max(1, min_samples):
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(p * len(ordered)))
+        return ordered[index]
+
+
+async def retry_with_backoff(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    is_retryable: Callable[[BaseException], bool],
+    on_retry: Optional[Callable[[int, BaseException], None]] = None,
+) -> T:
+    """
+    Call `fn`, retrying retryable errors with exponential backoff.
+
+    The delay before retry n is min(max_delay, base_delay * 2**n), scaled by
+    a random jitter factor in [0.5, 1] to avoid synchronized retries.
+
+    Args:
+        fn: Zero-argument coroutine factory for one attempt.
+        max_retries: Retries after the first attempt.
+        base_delay: Delay before the first retry, in seconds.
+        max_delay: Upper bound on any single delay, in seconds.
+        is_retryable: Predicate deciding whether an error is transient.
+        on_retry: Optional callback invoked with (retry_number, error).
+
+    Returns:
+        The result of the first successful attempt.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = min(max_delay, base_delay * (2 ** attempt))
+            attempt += 1
+            if on_retry is not None:
+                on_retry(attempt, e)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+
+async def hedged(
+    fn: Callable[[], Awaitable[T]],
+    hedge_after: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None,
+) -> T:
+    """
+    Call `fn`, starting a second identical attempt if the first is slow.
+
+    If the first attempt has not finished after `hedge_after` seconds, a
+    hedge attempt is launched and whichever succeeds first wins; the other
+    is cancelled. If both fail, the last error is raised (CancelledError if
+    every attempt was cancelled).
+
+    Args:
+        fn: Zero-argument coroutine factory for one attempt.
+        hedge_after: Delay before hedging, or None to disable hedging.
+        on_hedge: Optional callback invoked when a hedge is launched.
+    """
+    if hedge_after is None:
+        return await fn()
+
+    pending = {asyncio.ensure_future(fn())}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_after)
+        if not done:
+            if on_hedge is not None:
+                on_hedge()
+            pending.add(asyncio.ensure_future(fn()))
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                # A cancelled attempt has no exception to report
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error if error is not None else asyncio.CancelledError()
+    finally:
+        for task in pending:
+            task.cancel()
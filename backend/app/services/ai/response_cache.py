@@ -0,0 +1,82 @@
+import hashlib
+import json
+import re
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.utils.cache import LRUCache, SQLiteCache, TieredCache
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt_input(text: str) -> str:
+    """Normalize free text so cosmetic differences map to the same cache key."""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+class ResponseCache(TieredCache[dict]):
+    """
+    Content-addressed cache of parsed LLM responses.
+
+    Keys hash the feature name, prompt template version, model name and the
+    normalized prompt inputs, so changing any of them invalidates old entries.
+    Lookups hit the in-memory LRU first, then the optional SQLite tier.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        super().__init__(memory, disk)
+        self.tokens_saved = 0
+
+    @staticmethod
+    def make_key(feature: str, prompt_version: str, **inputs: str) -> str:
+        """Build a stable cache key from the prompt inputs."""
+        payload = {
+            "feature": feature,
+            "prompt_version": prompt_version,
+            "model": settings.GEMINI_MODEL,
+            "inputs": {
+                name: normalize_prompt_input(value)
+                for name, value in sorted(inputs.items())
+            },
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return the cached parsed response for `key`, if any."""
+        entry = await super().get(key)
+        if entry is None:
+            return None
+        self.tokens_saved += entry.get("tokens", 0)
+        return entry["data"]
+
+    async def set(self, key: str, data: dict, tokens: int) -> None:
+        """
+        Store a parsed response.
+
+        Args:
+            key: Key from `make_key`.
+            data: The parsed response to cache.
+            tokens: Estimated prompt + completion tokens a hit will save.
+        """
+        await super().set(key, {"data": data, "tokens": tokens})
+
+    def stats(self) -> dict:
+        """Hit/miss counters and estimated token spend saved."""
+        return {
+            "enabled": settings.LLM_CACHE_ENABLED,
+            **super().stats(),
+            "estimated_tokens_saved": self.tokens_saved,
+        }
+
+
+response_cache = ResponseCache(
+    memory=LRUCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS),
+    disk=(
+        SQLiteCache(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_TTL_SECONDS)
+        if settings.LLM_CACHE_SQLITE_PATH
+        else None
+    ),
+)
+register_stats("llm_cache", response_cache.stats)
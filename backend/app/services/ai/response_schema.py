@@ -0,0 +1,71 @@
+from typing import Iterable
+from pydantic import BaseModel
+
+
+# JSON Schema type names -> Gemini response_schema types
+_TYPE_MAP = {
+    "string": "STRING",
+    "integer": "INTEGER",
+    "number": "NUMBER",
+    "boolean": "BOOLEAN",
+    "array": "ARRAY",
+    "object": "OBJECT",
+}
+
+
+def response_schema_for(model: type[BaseModel], exclude: Iterable[str] = ()) -> dict:
+    """
+    Derive a Gemini response schema from a Pydantic model.
+
+    Inlines `$ref` definitions, turns `Optional[...]` into `nullable`, drops
+    keywords Gemini does not accept (titles, defaults, bounds) and marks every
+    remaining property as required so the model always emits it.
+
+    Args:
+        model: The Pydantic model describing the expected output.
+        exclude: Top-level fields the model should not generate (ids,
+            timestamps and other server-side metadata).
+
+    Returns:
+        A schema dict suitable for GenerationConfig.response_schema.
+    """
+    json_schema = model.model_json_schema()
+    schema = _convert(json_schema, json_schema.get("$defs", {}))
+
+    for name in exclude:
+        schema["properties"].pop(name, None)
+    schema["required"] = list(schema["properties"])
+    return schema
+
+
+def _convert(node: dict, defs: dict) -> dict:
+    if "$ref" in node:
+        return _convert(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+
+    if "anyOf" in node:
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        converted = _convert(options[0], defs) if options else {"type": "STRING"}
+        if len(options) < len(node["anyOf"]):
+            converted["nullable"] = True
+        if "description" in node:
+            converted.setdefault("description", node["description"])
+        return converted
+
+    converted: dict = {}
+    if "type" in node:
+        converted["type"] = _TYPE_MAP.get(node["type"], "STRING")
+    if node.get("format") == "date-time":
+        converted["format"] = "date-time"
+    if "description" in node:
+        converted["description"] = node["description"]
+    if "enum" in node:
+        converted["type"] = "STRING"
+        converted["enum"] = [str(value) for value in node["enum"]]
+    if "items" in node:
+        converted["items"] = _convert(node["items"], defs)
+    if "properties" in node:
+        converted["properties"] = {
+            name: _convert(prop, defs) for name, prop in node["properties"].items()
+        }
+        converted["required"] = list(converted["properties"])
+    return converted
@@ -0,0 +1,214 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+from fastapi import HTTPException, status
+
+
+# Scheduling tiers, highest priority first
+PRIORITY_TIERS = ("premium", "free", "anonymous")
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default="free")
+
+
+def tier_for_plan(plan: Optional[str]) -> str:
+    """Scheduling tier of a user plan (None for anonymous visitors)."""
+    if plan is None:
+        return "anonymous"
+    return "premium" if plan == "premium" else "free"
+
+
+def set_priority(tier: str) -> None:
+    """
+    Set the LLM scheduling tier for the current request.
+
+    The tier is kept in a context variable, so it follows the request into
+    the tasks it spawns (single-flight calls, background jobs submitted
+    from it) without being threaded through every AI service call.
+    """
+    _priority.set(tier if tier in PRIORITY_TIERS else "free")
+
+
+def current_priority() -> str:
+    """LLM scheduling tier of the current request ("free" if never set)."""
+    return _priority.get()
+
+
+class _TierState:
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.queue: deque = deque()  # (tag, seq, future), in arrival order
+        self.last_tag = 0.0
+        self.in_flight = 0
+        self.granted = 0
+        self.queue_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def waiting(self) -> int:
+        # Timed-out entries stay queued until they reach the head
+        return sum(1 for _, _, future in self.queue if not future.done())
+
+
+class PriorityScheduler:
+    """
+    Bounds concurrent upstream LLM calls and shares them across plan tiers.
+
+    Waiting calls are served by weighted fair queuing: every call is tagged
+    with a virtual finish time of max(now, tier's last tag) + 1 / weight, and
+    a freed slot goes to the queued call with the smallest tag. Under
+    contention each tier therefore gets slots in proportion to its weight,
+    while an idle tier's share is used by the others. On top of that,
+    `premium_reserved` slots are only ever given to premium calls, so
+    anonymous and free traffic cannot occupy the whole pool.
+
+    Calls pick up the tier set with `set_priority`; single-flight only
+    collapses concurrent duplicates of the same tier.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        weights: dict[str, float],
+        premium_reserved: int = 0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.premium_reserved = max(0, min(premium_reserved, max_concurrency - 1))
+        self._tiers = {tier: _TierState(weights.get(tier, 1.0)) for tier in PRIORITY_TIERS}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self.in_flight = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.queue_timeouts = 0
+        self.failures = 0
+
+    @property
+    def waiting(self) -> int:
+        return sum(state.waiting for state in self._tiers.values())
+
+    def _may_start(self, tier: str) -> bool:
+        if self.in_flight >= self.max_concurrency:
+            return False
+        if tier == "premium":
+            return True
+        non_premium = self.in_flight - self._tiers["premium"].in_flight
+        return non_premium < self.max_concurrency - self.premium_reserved
+
+    def _start(self, tier: str) -> None:
+        self.in_flight += 1
+        self._tiers[tier].in_flight += 1
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued calls, smallest virtual tag first."""
+        while True:
+            best = None
+            for tier, state in self._tiers.items():
+                while state.queue and state.queue[0][2].done():
+                    state.queue.popleft()  # timed out or cancelled
+                if state.queue and self._may_start(tier):
+                    if best is None or state.queue[0][:2] < self._tiers[best].queue[0][:2]:
+                        best = tier
+            if best is None:
+                return
+            tag, _, future = self._tiers[best].queue.popleft()
+            self._virtual_time = max(self._virtual_time, tag)
+            self._start(best)
+            future.set_result(None)
+
+    def _release(self, tier: str) -> None:
+        self.in_flight -= 1
+        self._tiers[tier].in_flight -= 1
+        self._dispatch()
+
+    def _record_wait(self, state: _TierState, seconds: float) -> None:
+        state.total_wait_seconds += seconds
+        state.max_wait_seconds = max(state.max_wait_seconds, seconds)
+
+    @asynccontextmanager
+    async def slot(
+        self, queue_timeout: float, tier: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """
+        Acquire a slot for `tier` (default: the current request's tier),
+        waiting at most `queue_timeout` seconds.
+
+        Raises:
+            HTTPException: 503 if no slot frees up in time.
+        """
+        tier = tier if tier in self._tiers else current_priority()
+        state = self._tiers[tier]
+        started = time.monotonic()
+
+        if not self.waiting and self._may_start(tier):
+            self._start(tier)
+        else:
+            tag = max(self._virtual_time, state.last_tag) + 1.0 / state.weight
+            state.last_tag = tag
+            future = asyncio.get_running_loop().create_future()
+            state.queue.append((tag, next(self._seq), future))
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            self._dispatch()
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=queue_timeout)
+            except asyncio.TimeoutError:
+                if not future.done():
+                    future.cancel()
+                    state.queue_timeouts += 1
+                    self.queue_timeouts += 1
+                    self._record_wait(state, time.monotonic() - started)
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="AI service is busy. Please try again in a moment.",
+                    )
+                # Granted just as the timeout fired: keep the slot
+            except BaseException:
+                if not future.done():
+                    future.cancel()
+                else:
+                    self._release(tier)  # granted, but the caller went away
+                raise
+
+        state.granted += 1
+        self._record_wait(state, time.monotonic() - started)
+        try:
+            yield
+        finally:
+            self._release(tier)
+
+    def stats(self) -> dict:
+        """Snapshot of pool utilization, queue depth and per-tier waits."""
+        acquired = self.completed + self.timeouts + self.failures + self.in_flight
+        total_wait = sum(state.total_wait_seconds for state in self._tiers.values())
+        return {
+            "max_concurrency": self.max_concurrency,
+            "premium_reserved": self.premium_reserved,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "queue_timeouts": self.queue_timeouts,
+            "failures": self.failures,
+            "avg_queue_wait_seconds": round(total_wait / acquired, 4) if acquired else 0.0,
+            "tiers": {
+                tier: {
+                    "weight": state.weight,
+                    "in_flight": state.in_flight,
+                    "queue_depth": state.waiting,
+                    "granted": state.granted,
+                    "queue_timeouts": state.queue_timeouts,
+                    "avg_wait_ms": (
+                        round(state.total_wait_seconds / state.granted * 1000, 3)
+                        if state.granted else 0.0
+                    ),
+                    "max_wait_ms": round(state.max_wait_seconds * 1000, 3),
+                }
+                for tier, state in self._tiers.items()
+            },
+        }
@@ -0,0 +1,9 @@
+from .parser_pool import DocumentParserPool, document_parser
+from .text_cache import ParsedDocument, ParsedTextCache
+
+__all__ = [
+    "ParsedDocument",
+    "ParsedTextCache",
+    "DocumentParserPool",
+    "document_parser",
+]
@@ -0,0 +1,310 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from fastapi import HTTPException, status
+from app.core import telemetry
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.utils.cache import LRUCache, SQLiteCache
+from app.utils.document_parser import (
+    BytesLike,
+    PARSER_VERSION,
+    ParseTimeoutError,
+    extract_text_with_limits,
+)
+from app.utils.single_flight import SingleFlight, fingerprint
+from .text_cache import ParsedDocument, ParsedTextCache
+
+
+logger = logging.getLogger(__name__)
+
+# Wall-clock grace on top of the CPU limit before a worker is presumed stuck
+_WALL_CLOCK_GRACE_SECONDS = 5.0
+# Uploads larger than this are hashed off the event loop
+_INLINE_HASH_MAX_BYTES = 1024 * 1024
+
+parse_duration = telemetry.Histogram(
+    "document_parse_duration_seconds",
+    "Time to extract text from an uploaded CV, by format and outcome.",
+    ("format", "outcome"),
+    (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+)
+telemetry.register_metric(parse_duration)
+
+
+def _picklable(file_content: BytesLike) -> BytesLike:
+    """
+    Content to send to a worker process.
+
+    Memoryviews cannot be pickled; one spanning its whole buffer (as
+    `read_upload` returns) is sent as that buffer instead of a copy.
+    """
+    if not isinstance(file_content, memoryview):
+        return file_content
+    buffer = file_content.obj
+    if isinstance(buffer, (bytes, bytearray)) and len(buffer) == file_content.nbytes:
+        return buffer
+    return file_content.tobytes()
+
+
+def _document_format(content_type: str, filename: Optional[str]) -> str:
+    name = (filename or "").lower()
+    if content_type == "application/pdf" or name.endswith(".pdf"):
+        return "pdf"
+    if content_type.endswith("wordprocessingml.document") or name.endswith(".docx"):
+        return "docx"
+    return "other"
+
+
+class DocumentParserPool:
+    """
+    Extracts text from uploaded CVs in a pool of worker processes.
+
+    PDF and DOCX parsing is pure-Python and CPU bound, so running it on the
+    event loop (or in a thread, holding the GIL) stalls every other request.
+    At most `workers` documents are parsed at once; further requests wait
+    their turn. Each document gets `timeout` seconds of CPU time in its
+    worker, and PDFs longer than `max_pages` are rejected before their text
+    is extracted. A worker that stops responding altogether is killed and
+    the pool restarted.
+
+    With `workers=0` documents are parsed in a thread instead (no CPU
+    limit), which is convenient for development and tests.
+
+    Successful parses are kept in `cache`, keyed by the SHA-256 of the
+    upload, and concurrent uploads of the same file are parsed once.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        timeout: float,
+        max_pages: int,
+        cache: Optional[ParsedTextCache] = None,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.cache = cache
+        self._inflight = SingleFlight()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.restarts = 0
+        self.total_parse_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned (not forked) workers don't inherit the server's
+            # threads, sockets or Firebase clients
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _restart(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        """
+        Kill the workers of `executor` (e.g. one is stuck) and start a fresh
+        pool on next use.
+
+        Does nothing if `executor` was already replaced, so the other parses
+        failing along with it don't tear down the new pool.
+        """
+        if executor is None or executor is not self._executor:
+            return
+        self._executor = None
+        self.restarts += 1
+        # ProcessPoolExecutor cannot cancel a running task; terminate its processes
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def extract_text(
+        self, file_content: BytesLike, content_type: str, filename: Optional[str] = None
+    ) -> str:
+        """
+        Extract the text of an uploaded PDF or DOCX file.
+
+        Raises:
+            ValueError: If the file type is not supported, the PDF has too
+                many pages or the file cannot be read.
+            HTTPException: 422 if parsing takes longer than the time limit,
+                503 if the worker running it died.
+        """
+        return (await self.parse(file_content, content_type, filename)).text
+
+    async def parse(
+        self, file_content: BytesLike, content_type: str, filename: Optional[str] = None
+    ) -> ParsedDocument:
+        """
+        Extract the text of an uploaded file, from the cache when it was
+        uploaded before. Raises as `extract_text`.
+        """
+        doc_format = _document_format(content_type, filename)
+        parts = (doc_format, PARSER_VERSION, str(self.max_pages), file_content)
+        if len(file_content) > _INLINE_HASH_MAX_BYTES:
+            key = await asyncio.to_thread(fingerprint, *parts)
+        else:
+            key = fingerprint(*parts)
+
+        if self.cache is not None:
+            document = await self.cache.get(key)
+            if document is not None:
+                return document
+
+        async def parse_and_store() -> ParsedDocument:
+            started = time.monotonic()
+            text = await self._extract(file_content, content_type, filename, doc_format)
+            document = ParsedDocument(
+                text=text,
+                format=doc_format,
+                size_bytes=len(file_content),
+                parse_ms=round((time.monotonic() - started) * 1000, 3),
+            )
+            if self.cache is not None and text.strip():
+                await self.cache.set(key, document)
+            return document
+
+        return await self._inflight.do(key, parse_and_store)
+
+    async def _extract(
+        self,
+        file_content: BytesLike,
+        content_type: str,
+        filename: Optional[str],
+        doc_format: str,
+    ) -> str:
+        """Parse in a worker process once a slot is free."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(max(1, self.workers))
+        queued = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started = time.monotonic()
+        self.total_wait_seconds += started - queued
+        self.in_flight += 1
+        outcome = "error"
+        executor = None
+        try:
+            if self.workers > 0:
+                executor = self._get_executor()
+                future = asyncio.get_running_loop().run_in_executor(
+                    executor,
+                    extract_text_with_limits,
+                    _picklable(file_content),
+                    content_type,
+                    filename,
+                    self.max_pages,
+                    self.timeout,
+                )
+                text = await asyncio.wait_for(
+                    future, timeout=self.timeout + _WALL_CLOCK_GRACE_SECONDS
+                )
+            else:
+                text = await asyncio.to_thread(
+                    extract_text_with_limits,
+                    file_content,
+                    content_type,
+                    filename,
+                    self.max_pages,
+                    0,
+                )
+            outcome = "success"
+            self.completed += 1
+            return text
+        except ValueError:
+            outcome = "rejected"
+            self.rejected += 1
+            raise
+        except (ParseTimeoutError, asyncio.TimeoutError) as e:
+            outcome = "timeout"
+            self.timeouts += 1
+            if isinstance(e, asyncio.TimeoutError):
+                logger.warning("Document parser worker stuck; restarting the pool")
+                self._restart(executor)
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="The document took too long to read. Please upload a simpler PDF or DOCX file.",
+            )
+        except BrokenProcessPool:
+            # Also raised for parses sharing a pool killed after a timeout
+            self.failures += 1
+            logger.warning("Document parser pool broke; restarting it")
+            self._restart(executor)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The document could not be read right now. Please try again.",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            elapsed = time.monotonic() - started
+            self.total_parse_seconds += elapsed
+            parse_duration.observe(elapsed, format=doc_format, outcome=outcome)
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stop(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Pool utilization, queue depth, outcomes and text cache hits."""
+        parsed = self.completed + self.rejected + self.timeouts + self.failures
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "collapsed": self._inflight.collapsed,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "utilization": round(self.in_flight / self.workers, 4) if self.workers else 0.0,
+            "queue_depth": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "avg_parse_ms": round(self.total_parse_seconds / parsed * 1000, 3) if parsed else 0.0,
+            "avg_wait_ms": round(self.total_wait_seconds / parsed * 1000, 3) if parsed else 0.0,
+        }
+
+
+document_parser = DocumentParserPool(
+    workers=settings.DOCUMENT_PARSER_WORKERS,
+    timeout=settings.DOCUMENT_PARSE_TIMEOUT_SECONDS,
+    max_pages=settings.DOCUMENT_MAX_PAGES,
+    cache=(
+        ParsedTextCache(
+            memory=LRUCache(
+                settings.DOCUMENT_TEXT_CACHE_MAX_ENTRIES,
+                settings.DOCUMENT_TEXT_CACHE_TTL_SECONDS,
+            ),
+            disk=(
+                SQLiteCache(
+                    settings.DOCUMENT_TEXT_CACHE_SQLITE_PATH,
+                    settings.DOCUMENT_TEXT_CACHE_TTL_SECONDS,
+                )
+                if settings.DOCUMENT_TEXT_CACHE_SQLITE_PATH
+                else None
+            ),
+        )
+        if settings.DOCUMENT_TEXT_CACHE_ENABLED
+        else None
+    ),
+)
+register_stats("document_parser", document_parser.stats)
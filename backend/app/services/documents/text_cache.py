@@ -0,0 +1,44 @@
+from dataclasses import asdict, dataclass
+from typing import Optional
+from app.utils.cache import LRUCache, SQLiteCache, TieredCache
+
+
+@dataclass
+class ParsedDocument:
+    """Text extracted from an uploaded file, with how it was obtained."""
+
+    text: str
+    format: str  # "pdf" or "docx"
+    size_bytes: int
+    parse_ms: float  # time the original parse took
+
+
+class ParsedTextCache(TieredCache[ParsedDocument]):
+    """
+    Content-addressed cache of extracted CV text.
+
+    Keys are SHA-256 fingerprints of the uploaded bytes, so uploading the
+    same file again (e.g. to analyze, then optimize) skips parsing. Lookups
+    hit the in-memory LRU first, then the optional SQLite tier.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        super().__init__(memory, disk)
+        self.parse_ms_saved = 0.0
+
+    def _encode(self, document: ParsedDocument) -> str:
+        return super()._encode(asdict(document))
+
+    def _decode(self, raw: str) -> ParsedDocument:
+        return ParsedDocument(**super()._decode(raw))
+
+    async def get(self, key: str) -> Optional[ParsedDocument]:
+        """Return the cached parse for `key`, if any."""
+        document = await super().get(key)
+        if document is not None:
+            self.parse_ms_saved += document.parse_ms
+        return document
+
+    def stats(self) -> dict:
+        """Hit/miss counters and parse time saved."""
+        return {**super().stats(), "parse_ms_saved": round(self.parse_ms_saved, 3)}
@@ -1,12 +1,18 @@
 from .user_service import user_service, UserService
 from .cv_service import cv_service, CVService
+from .cv_document_service import cv_document_service, CVDocumentService
 from .cover_letter_service import cover_letter_service, CoverLetterService
+from .usage_ledger import usage_ledger, UsageLedger
 
 __all__ = [
     "user_service",
     "UserService",
     "cv_service",
     "CVService",
+    "cv_document_service",
+    "CVDocumentService",
     "cover_letter_service",
     "CoverLetterService",
+    "usage_ledger",
+    "UsageLedger",
 ]
@@ -26,6 +26,7 @@ class ApplicationService:
             "position": data.position,
             "status": data.status,
             "jobUrl": data.job_url,
+            "jobDescription": data.job_description,
             "cvAnalysisId": data.cv_analysis_id,
             "coverLetterId": data.cover_letter_id,
             "notes": data.notes,
@@ -43,6 +44,7 @@ class ApplicationService:
             position=data.position,
             status=data.status,
             job_url=data.job_url,
+            job_description=data.job_description,
             cv_analysis_id=data.cv_analysis_id,
             cover_letter_id=data.cover_letter_id,
             notes=data.notes,
@@ -104,6 +106,8 @@ class ApplicationService:
             update_data["status"] = data.status
         if data.job_url is not None:
             update_data["jobUrl"] = data.job_url
+        if data.job_description is not None:
+            update_data["jobDescription"] = data.job_description
         if data.cv_analysis_id is not None:
             update_data["cvAnalysisId"] = data.cv_analysis_id
         if data.cover_letter_id is not None:
@@ -143,6 +147,7 @@ class ApplicationService:
             position=data.get("position", ""),
             status=data.get("status", "saved"),
             job_url=data.get("jobUrl"),
+            job_description=data.get("jobDescription"),
             cv_analysis_id=data.get("cvAnalysisId"),
             cover_letter_id=data.get("coverLetterId"),
             notes=data.get("notes"),
@@ -21,22 +21,52 @@ class CoverLetterService:
         self, user_id: str, cover_letter: CoverLetterResponse
     ) -> str:
         """Save a cover letter to Firestore."""
-        user_ref = self.db.collection(self.USERS_COLLECTION).document(user_id)
-        letters_ref = user_ref.collection(self.COVER_LETTERS_SUBCOLLECTION)
+        doc_ref = self._letters_ref(user_id).add(
+            self._to_doc_data(user_id, cover_letter)
+        )
+        return doc_ref[1].id
 
-        doc_data = {
+    async def save_cover_letters(
+        self, user_id: str, cover_letters: list[CoverLetterResponse]
+    ) -> list[str]:
+        """
+        Save several cover letters in one batched write.
+
+        Returns:
+            The new document IDs, in the order of `cover_letters`.
+        """
+        letters_ref = self._letters_ref(user_id)
+        batch = self.db.batch()
+        doc_refs = []
+        for cover_letter in cover_letters:
+            doc_ref = letters_ref.document()
+            batch.set(doc_ref, self._to_doc_data(user_id, cover_letter))
+            doc_refs.append(doc_ref)
+
+        batch.commit()
+        return [doc_ref.id for doc_ref in doc_refs]
+
+    def _letters_ref(self, user_id: str):
+        return (
+            self.db.collection(self.USERS_COLLECTION)
+            .document(user_id)
+            .collection(self.COVER_LETTERS_SUBCOLLECTION)
+        )
+
+    @staticmethod
+    def _to_doc_data(user_id: str, cover_letter: CoverLetterResponse) -> dict:
+        """Convert a CoverLetterResponse to a new Firestore document."""
+        return {
             "userId": user_id,
             "jobTitle": cover_letter.job_title,
             "companyName": cover_letter.company_name,
             "tone": cover_letter.tone,
             "content": cover_letter.content,
             "wordCount": cover_letter.word_count,
+            "promptVersion": cover_letter.prompt_version,
             "createdAt": firestore.SERVER_TIMESTAMP,
         }
 
-        doc_ref = letters_ref.add(doc_data)
-        return doc_ref[1].id
-
     async def get_cover_letter(
         self, user_id: str, letter_id: str
     ) -> Optional[CoverLetterResponse]:
@@ -61,6 +91,7 @@ class CoverLetterService:
             tone=data.get("tone"),
             content=data.get("content"),
             word_count=data.get("wordCount"),
+            prompt_version=data.get("promptVersion"),
             created_at=data.get("createdAt"),
         )
 
@@ -0,0 +1,135 @@
+import re
+from google.cloud import firestore
+from typing import Optional
+from app.core.firebase import get_firestore_client
+from app.schemas.cv import CVDocument
+
+
+_DOCUMENT_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class CVDocumentService:
+    """
+    Service for CVs stored once and referenced by id in AI requests.
+
+    Documents hold the normalized extracted text, so analyze, optimize and
+    cover letter requests can skip uploading and parsing the file. The
+    document id is the SHA-256 of the uploaded file, so uploading the same
+    file again returns the existing document.
+    """
+
+    USERS_COLLECTION = "users"
+    DOCUMENTS_SUBCOLLECTION = "cv_documents"
+    # Fields returned in listings (the text itself is only read when used)
+    _METADATA_FIELDS = [
+        "filename",
+        "contentType",
+        "sizeBytes",
+        "contentHash",
+        "wordCount",
+        "createdAt",
+    ]
+
+    def __init__(self):
+        self.db = get_firestore_client()
+
+    @staticmethod
+    def is_valid_id(document_id: str) -> bool:
+        """Document ids are SHA-256 hex digests."""
+        return bool(_DOCUMENT_ID_RE.match(document_id))
+
+    def _documents_ref(self, user_id: str):
+        return (
+            self.db.collection(self.USERS_COLLECTION)
+            .document(user_id)
+            .collection(self.DOCUMENTS_SUBCOLLECTION)
+        )
+
+    async def save_document(
+        self,
+        user_id: str,
+        filename: Optional[str],
+        content_type: str,
+        size_bytes: int,
+        content_hash: str,
+        text: str,
+    ) -> CVDocument:
+        """Store a CV's extracted text, or return the existing document for the same file."""
+        doc_ref = self._documents_ref(user_id).document(content_hash)
+        doc = doc_ref.get()
+        if doc.exists:
+            return self._doc_to_document(doc.id, doc.to_dict())
+
+        doc_data = {
+            "userId": user_id,
+            "filename": filename,
+            "contentType": content_type,
+            "sizeBytes": size_bytes,
+            "contentHash": content_hash,
+            "text": text,
+            "wordCount": len(text.split()),
+            "createdAt": firestore.SERVER_TIMESTAMP,
+        }
+        doc_ref.set(doc_data)
+        return self._doc_to_document(content_hash, {**doc_data, "createdAt": None})
+
+    async def get_document(
+        self, user_id: str, document_id: str
+    ) -> Optional[CVDocument]:
+        """Get a stored CV's metadata."""
+        if not self.is_valid_id(document_id):
+            return None
+        doc = self._documents_ref(user_id).document(document_id).get()
+        if not doc.exists:
+            return None
+        return self._doc_to_document(doc.id, doc.to_dict())
+
+    async def get_document_text(self, user_id: str, document_id: str) -> Optional[str]:
+        """Get a stored CV's extracted text."""
+        if not self.is_valid_id(document_id):
+            return None
+        doc = (
+            self._documents_ref(user_id).document(document_id).get(field_paths=["text"])
+        )
+        if not doc.exists:
+            return None
+        return doc.to_dict().get("text", "")
+
+    async def get_user_documents(
+        self, user_id: str, limit: int = 20
+    ) -> list[CVDocument]:
+        """Get a user's stored CVs, newest first."""
+        docs = (
+            self._documents_ref(user_id)
+            .select(self._METADATA_FIELDS)
+            .order_by("createdAt", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+            .stream()
+        )
+        return [self._doc_to_document(doc.id, doc.to_dict()) for doc in docs]
+
+    async def delete_document(self, user_id: str, document_id: str) -> bool:
+        """Delete a stored CV."""
+        if not self.is_valid_id(document_id):
+            return False
+        doc_ref = self._documents_ref(user_id).document(document_id)
+        if not doc_ref.get(field_paths=["contentHash"]).exists:
+            return False
+        doc_ref.delete()
+        return True
+
+    def _doc_to_document(self, doc_id: str, data: dict) -> CVDocument:
+        """Convert Firestore document to CVDocument."""
+        return CVDocument(
+            id=doc_id,
+            filename=data.get("filename"),
+            content_type=data.get("contentType", ""),
+            size_bytes=data.get("sizeBytes", 0),
+            content_hash=data.get("contentHash", doc_id),
+            word_count=data.get("wordCount", 0),
+            created_at=data.get("createdAt"),
+        )
+
+
+# Singleton instance
+cv_document_service = CVDocumentService()
@@ -28,6 +28,7 @@ class CVService:
             "sections": [s.model_dump() for s in analysis.sections],
             "summary": analysis.summary,
             "improvementTips": analysis.improvement_tips,
+            "promptVersion": analysis.prompt_version,
             "createdAt": firestore.SERVER_TIMESTAMP,
         }
 
@@ -97,6 +98,7 @@ class CVService:
             sections=[CVSection(**s) for s in data.get("sections", [])],
             summary=data.get("summary", ""),
             improvement_tips=data.get("improvementTips", []),
+            prompt_version=data.get("promptVersion"),
             created_at=data.get("createdAt"),
         )
 
@@ -1,8 +1,73 @@
+import asyncio
+import time
 from fastapi import HTTPException, status
+from typing import Awaitable, Callable, Optional, TypeVar
+from app.core.metrics import register_stats
+from app.services.ai.scheduler import set_priority, tier_for_plan
 from app.services.firebase.user_service import user_service
 
 
-async def authorize_ai_feature(user_id: str, plan: str) -> None:
+T = TypeVar("T")
+
+# A hold never released (e.g. a crashed worker) stops sharing its charge
+# after this long, so a leaked key cannot make a request free forever
+_MAX_HOLD_SECONDS = 900.0
+
+
+class _HeldCharge:
+    """One free-use decrement shared by identical requests in flight."""
+
+    def __init__(self, charge: asyncio.Future):
+        self.charge = charge
+        self.holders = 0
+        self.created = time.monotonic()
+
+
+# "uid:request_key" -> the charge of the identical requests still running
+_held_charges: dict[str, _HeldCharge] = {}
+_shared_charges = 0
+
+
+class ChargeHold:
+    """
+    Keeps a charged request's key in flight until the request finishes.
+
+    Returned by `authorize_ai_feature`. While any holder of a key has not
+    released it, identical requests from the same user (double-submits,
+    retries while the first is still generating) share its charge. Use it
+    as a context manager around the AI work, or `wrap` a background job.
+    """
+
+    def __init__(self, key: Optional[str] = None, held: Optional[_HeldCharge] = None):
+        self._key = key
+        self._held = held
+
+    def release(self) -> None:
+        """Stop holding the key (idempotent)."""
+        held, self._held = self._held, None
+        if held is None:
+            return
+        held.holders -= 1
+        if held.holders <= 0 and _held_charges.get(self._key) is held:
+            del _held_charges[self._key]
+
+    def wrap(self, runner: Callable[[], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+        """`runner` releasing the hold when it finishes (for background jobs)."""
+        async def run() -> T:
+            with self:
+                return await runner()
+        return run
+
+    def __enter__(self) -> "ChargeHold":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+async def authorize_ai_feature(
+    user_id: str, plan: str, request_key: Optional[str] = None
+) -> ChargeHold:
     """
     Gate for AI features. Raises HTTP 402 if user cannot proceed.
 
@@ -10,10 +75,67 @@ async def authorize_ai_feature(user_id: str, plan: str) -> None:
     - Premium users: always allowed (unlimited)
     - Free users with free_uses_remaining > 0: allowed, decrement by 1
     - Free users with 0 remaining: blocked with 402
+
+    If `request_key` (a fingerprint of the request inputs) is given,
+    identical requests from the same user share one charge for as long as
+    any of them is still running, since their AI calls are collapsed onto
+    one upstream call. Release the returned hold when the request's AI
+    work is done; a repeat after that is charged again.
+
+    Also sets the request's LLM scheduling tier from `plan`.
     """
+    global _shared_charges
+    set_priority(tier_for_plan(plan))
+
     if plan == "premium":
-        return  # Unlimited
+        return ChargeHold()  # Unlimited
+
+    if request_key is None:
+        await _authorize_free_use(user_id)
+        return ChargeHold()
+
+    key = f"{user_id}:{request_key}"
+    held = _held_charges.get(key)
+    if held is None or time.monotonic() - held.created > _MAX_HOLD_SECONDS:
+        if len(_held_charges) >= 10000:
+            _prune_held_charges()
+        held = _held_charges[key] = _HeldCharge(
+            asyncio.ensure_future(_authorize_free_use(user_id))
+        )
+    else:
+        _shared_charges += 1
+    # Registered before awaiting, so a duplicate arriving meanwhile shares it
+    held.holders += 1
+    hold = ChargeHold(key, held)
+    try:
+        await asyncio.shield(held.charge)
+    except BaseException:
+        # A failed charge (e.g. 402) is shared too, then forgotten
+        hold.release()
+        raise
+    return hold
+
+
+def _prune_held_charges() -> None:
+    """Forget holds that were never released."""
+    now = time.monotonic()
+    for key, held in list(_held_charges.items()):
+        if now - held.created > _MAX_HOLD_SECONDS:
+            del _held_charges[key]
+
+
+def _stats() -> dict:
+    return {
+        "held": len(_held_charges),
+        "shared_charges": _shared_charges,
+    }
 
+
+register_stats("usage_gate", _stats)
+
+
+async def _authorize_free_use(user_id: str) -> None:
+    """Check and consume one free AI use for a non-premium user."""
     user = await user_service.get_user(user_id)
     if not user:
         raise HTTPException(
@@ -33,3 +155,15 @@ async def authorize_ai_feature(user_id: str, plan: str) -> None:
             "upgrade_url": "/pricing",
         },
     )
+
+
+async def set_user_priority(user_id: Optional[str]) -> None:
+    """
+    Set the LLM scheduling tier for a request that has no usage gate
+    (e.g. ATS analysis), from the user's plan.
+    """
+    if user_id is None:
+        set_priority(tier_for_plan(None))
+        return
+    user = await user_service.get_user(user_id)
+    set_priority(tier_for_plan(user.plan if user else "free"))
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from google.cloud import firestore
+from datetime import datetime
+from typing import Optional
+from app.core.firebase import get_firestore_client
+from app.schemas.stats import FeatureUsage, UsageMonth
+
+
+logger = logging.getLogger(__name__)
+
+
+class UsageLedger:
+    """
+    Per-user monthly LLM usage totals in Firestore.
+
+    One document per user and month holds call, token and estimated cost
+    totals, overall and per feature, updated with atomic increments so
+    concurrent calls never lose a write.
+    """
+
+    USERS_COLLECTION = "users"
+    LEDGER_SUBCOLLECTION = "usage_ledger"
+
+    def __init__(self):
+        self.db = get_firestore_client()
+        self._pending: set[asyncio.Task] = set()
+
+    def _write(
+        self,
+        user_id: str,
+        month: str,
+        feature: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost_usd: float,
+    ) -> None:
+        totals = {
+            "calls": firestore.Increment(1),
+            "inputTokens": firestore.Increment(input_tokens),
+            "outputTokens": firestore.Increment(output_tokens),
+            "costUsd": firestore.Increment(cost_usd),
+        }
+        doc_ref = (
+            self.db.collection(self.USERS_COLLECTION)
+            .document(user_id)
+            .collection(self.LEDGER_SUBCOLLECTION)
+            .document(month)
+        )
+        doc_ref.set(
+            {
+                "month": month,
+                **totals,
+                "features": {feature: dict(totals)},
+                "updatedAt": firestore.SERVER_TIMESTAMP,
+            },
+            merge=True,
+        )
+
+    def record_in_background(
+        self,
+        user_id: str,
+        feature: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost_usd: float,
+    ) -> None:
+        """
+        Add one LLM call to the user's ledger for the current month.
+
+        The write runs in a worker thread off the request path; failures are
+        logged, never raised.
+        """
+        month = datetime.utcnow().strftime("%Y-%m")
+
+        async def write() -> None:
+            try:
+                await asyncio.to_thread(
+                    self._write, user_id, month, feature, input_tokens, output_tokens, cost_usd
+                )
+            except Exception as e:
+                logger.warning("Could not update usage ledger for %s: %s", user_id, e)
+
+        task = asyncio.create_task(write())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def get_usage(self, user_id: str, months: int = 12) -> list[UsageMonth]:
+        """Get the user's most recent monthly totals, newest first."""
+        docs = (
+            self.db.collection(self.USERS_COLLECTION)
+            .document(user_id)
+            .collection(self.LEDGER_SUBCOLLECTION)
+            .order_by("month", direction=firestore.Query.DESCENDING)
+            .limit(months)
+            .stream()
+        )
+        return [self._doc_to_month(doc.to_dict()) for doc in docs]
+
+    @staticmethod
+    def _to_feature_usage(data: Optional[dict]) -> FeatureUsage:
+        data = data or {}
+        return FeatureUsage(
+            calls=data.get("calls", 0),
+            input_tokens=data.get("inputTokens", 0),
+            output_tokens=data.get("outputTokens", 0),
+            cost_usd=round(data.get("costUsd", 0.0), 6),
+        )
+
+    def _doc_to_month(self, data: dict) -> UsageMonth:
+        """Convert a Firestore ledger document to UsageMonth."""
+        return UsageMonth(
+            month=data.get("month", ""),
+            total=self._to_feature_usage(data),
+            features={
+                feature: self._to_feature_usage(values)
+                for feature, values in (data.get("features") or {}).items()
+            },
+        )
+
+
+# Singleton instance
+usage_ledger = UsageLedger()
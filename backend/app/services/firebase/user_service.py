@@ -89,7 +89,7 @@ class UserService:
         user_ref = self.db.collection(self.COLLECTION).document(uid)
 
         # Delete subcollections
-        subcollections = ["cv_documents", "cv_analyses", "cover_letters", "user_cv_data", "photo_enhancements", "credit_transactions"]
+        subcollections = ["cv_documents", "cv_analyses", "cover_letters", "user_cv_data", "photo_enhancements", "credit_transactions", "usage_ledger"]
         for subcoll in subcollections:
             docs = user_ref.collection(subcoll).stream()
             for doc in docs:
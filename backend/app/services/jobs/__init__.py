@@ -0,0 +1,12 @@
+from .store import Job, JobStore, InMemoryJobStore
+from .queue import JobQueue, job_queue, job_store, to_response
+
+__all__ = [
+    "Job",
+    "JobStore",
+    "InMemoryJobStore",
+    "JobQueue",
+    "job_queue",
+    "job_store",
+    "to_response",
+]
@@ -0,0 +1,318 @@
+import asyncio
+import contextvars
+import hashlib
+import hmac
+import ipaddress
+import logging
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlparse
+import httpx
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.schemas.job import JobResponse
+from .store import InMemoryJobStore, Job, JobStore
+
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[], Awaitable[Any]]
+
+
+class WebhookAddressError(Exception):
+    """Raised when a webhook host is not a public internet address."""
+
+
+def _is_public_ip(address: str) -> bool:
+    # Drop an IPv6 zone index ("fe80::1%eth0")
+    return ipaddress.ip_address(address.split("%", 1)[0]).is_global
+
+
+async def _resolve_public_address(host: str, port: int) -> str:
+    """
+    Resolve a webhook host to one public IP address.
+
+    Raises:
+        WebhookAddressError: If the host does not resolve, or any of its
+            addresses is loopback, private, link-local or otherwise not
+            globally routable (e.g. cloud metadata endpoints).
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+    except socket.gaierror as e:
+        raise WebhookAddressError(f"{host} does not resolve") from e
+    addresses = sorted({info[4][0] for info in infos})
+    if not addresses or not all(_is_public_ip(address) for address in addresses):
+        raise WebhookAddressError(f"{host} is not a public address")
+    return addresses[0]
+
+
+def to_response(job: Job) -> JobResponse:
+    """Public view of a job (what polling, SSE and webhooks return)."""
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+class JobQueue:
+    """
+    Bounded queue of background jobs drained by a fixed pool of workers.
+
+    Endpoints validate and authorize a request, then `submit` a coroutine
+    factory running the slow part (parsing, LLM calls, saving) and answer
+    202 straight away. Throughput is set by the number of workers rather
+    than by how many HTTP connections are held open; once
+    JOB_QUEUE_MAX_PENDING jobs are waiting, submissions are rejected with
+    503. Results are kept in the job store for polling, and optionally
+    POSTed to the job's webhook URL.
+    """
+
+    def __init__(self, store: JobStore, workers: int, max_pending: int):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._webhooks: set[asyncio.Task] = set()
+        self.running = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.webhooks_sent = 0
+        self.webhooks_failed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def start(self) -> None:
+        """Start the worker pool on the running event loop (idempotent)."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers. Queued jobs that never started are dropped."""
+        tasks = self._tasks + list(self._webhooks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def ensure_accepting(self, webhook_url: Optional[str] = None) -> None:
+        """
+        Check that a job could be submitted right now.
+
+        Lets endpoints fail fast before charging a usage credit for work
+        that would be rejected.
+
+        Raises:
+            HTTPException: 400 for an invalid webhook URL, 503 if the queue
+                is full.
+        """
+        if webhook_url is not None:
+            parsed = urlparse(webhook_url)
+            if parsed.scheme not in ("http", "https") or not parsed.hostname:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="webhook_url must be an absolute http(s) URL.",
+                )
+            # Hostnames are resolved and checked when the webhook is sent
+            try:
+                is_public = _is_public_ip(parsed.hostname)
+            except ValueError:
+                is_public = parsed.hostname.lower() != "localhost"
+            if not is_public:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="webhook_url must point to a public address.",
+                )
+
+        await self.start()
+        if self._queue.full():
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many jobs are queued. Please try again shortly.",
+                headers={"Retry-After": "30"},
+            )
+
+    async def submit(
+        self,
+        user_id: str,
+        kind: str,
+        runner: JobRunner,
+        webhook_url: Optional[str] = None,
+    ) -> Job:
+        """
+        Queue `runner` as a new job owned by `user_id`.
+
+        `runner` returns a pydantic model or a JSON-serializable dict;
+        raising HTTPException fails the job with its detail.
+
+        Raises:
+            HTTPException: 400 for an invalid webhook URL, 503 if the queue
+                is full.
+        """
+        await self.ensure_accepting(webhook_url)
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            kind=kind,
+            webhook_url=webhook_url,
+        )
+        await self.store.save(job)
+        # The runner executes in a copy of the submitter's context, so
+        # request-scoped state such as the LLM priority tier carries over
+        self._queue.put_nowait((job, runner, contextvars.copy_context(), time.monotonic()))
+        self.submitted += 1
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job, runner, context, queued_at = await self._queue.get()
+            try:
+                self.total_wait_seconds += time.monotonic() - queued_at
+                await context.run(asyncio.ensure_future, self._run(job, runner))
+            except Exception:
+                logger.exception("Job %s could not be recorded", job.id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, runner: JobRunner) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        job.version += 1
+        await self.store.save(job)
+
+        started = time.monotonic()
+        self.running += 1
+        try:
+            result = await runner()
+            job.result = (
+                result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+            )
+            job.status = "succeeded"
+            self.succeeded += 1
+        except HTTPException as e:
+            job.error = e.detail
+            job.status = "failed"
+            self.failed += 1
+        except Exception:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job.error = "The job failed. Please try again."
+            job.status = "failed"
+            self.failed += 1
+        finally:
+            self.running -= 1
+            self.total_run_seconds += time.monotonic() - started
+
+        job.finished_at = datetime.utcnow()
+        job.version += 1
+        await self.store.save(job)
+
+        if job.webhook_url:
+            # Delivered off the worker so slow receivers don't hold a slot
+            task = asyncio.create_task(self._notify(job))
+            self._webhooks.add(task)
+            task.add_done_callback(self._webhooks.discard)
+
+    async def _notify(self, job: Job) -> None:
+        """
+        POST the finished job to its webhook, retrying with backoff.
+
+        The host is resolved before each attempt and the request sent to
+        that address, so a webhook can never reach loopback, private or
+        link-local addresses (including by DNS rebinding or redirects).
+        """
+        url = httpx.URL(job.webhook_url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        body = to_response(job).model_dump_json().encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "X-Job-Id": job.id,
+            "Host": url.netloc.decode("ascii"),
+        }
+        if settings.JOB_WEBHOOK_SECRET:
+            signature = hmac.new(
+                settings.JOB_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256
+            ).hexdigest()
+            headers["X-Webhook-Signature"] = f"sha256={signature}"
+
+        async with httpx.AsyncClient(
+            timeout=settings.JOB_WEBHOOK_TIMEOUT_SECONDS,
+            follow_redirects=False,
+            trust_env=False,  # connect to the checked address, not via a proxy
+        ) as client:
+            for attempt in range(settings.JOB_WEBHOOK_RETRIES + 1):
+                try:
+                    address = await _resolve_public_address(url.host, port)
+                    response = await client.post(
+                        url.copy_with(host=address),
+                        content=body,
+                        headers=headers,
+                        # Verify the certificate against the original hostname
+                        extensions={"sni_hostname": url.host},
+                    )
+                    if response.status_code < 500:
+                        self.webhooks_sent += 1
+                        return
+                except WebhookAddressError as e:
+                    logger.warning("Refusing webhook for job %s: %s", job.id, e)
+                    break
+                except httpx.HTTPError as e:
+                    logger.info("Webhook for job %s failed: %s", job.id, e)
+                if attempt < settings.JOB_WEBHOOK_RETRIES:
+                    await asyncio.sleep(2 ** attempt)
+
+        self.webhooks_failed += 1
+        logger.warning("Giving up on webhook for job %s", job.id)
+
+    def stats(self) -> dict:
+        """Queue depth, outcomes and average wait/run times."""
+        finished = self.succeeded + self.failed
+        started = finished + self.running
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "webhooks_sent": self.webhooks_sent,
+            "webhooks_failed": self.webhooks_failed,
+            "avg_wait_ms": round(self.total_wait_seconds / started * 1000, 3) if started else 0.0,
+            "avg_run_ms": round(self.total_run_seconds / finished * 1000, 3) if finished else 0.0,
+        }
+
+
+job_store = InMemoryJobStore(
+    max_entries=settings.JOB_MAX_ENTRIES,
+    ttl_seconds=settings.JOB_TTL_SECONDS,
+)
+job_queue = JobQueue(
+    job_store,
+    workers=settings.JOB_WORKERS,
+    max_pending=settings.JOB_QUEUE_MAX_PENDING,
+)
+register_stats("jobs", job_queue.stats)
@@ -0,0 +1,108 @@
+import asyncio
+import dataclasses
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+from app.utils.cache import LRUCache
+
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+@dataclass
+class Job:
+    """State of one background pipeline run."""
+    id: str
+    user_id: str
+    kind: str  # e.g. "cv_analyze", "cv_optimize"
+    status: str = "queued"  # "queued", "running", "succeeded" or "failed"
+    result: Optional[dict] = None
+    error: Optional[Any] = None  # HTTPException detail of a failed job
+    webhook_url: Optional[str] = None
+    created_at: datetime = dataclasses.field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    version: int = 0  # bumped on every saved change
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class JobStore(ABC):
+    """
+    Where job state lives between the worker that runs a job and the
+    clients polling it.
+
+    Implementations must be safe to call from the event loop. `save` stores
+    a snapshot, so later changes to the caller's Job are not visible until
+    it is saved again.
+    """
+
+    @abstractmethod
+    async def save(self, job: Job) -> None:
+        """Insert or replace a job."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None if unknown or expired."""
+
+    async def wait_for_update(
+        self, job_id: str, version: int, timeout: float
+    ) -> Optional[Job]:
+        """
+        Wait until the job's version exceeds `version` or `timeout` passes.
+
+        The default polls `get`; stores with change notifications override
+        it.
+
+        Returns:
+            The job as of the return (unchanged on timeout), or None.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get(job_id)
+            if job is None or job.version > version or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job store with TTL expiry and change notifications.
+
+    Suitable for a single worker process and for tests; deployments running
+    several processes need a shared store so any process can answer polls.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self._jobs = LRUCache(max_entries, ttl_seconds)
+        self._changed: dict[str, asyncio.Event] = {}
+
+    async def save(self, job: Job) -> None:
+        self._jobs.set(job.id, dataclasses.replace(job))
+        event = self._changed.pop(job.id, None)
+        if event is not None:
+            event.set()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        return dataclasses.replace(job) if job is not None else None
+
+    async def wait_for_update(
+        self, job_id: str, version: int, timeout: float
+    ) -> Optional[Job]:
+        job = await self.get(job_id)
+        if job is None or job.version > version:
+            return job
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return await self.get(job_id)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
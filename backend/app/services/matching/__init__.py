@@ -0,0 +1,23 @@
+from .prescorer import PreScore, prescore_cv, build_preview
+from .job_profiles import JobProfile, JobSkill, job_profiles
+from .embeddings import HashingEmbedder, VectorIndex
+from .application_ranker import ApplicationRanker, application_ranker
+from .skill_index import SkillIndex, SkillMatch, SkillHit, get_skill_index, find_skills
+
+__all__ = [
+    "PreScore",
+    "prescore_cv",
+    "build_preview",
+    "JobProfile",
+    "JobSkill",
+    "job_profiles",
+    "HashingEmbedder",
+    "VectorIndex",
+    "ApplicationRanker",
+    "application_ranker",
+    "SkillIndex",
+    "SkillMatch",
+    "SkillHit",
+    "get_skill_index",
+    "find_skills",
+]
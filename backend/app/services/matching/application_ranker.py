@@ -0,0 +1,98 @@
+import hashlib
+import time
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.schemas.application import ApplicationResponse
+from app.utils.cache import LRUCache
+from .embeddings import HashingEmbedder, VectorIndex
+
+
+def _job_text(application: ApplicationResponse) -> str:
+    """Text embedded for an application: the position plus the posting, if saved."""
+    return "\n\n".join(filter(None, [application.position, application.job_description]))
+
+
+class ApplicationRanker:
+    """
+    Ranks a user's saved applications by how well a CV fits each job.
+
+    Each user's job texts are embedded once into a per-user VectorIndex;
+    an entry is only re-embedded when its text changes. Ranking then embeds
+    the CV and scores every application with one matrix-vector product, so
+    the applications list can be sorted by fit without LLM calls. Indexes of
+    inactive users expire after EMBEDDING_INDEX_TTL_SECONDS.
+    """
+
+    def __init__(self, dim: int, max_users: int, ttl_seconds: int):
+        self.embedder = HashingEmbedder(dim)
+        self._indexes = LRUCache(max_users, ttl_seconds)
+        self.queries = 0
+        self.embedded = 0
+        self.reused = 0
+        self.total_seconds = 0.0
+
+    def _sync(self, user_id: str, applications: list[ApplicationResponse]) -> VectorIndex:
+        """Bring the user's index in line with `applications`."""
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = VectorIndex(self.embedder.dim)
+            self._indexes.set(user_id, index)
+
+        current = set()
+        for application in applications:
+            current.add(application.id)
+            text = _job_text(application)
+            version = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            if index.version(application.id) == version:
+                self.reused += 1
+                continue
+            index.upsert(application.id, self.embedder.embed_sections(text), version)
+            self.embedded += 1
+
+        for key in index.keys():
+            if key not in current:
+                index.remove(key)
+        return index
+
+    def rank(
+        self, user_id: str, cv_text: str, applications: list[ApplicationResponse]
+    ) -> list[tuple[ApplicationResponse, float]]:
+        """
+        Sort applications by fit with a CV.
+
+        Returns:
+            List of (application, fit score 0-100), best fit first. The score
+            is the cosine similarity of the CV and job embeddings.
+        """
+        started = time.perf_counter()
+        index = self._sync(user_id, applications)
+        by_id = {application.id: application for application in applications}
+        results = index.search(self.embedder.embed_sections(cv_text))
+        self.queries += 1
+        self.total_seconds += time.perf_counter() - started
+        return [
+            (by_id[key], round(max(0.0, similarity) * 100, 1))
+            for key, similarity in results
+        ]
+
+    def forget(self, user_id: str) -> None:
+        """Drop a user's index (e.g. when their data is deleted)."""
+        self._indexes.delete(user_id)
+
+    def stats(self) -> dict:
+        """Indexed users, embedding reuse and average ranking time."""
+        return {
+            "users": len(self._indexes),
+            "queries": self.queries,
+            "embedded": self.embedded,
+            "reused": self.reused,
+            "avg_rank_ms": round(self.total_seconds / self.queries * 1000, 3) if self.queries else 0.0,
+        }
+
+
+application_ranker = ApplicationRanker(
+    dim=settings.EMBEDDING_DIM,
+    max_users=settings.EMBEDDING_INDEX_MAX_USERS,
+    ttl_seconds=settings.EMBEDDING_INDEX_TTL_SECONDS,
+)
+register_stats("embedding_index", application_ranker.stats)
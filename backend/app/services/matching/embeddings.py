@@ -0,0 +1,136 @@
+import math
+import zlib
+from collections import Counter
+from typing import Optional
+import numpy as np
+from .skill_index import get_skill_index
+from .text import split_paragraphs, tokenize
+
+
+class HashingEmbedder:
+    """
+    Dense text vectors from hashed n-gram features, computed on the CPU.
+
+    Features are stemmed word unigrams and bigrams plus the canonical names
+    of taxonomy skills, so synonyms such as "JS" and "JavaScript" land on
+    the same feature. Each feature is hashed to one of `dim` signed buckets
+    with log-scaled counts, and the vector is L2-normalized, so a dot
+    product is the cosine similarity. No model download, no state: the same
+    text always embeds to the same vector in every process.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _features(self, text: str) -> Counter:
+        tokens = tokenize(text)
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        for match in get_skill_index().scan(text):
+            features[f"skill:{match.skill}"] += 2
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed `text`; all-zero if it has no content words."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dim] += sign * (1.0 + math.log(count))
+        return _normalize(vector)
+
+    def embed_sections(self, text: str) -> np.ndarray:
+        """
+        Embed a document as the mean of its paragraph embeddings.
+
+        Every section counts equally, so one long section (e.g. a
+        publications list) does not drown out the rest of a CV.
+        """
+        # Raw text, not tokens: skill aliases ("k8s", "unit testing") are
+        # matched before stemming and stopword removal
+        sections = [part for part in split_paragraphs(text) if tokenize(part)]
+        if not sections:
+            return np.zeros(self.dim, dtype=np.float32)
+        return _normalize(np.mean([self.embed(section) for section in sections], axis=0))
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """
+    In-memory matrix of unit vectors answering top-k cosine queries.
+
+    Vectors live in one contiguous float32 array that grows by doubling, so
+    a query is a single matrix-vector product over the live rows.
+    """
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._versions: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def version(self, key: str) -> Optional[str]:
+        """Version tag stored with `key` (e.g. a hash of the embedded text)."""
+        return self._versions.get(key)
+
+    def keys(self) -> list[str]:
+        return list(self._keys)
+
+    def upsert(self, key: str, vector: np.ndarray, version: Optional[str] = None) -> None:
+        """Insert or replace the vector stored under `key`."""
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            if row == len(self._matrix):
+                grown = np.zeros((len(self._matrix) * 2, self.dim), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._keys.append(key)
+            self._rows[key] = row
+        self._matrix[row] = vector
+        if version is not None:
+            self._versions[key] = version
+
+    def remove(self, key: str) -> None:
+        """Delete `key`, moving the last row into its slot."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._versions.pop(key, None)
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+
+    def search(self, query: np.ndarray, k: Optional[int] = None) -> list[tuple[str, float]]:
+        """
+        Return the `k` most similar keys (all if None), best first.
+
+        Returns:
+            List of (key, cosine similarity).
+        """
+        count = len(self._keys)
+        if count == 0:
+            return []
+        scores = self._matrix[:count] @ query
+        k = count if k is None else min(k, count)
+        if k < count:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._keys[i], float(scores[i])) for i in top]
@@ -0,0 +1,310 @@
+import hashlib
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import register_stats
+from app.utils.cache import LRUCache
+from .skill_index import SkillHit, SkillMatch, get_skill_index
+from .text import inverse_document_frequency, split_chunks, tokenize
+
+
+_HORIZONTAL_WS_RE = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_BULLET_RE = re.compile(r"^(?:[-*•·▪●]|\d{1,2}[.)])\s*")
+_REQUIREMENT_HEADING_RE = re.compile(
+    r"requirement|qualification|must have|what you.ll (need|bring)|you have|about you|skills",
+    re.IGNORECASE,
+)
+_OPTIONAL_RE = re.compile(
+    r"nice to have|bonus|preferred|a plus|desirable|advantageous", re.IGNORECASE
+)
+_REQUIRED_RE = re.compile(r"\bmust\b|\brequired\b|\bessential\b", re.IGNORECASE)
+
+# Per-profile limits
+_KEY_TERMS = 30
+_MAX_REQUIREMENTS = 30
+
+# Word shingle size for SimHash features
+_SHINGLE_SIZE = 3
+
+
+def normalize_job_description(text: str) -> str:
+    """Collapse whitespace while keeping the line structure of a posting."""
+    text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_HORIZONTAL_WS_RE.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def exact_fingerprint(normalized: str) -> str:
+    """SHA-256 of the case- and whitespace-insensitive text."""
+    canonical = " ".join(normalized.lower().split())
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def simhash(tokens: list[str]) -> int:
+    """
+    64-bit SimHash over word shingles of `tokens`.
+
+    Postings that differ only in a few words (tracking text, a changed
+    date or location) get fingerprints a few bits apart.
+    """
+    if len(tokens) < _SHINGLE_SIZE:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [
+            " ".join(tokens[i:i + _SHINGLE_SIZE])
+            for i in range(len(tokens) - _SHINGLE_SIZE + 1)
+        ]
+
+    vector = [0] * 64
+    for shingle, weight in Counter(shingles).items():
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(64):
+            vector[bit] += weight if value >> bit & 1 else -weight
+
+    return sum(1 << bit for bit in range(64) if vector[bit] > 0)
+
+
+@dataclass
+class JobSkill:
+    """A taxonomy skill required by a job description."""
+    skill: str
+    category: str
+    mentions: int
+    importance: str  # "high", "medium" or "low" (nice-to-have only)
+    positions: list[tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass
+class JobProfile:
+    """Requirements extracted once from a job description and shared."""
+    fingerprint: str
+    simhash: int
+    job_description: str  # normalized text the profile was built from
+    skills: list[JobSkill]  # most important first
+    key_terms: dict[str, float]  # stemmed non-skill term -> TF-IDF weight, heaviest first
+    requirements: list[str]  # requirement lines, bullets stripped
+
+    def skill_hits(self, cv_text: str) -> list[SkillHit]:
+        """
+        Look up each required skill in a CV.
+
+        `job_positions` are offsets into this profile's `job_description`.
+        """
+        cv_positions: dict[str, list[tuple[int, int]]] = {}
+        for match in get_skill_index().scan(cv_text):
+            cv_positions.setdefault(match.skill, []).append((match.start, match.end))
+
+        return [
+            SkillHit(
+                skill=job_skill.skill,
+                category=job_skill.category,
+                found=job_skill.skill in cv_positions,
+                job_mentions=job_skill.mentions,
+                importance=job_skill.importance,
+                job_positions=job_skill.positions,
+                cv_positions=cv_positions.get(job_skill.skill, []),
+            )
+            for job_skill in self.skills
+        ]
+
+
+def build_job_profile(job_description: str) -> JobProfile:
+    """Extract skills, key terms and requirement lines from a posting."""
+    text = normalize_job_description(job_description)
+    return _build_profile(text, get_skill_index().scan(text), simhash(tokenize(text)))
+
+
+def _build_profile(text: str, matches: list[SkillMatch], text_simhash: int) -> JobProfile:
+    """`build_job_profile` for normalized `text`, its skill matches and SimHash."""
+    # Classify each line as required, optional (nice-to-have) or neither
+    requirements: list[str] = []
+    line_spans: list[tuple[int, int, str]] = []
+    in_requirements = False
+    in_optional = False
+    offset = 0
+    for line in text.split("\n"):
+        start, offset = offset, offset + len(line) + 1
+        if not line:
+            continue
+        bullet = _BULLET_RE.match(line)
+        if not bullet and len(line) < 60:
+            # Section heading: later lines inherit its kind
+            in_requirements = bool(_REQUIREMENT_HEADING_RE.search(line))
+            in_optional = bool(_OPTIONAL_RE.search(line))
+        optional = in_optional or bool(_OPTIONAL_RE.search(line))
+        required = in_requirements or bool(_REQUIRED_RE.search(line))
+        kind = "optional" if optional else "required" if required else ""
+        line_spans.append((start, start + len(line), kind))
+        is_requirement = in_requirements or in_optional or required
+        if bullet and is_requirement and len(requirements) < _MAX_REQUIREMENTS:
+            requirements.append(line[bullet.end():])
+
+    def line_kind(position: int) -> str:
+        for start, end, kind in line_spans:
+            if start <= position < end:
+                return kind
+        return ""
+
+    # Skills, with importance from mention count and where they appear
+    index = get_skill_index()
+    mentions: dict[str, list[tuple[int, int]]] = {}
+    for match in matches:
+        mentions.setdefault(match.skill, []).append((match.start, match.end))
+
+    skills: list[JobSkill] = []
+    for skill, positions in mentions.items():
+        kinds = {line_kind(start) for start, _ in positions}
+        if kinds == {"optional"}:
+            importance = "low"
+        elif len(positions) > 1 or "required" in kinds:
+            importance = "high"
+        else:
+            importance = "medium"
+        skills.append(
+            JobSkill(
+                skill=skill,
+                category=index.category(skill) or "",
+                mentions=len(positions),
+                importance=importance,
+                positions=positions,
+            )
+        )
+    rank = {"high": 0, "medium": 1, "low": 2}
+    skills.sort(key=lambda s: (rank[s.importance], -s.mentions))
+
+    # Key terms by TF-IDF over the posting's paragraphs; skill mentions are
+    # blanked out since skills are matched separately
+    blanked = list(text)
+    for positions in mentions.values():
+        for start, end in positions:
+            blanked[start:end] = " " * (end - start)
+    chunks = split_chunks("".join(blanked))
+    idf = inverse_document_frequency(chunks)
+    tf = Counter(term for chunk in chunks for term in chunk)
+    key_terms = dict(
+        sorted(
+            ((term, round(count * idf[term], 4)) for term, count in tf.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:_KEY_TERMS]
+    )
+
+    return JobProfile(
+        fingerprint=exact_fingerprint(text),
+        simhash=text_simhash,
+        job_description=text,
+        skills=skills,
+        key_terms=key_terms,
+        requirements=requirements,
+    )
+
+
+class JobProfileStore:
+    """
+    Shared store of job profiles, looked up by job description fingerprint.
+
+    An exact match on the normalized text is tried first. Otherwise the
+    SimHash index finds a stored posting at most `max_distance` bits away
+    (a near-duplicate), using the pigeonhole trick: the 64-bit hash is split
+    into max_distance + 1 bands, and any near-duplicate must agree with the
+    query on at least one whole band. A near-duplicate's profile is only
+    reused if the posting names exactly the same skills; otherwise a small
+    edit (e.g. "Python" -> "Go") would return the wrong requirements.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._profiles = LRUCache(max_entries, ttl_seconds, on_evict=self._forget)
+        bands = max_distance + 1
+        self._band_bits = 64 // bands
+        self._bands: list[dict[int, set[str]]] = [{} for _ in range(bands)]
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.near_rejects = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+
+    def _band_keys(self, value: int) -> list[int]:
+        mask = (1 << self._band_bits) - 1
+        return [value >> (band * self._band_bits) & mask for band in range(len(self._bands))]
+
+    def _forget(self, fingerprint: str, profile: JobProfile) -> None:
+        """Drop an evicted or expired profile from the SimHash bands."""
+        for band, key in zip(self._bands, self._band_keys(profile.simhash)):
+            fingerprints = band.get(key)
+            if fingerprints is not None:
+                fingerprints.discard(fingerprint)
+                if not fingerprints:
+                    del band[key]
+
+    def _find_near(self, value: int, skills: set[str]) -> Optional[JobProfile]:
+        rejected = False
+        for band, key in zip(self._bands, self._band_keys(value)):
+            for fingerprint in list(band.get(key, ())):
+                profile = self._profiles.get(fingerprint)
+                if profile is None:
+                    continue  # expired; `_forget` updated the band
+                if bin(profile.simhash ^ value).count("1") > self.max_distance:
+                    continue
+                if {job_skill.skill for job_skill in profile.skills} == skills:
+                    return profile
+                rejected = True
+        if rejected:
+            self.near_rejects += 1
+        return None
+
+    def get(self, job_description: str) -> JobProfile:
+        """Return the shared profile for `job_description`, building it on a miss."""
+        text = normalize_job_description(job_description)
+        fingerprint = exact_fingerprint(text)
+        profile = self._profiles.get(fingerprint)
+        if profile is not None:
+            self.exact_hits += 1
+            return profile
+
+        # Skills and SimHash are needed to vet a near-duplicate; the rest of
+        # the profile is only built on a miss
+        started = time.perf_counter()
+        matches = get_skill_index().scan(text)
+        value = simhash(tokenize(text))
+        profile = self._find_near(value, {match.skill for match in matches})
+        if profile is not None:
+            # Remember this variant so its next lookup is an exact hit
+            self.near_hits += 1
+            self._profiles.set(fingerprint, profile)
+            return profile
+
+        candidate = _build_profile(text, matches, value)
+        self.misses += 1
+        self.build_seconds += time.perf_counter() - started
+        self._profiles.set(fingerprint, candidate)
+        for band, key in zip(self._bands, self._band_keys(candidate.simhash)):
+            band.setdefault(key, set()).add(fingerprint)
+        return candidate
+
+    def stats(self) -> dict:
+        """Exact and near-duplicate hit rates and average build time."""
+        hits = self.exact_hits + self.near_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._profiles),
+            "exact_hits": self.exact_hits,
+            "near_duplicate_hits": self.near_hits,
+            "near_duplicate_rejects": self.near_rejects,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_build_ms": round(self.build_seconds / self.misses * 1000, 3) if self.misses else 0.0,
+        }
+
+
+job_profiles = JobProfileStore(
+    max_entries=settings.JOB_PROFILE_MAX_ENTRIES,
+    ttl_seconds=settings.JOB_PROFILE_TTL_SECONDS,
+    max_distance=settings.JOB_PROFILE_SIMHASH_DISTANCE,
+)
+register_stats("job_profiles", job_profiles.stats)
@@ -0,0 +1,181 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from app.core.metrics import register_stats
+from app.schemas.cv import CVAnalysisPreview, KeywordMatch
+from .job_profiles import job_profiles
+from .text import split_chunks
+
+
+# Okapi BM25 parameters
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+# Non-skill job description terms included in the keyword list
+_QUERY_TERMS = 20
+_TERM_KEYWORDS = 5
+
+# Weight of skill coverage vs. term similarity in the overall score
+_SKILL_WEIGHT = 0.6
+
+_IMPORTANCE_WEIGHTS = {"high": 2.0, "medium": 1.0, "low": 0.5}
+
+
+@dataclass
+class PreScore:
+    """Result of the local ATS pre-scorer."""
+    overall_score: int
+    skill_coverage: float  # 0-1, importance-weighted share of required skills found
+    term_similarity: float  # 0-1, BM25 coverage of the job's key terms
+    keyword_matches: list[KeywordMatch] = field(default_factory=list)
+    matched_skills: list[str] = field(default_factory=list)
+    missing_skills: list[str] = field(default_factory=list)
+
+
+def _bm25_coverage(query: dict[str, float], chunks: list[list[str]]) -> dict[str, float]:
+    """
+    Best BM25 score of each query term over `chunks`, scaled to 0-1.
+
+    The BM25 term score is divided by idf * (k1 + 1) / (1 + k1), its value
+    for one mention in a paragraph of average length, and capped at 1. A
+    single mention therefore counts fully unless it is buried in a long
+    paragraph; repeated mentions make up for that.
+    """
+    if not chunks:
+        return {term: 0.0 for term in query}
+
+    avgdl = sum(len(chunk) for chunk in chunks) / len(chunks)
+    best = {term: 0.0 for term in query}
+    for chunk in chunks:
+        counts = Counter(chunk)
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * len(chunk) / avgdl)
+        for term in query:
+            tf = counts.get(term, 0)
+            if tf:
+                best[term] = max(best[term], min(1.0, tf * (1 + _BM25_K1) / (tf + norm)))
+    return best
+
+
+def prescore_cv(cv_text: str, job_description: str) -> PreScore:
+    """
+    Score a CV against a job description locally, without an LLM call.
+
+    Combines two signals:
+    - Skill coverage: taxonomy skills named in the job description that
+      also appear in the CV, weighted by importance (required or repeated
+      skills count double, nice-to-have skills half).
+    - Term similarity: the job description's top TF-IDF terms are used as a
+      BM25 query against the CV's paragraphs.
+
+    The job side comes from the shared job profile, so a posting is only
+    analyzed once however many CVs are scored against it.
+
+    Args:
+        cv_text: The extracted text content from the CV.
+        job_description: The job description to match against.
+
+    Returns:
+        PreScore with the overall score and keyword matches, most
+        important first.
+    """
+    started = time.perf_counter()
+
+    profile = job_profiles.get(job_description)
+
+    # Skills from the taxonomy
+    skill_matches = [
+        KeywordMatch(keyword=hit.skill, found=hit.found, importance=hit.importance)
+        for hit in profile.skill_hits(cv_text)
+    ]
+
+    # Key job description terms
+    query = dict(list(profile.key_terms.items())[:_QUERY_TERMS])
+    coverage = _bm25_coverage(query, split_chunks(cv_text))
+    total_weight = sum(query.values())
+    term_similarity = (
+        sum(weight * coverage[term] for term, weight in query.items()) / total_weight
+        if total_weight else 0.0
+    )
+
+    skill_weight = sum(_IMPORTANCE_WEIGHTS[m.importance] for m in skill_matches)
+    skill_coverage = (
+        sum(_IMPORTANCE_WEIGHTS[m.importance] for m in skill_matches if m.found)
+        / skill_weight
+        if skill_weight else 0.0
+    )
+
+    if skill_matches:
+        raw = _SKILL_WEIGHT * skill_coverage + (1 - _SKILL_WEIGHT) * term_similarity
+    else:
+        raw = term_similarity
+
+    # Top terms become low-importance keywords
+    term_matches = [
+        KeywordMatch(keyword=term, found=coverage[term] > 0, importance="low")
+        for term in query
+    ][:_TERM_KEYWORDS]
+
+    # Missing skills first within each importance level: they matter most
+    keyword_matches = sorted(
+        skill_matches + term_matches,
+        key=lambda m: (-_IMPORTANCE_WEIGHTS[m.importance], m.found),
+    )
+    for match in keyword_matches:
+        if not match.found:
+            match.suggestion = f"Mention {match.keyword} if it reflects your experience."
+
+    prescore_stats.record(time.perf_counter() - started)
+
+    return PreScore(
+        overall_score=max(0, min(100, round(raw * 100))),
+        skill_coverage=round(skill_coverage, 4),
+        term_similarity=round(term_similarity, 4),
+        keyword_matches=keyword_matches,
+        matched_skills=[m.keyword for m in skill_matches if m.found],
+        missing_skills=[m.keyword for m in skill_matches if not m.found],
+    )
+
+
+def build_preview(score: PreScore) -> CVAnalysisPreview:
+    """Turn a PreScore into the anonymous analysis preview."""
+    total = len(score.matched_skills) + len(score.missing_skills)
+    if total:
+        summary = f"Your CV covers {len(score.matched_skills)} of {total} key skills for this role."
+        if score.missing_skills:
+            summary += " Missing: " + ", ".join(score.missing_skills[:3]) + "."
+    else:
+        summary = f"Your CV covers {round(score.term_similarity * 100)}% of this role's key terms."
+
+    if len(summary) > 150:
+        summary = summary[:147] + "..."
+
+    return CVAnalysisPreview(
+        overall_score=score.overall_score,
+        preview_keywords=score.keyword_matches[:3],
+        summary_preview=summary,
+    )
+
+
+class PreScoreStats:
+    """Call count and timing of the local pre-scorer."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+prescore_stats = PreScoreStats()
+register_stats("ats_prescorer", prescore_stats.stats)
@@ -0,0 +1,202 @@
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Optional
+from .taxonomy import SKILL_TAXONOMY
+
+
+def _is_word_char(ch: str) -> bool:
+    """Characters that may not border a match (so "java" misses "javascript")."""
+    return ch.isalnum() or ch in "+#"
+
+
+@dataclass
+class SkillMatch:
+    """One mention of a taxonomy skill in a text."""
+    skill: str  # canonical name
+    category: str
+    start: int  # character offsets into the scanned text
+    end: int
+
+
+@dataclass
+class SkillHit:
+    """A skill required by a job description, looked up in a CV."""
+    skill: str
+    category: str
+    found: bool
+    job_mentions: int
+    importance: str  # "high" if the job mentions it more than once
+    job_positions: list[tuple[int, int]] = field(default_factory=list)
+    cv_positions: list[tuple[int, int]] = field(default_factory=list)
+
+
+class SkillIndex:
+    """
+    Aho-Corasick automaton over every surface form in the skill taxonomy.
+
+    Built once; `scan` then finds all skill mentions in a text in a single
+    linear pass, whatever the taxonomy size. Matching is case-insensitive,
+    treats any run of whitespace as one space, only accepts whole-word
+    matches and keeps the longest match where mentions overlap
+    ("react native" rather than "react").
+    """
+
+    def __init__(self, taxonomy: dict[str, dict[str, tuple[str, ...]]] = SKILL_TAXONOMY):
+        # Node 0 is the root. Per node: goto transitions, failure link and
+        # the (length, skill) of every surface form ending there
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[int, str]]] = [[]]
+        self._categories: dict[str, str] = {}
+
+        for category, skills in taxonomy.items():
+            for skill, aliases in skills.items():
+                self._categories[skill] = category
+                for alias in aliases:
+                    self._insert(" ".join(alias.lower().split()), skill)
+        self._link()
+
+    @property
+    def size(self) -> int:
+        """Number of automaton states."""
+        return len(self._goto)
+
+    @property
+    def skills(self) -> int:
+        """Number of canonical skills indexed."""
+        return len(self._categories)
+
+    def category(self, skill: str) -> Optional[str]:
+        return self._categories.get(skill)
+
+    def _insert(self, alias: str, skill: str) -> None:
+        node = 0
+        for ch in alias:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(alias), skill))
+
+    def _link(self) -> None:
+        """Compute failure links breadth-first and merge their outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def scan(self, text: str) -> list[SkillMatch]:
+        """
+        Find every skill mention in `text`.
+
+        Returns:
+            Non-overlapping matches in text order, with offsets into `text`.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        candidates: list[tuple[int, int, str]] = []
+        # Original offset of each normalized character consumed so far
+        offsets: list[int] = []
+        node = 0
+        previous_space = True
+
+        for index, ch in enumerate(text):
+            if ch.isspace():
+                if previous_space:
+                    continue
+                ch = " "
+                previous_space = True
+            else:
+                ch = ch.lower()
+                previous_space = False
+            offsets.append(index)
+
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            for length, skill in output[node]:
+                start = offsets[len(offsets) - length]
+                end = index + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]):
+                    continue
+                candidates.append((start, end, skill))
+
+        # Leftmost-longest selection among overlapping candidates
+        matches: list[SkillMatch] = []
+        last_end = 0
+        for start, end, skill in sorted(candidates, key=lambda c: (c[0], -c[1])):
+            if start < last_end:
+                continue
+            matches.append(SkillMatch(skill, self._categories[skill], start, end))
+            last_end = end
+        return matches
+
+    def count(self, text: str) -> Counter:
+        """Counter of canonical skill name -> number of mentions in `text`."""
+        return Counter(match.skill for match in self.scan(text))
+
+    def compare(self, cv_text: str, job_description: str) -> list[SkillHit]:
+        """
+        Look up each skill named in the job description in the CV.
+
+        Returns:
+            One SkillHit per required skill, most mentioned first.
+        """
+        job_positions: dict[str, list[tuple[int, int]]] = {}
+        for match in self.scan(job_description):
+            job_positions.setdefault(match.skill, []).append((match.start, match.end))
+        cv_positions: dict[str, list[tuple[int, int]]] = {}
+        for match in self.scan(cv_text):
+            cv_positions.setdefault(match.skill, []).append((match.start, match.end))
+
+        hits = [
+            SkillHit(
+                skill=skill,
+                category=self._categories[skill],
+                found=skill in cv_positions,
+                job_mentions=len(positions),
+                importance="high" if len(positions) > 1 else "medium",
+                job_positions=positions,
+                cv_positions=cv_positions.get(skill, []),
+            )
+            for skill, positions in job_positions.items()
+        ]
+        # Stable sort keeps first-mention order among equally mentioned skills
+        hits.sort(key=lambda hit: -hit.job_mentions)
+        return hits
+
+
+_index: Optional[SkillIndex] = None
+
+
+def get_skill_index() -> SkillIndex:
+    """Get or build the shared skill index (built at startup by the app)."""
+    global _index
+
+    if _index is None:
+        _index = SkillIndex()
+
+    return _index
+
+
+def find_skills(text: str) -> Counter:
+    """
+    Count mentions of taxonomy skills in `text`.
+
+    Returns:
+        Counter of canonical skill name -> number of mentions.
+    """
+    return get_skill_index().count(text)
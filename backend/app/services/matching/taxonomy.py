@@ -0,0 +1,201 @@
+"""
+Bundled skill taxonomy used for local keyword matching.
+
+Maps category -> canonical skill name -> lower-case surface forms (synonyms,
+abbreviations and spelling variants) that count as a mention of the skill.
+Surface forms are matched as whole words, so ambiguous short forms (e.g.
+"go", "r", "c") are deliberately left out.
+"""
+
+SKILL_TAXONOMY: dict[str, dict[str, tuple[str, ...]]] = {
+    "programming_languages": {
+        "Python": ("python", "python3"),
+        "JavaScript": ("javascript", "js", "ecmascript", "es6"),
+        "TypeScript": ("typescript", "ts"),
+        "Java": ("java",),
+        "Kotlin": ("kotlin",),
+        "C++": ("c++", "cpp"),
+        "C#": ("c#", "csharp", "c sharp"),
+        "Go": ("golang", "go lang"),
+        "Rust": ("rust",),
+        "Ruby": ("ruby",),
+        "PHP": ("php",),
+        "Swift": ("swift",),
+        "Objective-C": ("objective-c", "objective c", "objc"),
+        "Scala": ("scala",),
+        "Elixir": ("elixir",),
+        "Haskell": ("haskell",),
+        "Perl": ("perl",),
+        "MATLAB": ("matlab",),
+        "Dart": ("dart",),
+        "Bash": ("bash", "shell scripting", "shell script"),
+        "PowerShell": ("powershell",),
+        "SQL": ("sql",),
+        "HTML": ("html", "html5"),
+        "CSS": ("css", "css3"),
+        "Solidity": ("solidity",),
+    },
+    "frameworks": {
+        "React": ("react", "react.js", "reactjs"),
+        "Angular": ("angular", "angularjs", "angular.js"),
+        "Vue.js": ("vue", "vue.js", "vuejs"),
+        "Next.js": ("next.js", "nextjs"),
+        "Svelte": ("svelte",),
+        "Node.js": ("node.js", "nodejs", "node"),
+        "Express": ("express.js", "expressjs"),
+        "Django": ("django",),
+        "Flask": ("flask",),
+        "FastAPI": ("fastapi",),
+        "Spring": ("spring boot", "springboot", "spring framework"),
+        "Ruby on Rails": ("ruby on rails", "rails", "ror"),
+        "Laravel": ("laravel",),
+        ".NET": (".net", "dotnet", "asp.net", ".net core"),
+        "React Native": ("react native",),
+        "Flutter": ("flutter",),
+        "Redux": ("redux",),
+        "GraphQL": ("graphql",),
+        "Tailwind CSS": ("tailwind", "tailwind css", "tailwindcss"),
+        "jQuery": ("jquery",),
+    },
+    "data_and_ml": {
+        "Machine Learning": ("machine learning", "ml"),
+        "Deep Learning": ("deep learning",),
+        "Artificial Intelligence": ("artificial intelligence", "ai"),
+        "Natural Language Processing": ("natural language processing", "nlp"),
+        "Computer Vision": ("computer vision",),
+        "Large Language Models": ("large language models", "large language model", "llm", "llms"),
+        "TensorFlow": ("tensorflow",),
+        "PyTorch": ("pytorch",),
+        "scikit-learn": ("scikit-learn", "sklearn", "scikit learn"),
+        "Pandas": ("pandas",),
+        "NumPy": ("numpy",),
+        "Apache Spark": ("spark", "apache spark", "pyspark"),
+        "Hadoop": ("hadoop",),
+        "Apache Kafka": ("kafka", "apache kafka"),
+        "Airflow": ("airflow", "apache airflow"),
+        "dbt": ("dbt",),
+        "ETL": ("etl", "elt", "data pipelines", "data pipeline"),
+        "Data Analysis": ("data analysis", "data analytics"),
+        "Data Visualization": ("data visualization", "data visualisation"),
+        "Statistics": ("statistics", "statistical analysis"),
+        "Tableau": ("tableau",),
+        "Power BI": ("power bi", "powerbi"),
+        "Excel": ("excel", "microsoft excel", "ms excel"),
+        "Looker": ("looker",),
+        "A/B Testing": ("a/b testing", "ab testing", "split testing"),
+    },
+    "databases": {
+        "PostgreSQL": ("postgresql", "postgres", "psql"),
+        "MySQL": ("mysql",),
+        "SQL Server": ("sql server", "mssql", "ms sql"),
+        "Oracle Database": ("oracle database", "oracle db", "pl/sql"),
+        "SQLite": ("sqlite",),
+        "MongoDB": ("mongodb", "mongo"),
+        "Redis": ("redis",),
+        "Elasticsearch": ("elasticsearch", "elastic search", "opensearch"),
+        "Cassandra": ("cassandra",),
+        "DynamoDB": ("dynamodb",),
+        "Firestore": ("firestore", "firebase"),
+        "Snowflake": ("snowflake",),
+        "BigQuery": ("bigquery", "big query"),
+        "Redshift": ("redshift",),
+        "NoSQL": ("nosql",),
+    },
+    "cloud_and_devops": {
+        "AWS": ("aws", "amazon web services"),
+        "Google Cloud": ("gcp", "google cloud", "google cloud platform"),
+        "Azure": ("azure", "microsoft azure"),
+        "Docker": ("docker", "containerization", "containerisation"),
+        "Kubernetes": ("kubernetes", "k8s"),
+        "Helm": ("helm",),
+        "Terraform": ("terraform",),
+        "Ansible": ("ansible",),
+        "CI/CD": ("ci/cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"),
+        "Jenkins": ("jenkins",),
+        "GitHub Actions": ("github actions",),
+        "GitLab CI": ("gitlab ci", "gitlab-ci"),
+        "Git": ("git",),
+        "Linux": ("linux", "unix"),
+        "Serverless": ("serverless", "aws lambda", "lambda functions", "cloud functions"),
+        "Microservices": ("microservices", "micro-services", "microservice architecture"),
+        "Infrastructure as Code": ("infrastructure as code", "iac"),
+        "Prometheus": ("prometheus",),
+        "Grafana": ("grafana",),
+        "Datadog": ("datadog",),
+        "Nginx": ("nginx",),
+        "Site Reliability Engineering": ("site reliability engineering", "sre"),
+        "Observability": ("observability",),
+    },
+    "engineering_practices": {
+        "REST APIs": ("restful", "rest api", "rest apis", "restful apis"),
+        "gRPC": ("grpc",),
+        "System Design": ("system design", "distributed systems"),
+        "Object-Oriented Programming": ("object-oriented programming", "object oriented programming", "oop"),
+        "Test-Driven Development": ("test-driven development", "test driven development", "tdd"),
+        "Unit Testing": ("unit testing", "unit tests", "pytest", "jest", "junit"),
+        "Automated Testing": ("automated testing", "test automation", "selenium", "cypress", "playwright"),
+        "Code Review": ("code review", "code reviews"),
+        "Agile": ("agile", "scrum", "kanban"),
+        "Security": ("security", "application security", "appsec", "owasp"),
+        "OAuth": ("oauth", "oauth2", "openid connect", "oidc"),
+        "Performance Optimization": ("performance optimization", "performance tuning"),
+        "Accessibility": ("accessibility", "a11y", "wcag"),
+        "Responsive Design": ("responsive design",),
+        "Mobile Development": ("mobile development", "ios", "android"),
+        "Embedded Systems": ("embedded systems", "embedded software", "firmware"),
+        "Blockchain": ("blockchain", "web3", "smart contracts"),
+    },
+    "design": {
+        "Figma": ("figma",),
+                "Adobe Photoshop": ("photoshop", "adobe photoshop"),
+        "Adobe Illustrator": ("illustrator", "adobe illustrator"),
+        "UX Design": ("ux", "ux design", "user experience"),
+        "UI Design": ("ui design", "user interface design"),
+        "User Research": ("user research", "usability testing"),
+        "Prototyping": ("prototyping", "wireframing", "wireframes"),
+    },
+    "business": {
+        "Project Management": ("project management",),
+        "Product Management": ("product management",),
+        "Stakeholder Management": ("stakeholder management",),
+        "Budgeting": ("budgeting", "budget management"),
+        "Financial Analysis": ("financial analysis", "financial modeling", "financial modelling"),
+        "Forecasting": ("forecasting",),
+        "Accounting": ("accounting", "bookkeeping"),
+        "Sales": ("sales", "business development"),
+        "Account Management": ("account management",),
+        "Customer Service": ("customer service", "customer support"),
+        "CRM": ("crm", "salesforce", "hubspot"),
+        "SAP": ("sap",),
+        "Digital Marketing": ("digital marketing", "online marketing"),
+        "SEO": ("seo", "search engine optimization", "search engine optimisation"),
+        "SEM": ("sem", "search engine marketing", "google ads", "ppc"),
+        "Content Marketing": ("content marketing", "copywriting"),
+        "Social Media Marketing": ("social media marketing", "social media"),
+        "Google Analytics": ("google analytics",),
+        "Supply Chain Management": ("supply chain management", "supply chain", "logistics"),
+        "Procurement": ("procurement", "purchasing", "sourcing"),
+        "Recruiting": ("recruiting", "recruitment", "talent acquisition"),
+        "Human Resources": ("human resources", "hr"),
+        "Risk Management": ("risk management",),
+        "Compliance": ("compliance", "regulatory compliance", "gdpr"),
+        "Lean Six Sigma": ("lean six sigma", "six sigma"),
+        "Jira": ("jira",),
+        "Confluence": ("confluence",),
+    },
+    "soft_skills": {
+        "Leadership": ("leadership", "team lead", "team leadership"),
+        "People Management": ("people management", "line management", "managing a team"),
+        "Mentoring": ("mentoring", "mentored", "mentorship", "coaching"),
+        "Communication": ("communication", "communication skills"),
+        "Collaboration": ("collaboration", "teamwork", "cross-functional"),
+        "Problem Solving": ("problem solving", "problem-solving"),
+        "Critical Thinking": ("critical thinking", "analytical skills"),
+        "Time Management": ("time management", "prioritization", "prioritisation"),
+        "Presentation Skills": ("presentation skills", "public speaking", "presentations"),
+        "Negotiation": ("negotiation", "negotiating"),
+        "Attention to Detail": ("attention to detail", "detail-oriented", "detail oriented"),
+        "Adaptability": ("adaptability",),
+        "Strategic Planning": ("strategic planning", "strategy"),
+    },
+}
@@ -0,0 +1,63 @@
+import math
+import re
+from collections import Counter
+
+
+# Words, keeping tech spellings such as "c++", "c#" and "node.js" intact
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+# Generic English and job-ad vocabulary that says nothing about fit
+_STOPWORDS = frozenset(
+    "the and for with you your our are will from this that have has into "
+    "their they them who what when where which while about able also been "
+    "being more most other such than then there these those very all any "
+    "can may must should would could not but its per via etc we us is be "
+    "an as at by in of on or to it if do does did was were one two three "
+    "work working worked role team teams experience experienced years year "
+    "strong excellent good great skills skill ability knowledge including "
+    "join looking candidate candidates ideal responsibilities requirements "
+    "required preferred plus bonus company opportunity new well within "
+    "across using use used help make ensure based related relevant "
+    "like least minimum high highly environment day days hiring hire "
+    "build building seeking nice have want".split()
+)
+
+# Inflectional suffixes stripped by the light stemmer, longest first
+_SUFFIXES = ("ing", "ed", "s")
+
+
+def _stem(token: str) -> str:
+    """Strip one inflectional suffix so "mentoring"/"mentored" match."""
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased, lightly stemmed content words of `text`, in order."""
+    return [
+        _stem(token) for token in _TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+def split_paragraphs(text: str) -> list[str]:
+    """Raw paragraphs of `text` (lines if there are no blank lines)."""
+    parts = _PARAGRAPH_RE.split(text)
+    if len(parts) == 1:
+        parts = text.split("\n")
+    return parts
+
+
+def split_chunks(text: str) -> list[list[str]]:
+    """Tokenized paragraphs of `text` (lines if there are no blank lines)."""
+    return [tokens for tokens in map(tokenize, split_paragraphs(text)) if tokens]
+
+
+def inverse_document_frequency(chunks: list[list[str]]) -> dict[str, float]:
+    """BM25 inverse document frequency of every term in `chunks`."""
+    df = Counter(term for chunk in chunks for term in set(chunk))
+    n = len(chunks)
+    return {term: math.log(1 + (n - freq + 0.5) / (freq + 0.5)) for term, freq in df.items()}
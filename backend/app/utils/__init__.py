@@ -4,10 +4,27 @@ from .document_parser import (
     extract_text_from_file,
     validate_file,
 )
+from .sse import format_sse, SSE_HEADERS
+from .upload import (
+    read_upload,
+    sniff_kind,
+    CV_KINDS,
+    IMAGE_KINDS,
+    CV_TYPE_ERROR,
+    IMAGE_TYPE_ERROR,
+)
 
 __all__ = [
     "extract_text_from_pdf",
     "extract_text_from_docx",
     "extract_text_from_file",
     "validate_file",
+    "format_sse",
+    "SSE_HEADERS",
+    "read_upload",
+    "sniff_kind",
+    "CV_KINDS",
+    "IMAGE_KINDS",
+    "CV_TYPE_ERROR",
+    "IMAGE_TYPE_ERROR",
 ]
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry TTL.
+
+    Entries expire `ttl_seconds` after they were written; the least recently
+    used entry is evicted once `max_entries` is reached. `on_evict(key,
+    value)` is called for entries dropped by eviction or expiry (not for
+    `delete`), e.g. to clean up secondary indexes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: Optional[float] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if not (expires_at and expires_at < time.monotonic()):
+                self._data.move_to_end(key)
+                return value
+            del self._data[key]
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        evicted = []
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                evicted_key, (_, evicted_value) = self._data.popitem(last=False)
+                evicted.append((evicted_key, evicted_value))
+                self.evictions += 1
+        if self.on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache backed by a single SQLite file.
+
+    Survives process restarts. Expired rows are skipped on read and purged
+    opportunistically on write. Calls are blocking; run them in a thread
+    from async code.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at and expires_at < time.time():
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value and purge expired rows."""
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._conn.execute(
+                "DELETE FROM cache WHERE expires_at > 0 AND expires_at < ?", (now,)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+V = TypeVar("V")
+
+
+class TieredCache(Generic[V]):
+    """
+    Async two-tier cache: an LRUCache in front of an optional SQLiteCache.
+
+    Values are stored as JSON. Lookups hit memory first, then disk (copying
+    disk hits into memory); writes go to both. SQLite calls run in a
+    thread. Subclasses convert their values with `_encode`/`_decode` and
+    add their own counters to `stats`.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _encode(self, value: V) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def _decode(self, raw: str) -> V:
+        return json.loads(raw)
+
+    async def get(self, key: str) -> Optional[V]:
+        """Return the cached value for `key`, if any."""
+        raw = self.memory.get(key)
+        if raw is not None:
+            self.memory_hits += 1
+        elif self.disk is not None:
+            raw = await asyncio.to_thread(self.disk.get, key)
+            if raw is not None:
+                self.disk_hits += 1
+                self.memory.set(key, raw)
+
+        if raw is None:
+            self.misses += 1
+            return None
+        return self._decode(raw)
+
+    async def set(self, key: str, value: V) -> None:
+        """Store `value` in both tiers."""
+        raw = self._encode(value)
+        self.memory.set(key, raw)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, raw)
+
+    def stats(self) -> dict:
+        """Entry count and hit/miss counters per tier."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self.memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.memory.evictions,
+        }
@@ -1,21 +1,87 @@
 import io
-from typing import Optional
+import signal
+import threading
+import zipfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 from PyPDF2 import PdfReader
 from docx import Document
+from lxml import etree
 
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+# Bump when extraction output changes, so cached text is re-extracted
+PARSER_VERSION = "2"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_TAGS = tuple(
+    _W + tag for tag in ("p", "t", "tab", "br", "cr", "tc", "tr", "vMerge", "txbxContent")
+)
+
+
+# Uploads arrive as a memoryview of the request buffer (see read_upload)
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class ParseTimeoutError(Exception):
+    """Raised when a document takes longer than its CPU time limit to parse."""
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only stream over a bytes-like object, without copying it."""
+
+    def __init__(self, content: BytesLike):
+        self._view = memoryview(content).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}
+        self._position = max(0, base[whence] + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def _open_buffer(file_content: BytesLike) -> io.BufferedIOBase:
+    """A file object reading `file_content` in place."""
+    if isinstance(file_content, bytes):
+        return io.BytesIO(file_content)  # shares the bytes until written
+    return io.BufferedReader(_BufferReader(file_content))
+
+
+def extract_text_from_pdf(file_content: BytesLike, max_pages: Optional[int] = None) -> str:
     """
     Extract text content from a PDF file.
 
     Args:
-        file_content: The PDF file content as bytes.
+        file_content: The PDF file content (bytes or a memoryview).
+        max_pages: Optional maximum number of pages.
 
     Returns:
         Extracted text from all pages.
+
+    Raises:
+        ValueError: If the PDF has more than `max_pages` pages.
     """
-    pdf_file = io.BytesIO(file_content)
-    reader = PdfReader(pdf_file)
+    reader = PdfReader(_open_buffer(file_content))
+
+    if max_pages is not None and len(reader.pages) > max_pages:
+        raise ValueError(
+            f"The PDF has {len(reader.pages)} pages. "
+            f"Please upload a CV of at most {max_pages} pages."
+        )
 
     text_parts = []
     for page in reader.pages:
@@ -26,52 +92,164 @@ def extract_text_from_pdf(file_content: bytes) -> str:
     return "\n\n".join(text_parts)
 
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_docx(file_content: BytesLike) -> str:
     """
     Extract text content from a DOCX file.
 
+    Streams `word/document.xml`, falling back to python-docx for files the
+    fast path cannot read.
+
     Args:
-        file_content: The DOCX file content as bytes.
+        file_content: The DOCX file content (bytes or a memoryview).
 
     Returns:
-        Extracted text from all paragraphs.
+        Extracted text of paragraphs and table rows, in document order.
     """
-    docx_file = io.BytesIO(file_content)
-    doc = Document(docx_file)
+    try:
+        text = extract_text_from_docx_xml(file_content)
+    except (zipfile.BadZipFile, KeyError, etree.LxmlError):
+        text = ""
+    if text.strip():
+        return text
+    return extract_text_from_docx_document(file_content)
 
-    text_parts = []
-    for paragraph in doc.paragraphs:
-        if paragraph.text.strip():
-            text_parts.append(paragraph.text)
 
-    # Also extract text from tables
-    for table in doc.tables:
-        for row in table.rows:
-            row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-            if row_text:
-                text_parts.append(" | ".join(row_text))
+def extract_text_from_docx_xml(file_content: BytesLike) -> str:
+    """
+    Extract DOCX text by streaming `word/document.xml` with iterparse.
+
+    Avoids building python-docx's object model: elements are discarded as
+    soon as their text is read. Table rows become "cell | cell" lines;
+    cells spanning several columns appear once, and the empty
+    continuation cells of vertically merged cells are skipped. Text in
+    nested tables is part of the enclosing cell, and text boxes are
+    ignored (as with python-docx).
+
+    Raises:
+        zipfile.BadZipFile, KeyError, lxml.etree.LxmlError: If the file is
+            not a readable DOCX document.
+    """
+    lines = []
+    paragraph: list[str] = []
+    cells: list[list[str]] = []  # text of each open table cell, innermost last
+    rows: list[list[str]] = []  # cells of each open table row
+    merged_cells: list[bool] = []  # open cells continuing a vertical merge
+    in_text_box = 0
+
+    with zipfile.ZipFile(_open_buffer(file_content)) as archive:
+        with archive.open("word/document.xml") as xml:
+            for event, elem in etree.iterparse(
+                xml,
+                events=("start", "end"),
+                tag=_DOCX_TAGS,
+                resolve_entities=False,
+                no_network=True,
+            ):
+                tag = elem.tag[len(_W):]
+                if tag == "txbxContent":
+                    in_text_box += 1 if event == "start" else -1
+                    continue
+                if in_text_box:
+                    continue
+
+                if event == "start":
+                    if tag == "tc":
+                        cells.append([])
+                        merged_cells.append(False)
+                    elif tag == "tr":
+                        rows.append([])
+                    continue
+
+                if tag == "t":
+                    if elem.text:
+                        paragraph.append(elem.text)
+                elif tag == "tab":
+                    # w:tab also defines tab stops in paragraph properties
+                    if elem.getparent().tag == _W + "r":
+                        paragraph.append("\t")
+                elif tag in ("br", "cr"):
+                    paragraph.append("\n")
+                elif tag == "p":
+                    text = "".join(paragraph)
+                    paragraph.clear()
+                    if cells:
+                        cells[-1].append(text)
+                    elif text.strip():
+                        lines.append(text)
+                elif tag == "vMerge":
+                    if merged_cells and elem.get(_W + "val") != "restart":
+                        merged_cells[-1] = True
+                elif tag == "tc":
+                    text = "\n".join(cells.pop()).strip()
+                    if not merged_cells.pop() and text and rows:
+                        rows[-1].append(text)
+                elif tag == "tr":
+                    row = rows.pop()
+                    if row:
+                        if cells:
+                            cells[-1].append(" | ".join(row))
+                        else:
+                            lines.append(" | ".join(row))
+
+                # Drop parsed elements so memory stays flat on large files
+                if tag in ("p", "tc", "tr"):
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+
+    return "\n".join(lines)
+
+
+def extract_text_from_docx_document(file_content: BytesLike) -> str:
+    """
+    Extract DOCX text with python-docx.
+
+    Slower than `extract_text_from_docx_xml`; used for files it cannot read.
+    """
+    doc = Document(_open_buffer(file_content))
+
+    text_parts = []
+    for block in doc.iter_inner_content():
+        if hasattr(block, "rows"):
+            seen = set()
+            for row in block.rows:
+                row_text = []
+                for cell in row.cells:
+                    # Merged cells are returned once per grid cell they span
+                    if cell._tc in seen:
+                        continue
+                    seen.add(cell._tc)
+                    cell_text = cell.text.strip()
+                    if cell_text:
+                        row_text.append(cell_text)
+                if row_text:
+                    text_parts.append(" | ".join(row_text))
+        elif block.text.strip():
+            text_parts.append(block.text)
 
     return "\n".join(text_parts)
 
 
 def extract_text_from_file(
-    file_content: bytes,
+    file_content: BytesLike,
     content_type: str,
     filename: Optional[str] = None,
+    max_pages: Optional[int] = None,
 ) -> str:
     """
     Extract text from a file based on its content type.
 
     Args:
-        file_content: The file content as bytes.
+        file_content: The file content (bytes or a memoryview).
         content_type: The MIME type of the file.
         filename: Optional filename for additional type detection.
+        max_pages: Optional maximum number of PDF pages.
 
     Returns:
         Extracted text content.
 
     Raises:
-        ValueError: If the file type is not supported.
+        ValueError: If the file type is not supported or the PDF is too long.
     """
     # Determine file type
     is_pdf = (
@@ -84,7 +262,7 @@ def extract_text_from_file(
     )
 
     if is_pdf:
-        return extract_text_from_pdf(file_content)
+        return extract_text_from_pdf(file_content, max_pages)
     elif is_docx:
         return extract_text_from_docx(file_content)
     else:
@@ -94,6 +272,61 @@ def extract_text_from_file(
         )
 
 
+@contextmanager
+def _cpu_time_limit(seconds: float) -> Iterator[None]:
+    """
+    Raise ParseTimeoutError once the process has used `seconds` of CPU time.
+
+    Uses a profiling interval timer, so only works in a process's main
+    thread (as in process pool workers); elsewhere it does nothing.
+    """
+    if (
+        seconds <= 0
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_timeout(signum, frame):
+        raise ParseTimeoutError(f"Parsing used more than {seconds}s of CPU time")
+
+    previous = signal.signal(signal.SIGPROF, on_timeout)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+
+def extract_text_with_limits(
+    file_content: BytesLike,
+    content_type: str,
+    filename: Optional[str],
+    max_pages: Optional[int],
+    cpu_seconds: float,
+) -> str:
+    """
+    `extract_text_from_file` with a CPU time limit, for parser pool workers.
+
+    Raises:
+        ValueError: If the file type is not supported, the PDF is too long
+            or the file cannot be read.
+        ParseTimeoutError: If parsing exceeds `cpu_seconds` of CPU time.
+    """
+    with _cpu_time_limit(cpu_seconds):
+        try:
+            return extract_text_from_file(file_content, content_type, filename, max_pages)
+        except (ValueError, ParseTimeoutError):
+            raise
+        except Exception as e:
+            # Corrupt or malformed files (bad zip, broken PDF xref, ...)
+            raise ValueError(
+                "Could not read the file. Please ensure it is a valid PDF or DOCX document."
+            ) from e
+
+
 def validate_file(
     file_content: bytes,
     content_type: str,
@@ -0,0 +1,65 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, TypeVar, Union
+
+
+T = TypeVar("T")
+
+
+def fingerprint(*parts: Union[str, bytes, None]) -> str:
+    """Stable SHA-256 fingerprint of the given request parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            part = b""
+        elif isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key onto one execution.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same result (or exception). The work runs in its
+    own task, so one waiter disconnecting does not cancel it for the others.
+    Once the call finishes the key is released and the next call runs fresh.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` once for all concurrent callers using `key`.
+
+        Args:
+            key: Fingerprint identifying identical requests.
+            fn: Zero-argument coroutine factory performing the work.
+
+        Returns:
+            The shared result of `fn`.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.collapsed += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Counters of upstream executions vs collapsed duplicate calls."""
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+        }
@@ -0,0 +1,22 @@
+import json
+
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Format a single Server-Sent Events message.
+
+    Args:
+        event: The event name (e.g. "chunk", "done", "error").
+        data: JSON-serializable payload for the event.
+
+    Returns:
+        The encoded message, terminated by a blank line.
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+}
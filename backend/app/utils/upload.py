@@ -0,0 +1,114 @@
+import asyncio
+from typing import Optional
+from fastapi import HTTPException, UploadFile, status
+
+
+# Leading bytes identifying each accepted upload kind
+_SIGNATURES = {
+    "pdf": (b"%PDF-",),
+    "docx": (b"PK\x03\x04",),  # ZIP container
+    "jpeg": (b"\xff\xd8\xff",),
+    "png": (b"\x89PNG\r\n\x1a\n",),
+}
+
+# Content type passed on to parsers for each kind
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+
+CV_KINDS = ("pdf", "docx")
+IMAGE_KINDS = ("jpeg", "png")
+CV_TYPE_ERROR = "Invalid file type. Please upload a PDF or DOCX file."
+IMAGE_TYPE_ERROR = "Invalid file type. Please upload a JPEG or PNG image."
+
+# First read, holding enough leading bytes for every signature above; also
+# the read size when the upload's size is not known up front
+_CHUNK_SIZE = 64 * 1024
+
+
+def sniff_kind(header: bytes) -> Optional[str]:
+    """Upload kind ("pdf", "docx", "jpeg", "png") from a file's first bytes."""
+    for kind, signatures in _SIGNATURES.items():
+        if header.startswith(signatures):
+            return kind
+    return None
+
+
+async def read_upload(
+    file: UploadFile,
+    kinds: tuple[str, ...],
+    max_size_mb: int,
+    type_error: str,
+) -> tuple[memoryview, str]:
+    """
+    Read an uploaded file after checking its size and type.
+
+    The multipart parser has already spooled the upload (to disk past
+    1MB), so its size is known: oversized files are rejected without being
+    read. The type is sniffed from the first chunk before the rest is read,
+    and the rest goes straight into a buffer sized for the file, so the
+    content is copied out of the spool once and never re-read or joined.
+    The parsers read that buffer in place through the returned memoryview.
+
+    Args:
+        file: The uploaded file.
+        kinds: Accepted kinds (see `CV_KINDS`, `IMAGE_KINDS`).
+        max_size_mb: Maximum file size.
+        type_error: Error detail for files of another type.
+
+    Returns:
+        Tuple of (read-only view of the file content, content type). The
+        content type is detected from the file itself; the one sent by the
+        client is ignored.
+
+    Raises:
+        HTTPException: 413 if the file is too large, 400 if it is empty or
+            not one of `kinds`.
+    """
+    max_bytes = max_size_mb * 1024 * 1024
+
+    def too_large() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size is {max_size_mb}MB.",
+        )
+
+    if file.size is not None and file.size > max_bytes:
+        raise too_large()
+
+    head = await file.read(_CHUNK_SIZE)
+    if not head:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is empty.",
+        )
+
+    kind = sniff_kind(head)
+    if kind not in kinds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=type_error,
+        )
+
+    if file.size is not None:
+        buffer = bytearray(max(file.size, len(head)))
+        buffer[:len(head)] = head
+        filled = len(head)
+        if filled < len(buffer):
+            # Blocking read from the spool, like UploadFile.read past 1MB
+            filled += await asyncio.to_thread(
+                file.file.readinto, memoryview(buffer)[filled:]
+            )
+        del buffer[filled:]
+    else:
+        # Size unknown: read in chunks, stopping as soon as the limit is passed
+        buffer = bytearray(head)
+        while chunk := await file.read(_CHUNK_SIZE):
+            if len(buffer) + len(chunk) > max_bytes:
+                raise too_large()
+            buffer += chunk
+
+    return memoryview(buffer).toreadonly(), CONTENT_TYPES[kind]
@@ -0,0 +1,94 @@
+"""
+Compare the streaming DOCX extractor with the python-docx one.
+
+Builds synthetic CVs (plain paragraphs, and a table-heavy template with
+merged cells) and reports the time and peak memory of each extractor.
+
+Usage (from backend/):
+    python -m benchmarks.docx_extract [--repeat 20] [--scale 1]
+"""
+import argparse
+import io
+import statistics
+import time
+import tracemalloc
+from docx import Document
+from app.utils.document_parser import (
+    extract_text_from_docx_document,
+    extract_text_from_docx_xml,
+)
+
+
+def build_plain_cv(scale: int) -> bytes:
+    doc = Document()
+    for section in range(8 * scale):
+        doc.add_heading(f"Section {section}", level=2)
+        for item in range(10):
+            doc.add_paragraph(
+                f"Led project {section}.{item}, delivering Python, FastAPI and "
+                "PostgreSQL services used by 2M customers.",
+                style="List Bullet",
+            )
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def build_table_cv(scale: int) -> bytes:
+    doc = Document()
+    doc.add_paragraph("Jane Doe - Senior Backend Engineer")
+    for block in range(6 * scale):
+        table = doc.add_table(rows=12, cols=4)
+        # Section title spanning the full width, dates merged down a column
+        table.cell(0, 0).merge(table.cell(0, 3)).text = f"Experience block {block}"
+        table.cell(1, 0).merge(table.cell(11, 0)).text = "2019 - 2024"
+        for row in range(1, 12):
+            table.cell(row, 1).text = f"Company {block}-{row}"
+            table.cell(row, 2).text = "Built event-driven pipelines in Python and Go."
+            table.cell(row, 3).text = "Kafka, Kubernetes, AWS"
+        doc.add_paragraph(f"Notes for block {block}.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(extract, content: bytes, repeat: int) -> tuple[float, float]:
+    """Median milliseconds per call and peak traced memory in KiB."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(content)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    extract(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1, help="document size multiplier")
+    args = parser.parse_args()
+
+    documents = {
+        "plain": build_plain_cv(args.scale),
+        "tables": build_table_cv(args.scale),
+    }
+    print(f"{'document':<10}{'extractor':<14}{'median ms':>11}{'peak KiB':>11}{'speedup':>9}")
+    for name, content in documents.items():
+        if extract_text_from_docx_xml(content) != extract_text_from_docx_document(content):
+            print(f"warning: extractors disagree on {name!r}")
+        baseline_ms, baseline_kib = measure(extract_text_from_docx_document, content, args.repeat)
+        fast_ms, fast_kib = measure(extract_text_from_docx_xml, content, args.repeat)
+        print(f"{name:<10}{'python-docx':<14}{baseline_ms:>11.2f}{baseline_kib:>11.0f}{'':>9}")
+        print(
+            f"{'':<10}{'streaming':<14}{fast_ms:>11.2f}{fast_kib:>11.0f}"
+            f"{baseline_ms / fast_ms:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Shared test setup: offline LLM backend and no Firebase project."""
+import os
+from unittest.mock import MagicMock
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MEAN_SECONDS", "0")
+os.environ.setdefault("FAKE_LLM_LATENCY_STDDEV_SECONDS", "0")
+os.environ.setdefault("DOCUMENT_PARSER_WORKERS", "0")
+
+import firebase_admin  # noqa: E402
+from firebase_admin import credentials, firestore  # noqa: E402
+
+# Services create their Firestore client at import; tests replace the calls
+# they make, so no project or credentials are needed
+credentials.ApplicationDefault = MagicMock()
+firebase_admin.initialize_app = MagicMock()
+firestore.client = MagicMock()
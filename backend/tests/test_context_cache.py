@@ -0,0 +1,51 @@
+import pytest
+from app.services.ai.context_cache import ContextCache
+from app.services.ai import cover_letter_generator
+from app.services.ai.cover_letter_generator import COVER_LETTER_PROMPT, _build_prompt
+
+CV = """Jane Doe
+Backend engineer
+
+Seven years building Python services on Kubernetes, with Redis caching
+and PostgreSQL. """ + "Led the payments platform migration. " * 40
+
+JOB = (
+    "We are hiring a backend engineer to build Python services on Kubernetes. "
+    "Experience with PostgreSQL is a plus."
+)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ContextCache(max_entries=16, ttl_seconds=60)
+    monkeypatch.setattr(cover_letter_generator, "context_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_analysis_is_found_again_from_the_cv_text(cache):
+    context = await cache.open("u1", CV)
+    cache.remember_analysis(context, "Strong backend fit.", ["Go"])
+
+    # The same CV, re-extracted with Windows line endings
+    again = cache.get("u1", CV.replace("\n", "\r\n"))
+    assert again is context
+    assert again.analysis_summary == "Strong backend fit."
+    assert cache.get("u2", CV) is None
+
+
+@pytest.mark.asyncio
+async def test_cover_letter_sends_the_profile_instead_of_the_cv(cache):
+    context = await cache.open("u1", CV)
+    cache.remember_analysis(context, "Strong backend fit.", [])
+
+    prompt, _ = _build_prompt(
+        COVER_LETTER_PROMPT, "Backend Engineer", "Acme", JOB, "classic", None, context
+    )
+
+    assert "payments platform migration" not in prompt
+    assert "Skills matching the job: Python, Kubernetes, PostgreSQL" in prompt
+    assert "Other skills: Redis" in prompt
+    assert "CV review summary: Strong backend fit." in prompt
+    assert cache.stats()["profile_prompts"] == 1
+    assert cache.stats()["input_tokens_saved"] > 300
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from app.services.ai.cover_letter_generator import (
+    build_cover_letter_response,
+    stream_cover_letter,
+)
+from app.services.ai.llm_backend import FAKE_COVER_LETTER
+from app.utils.sse import format_sse
+
+JOB = "Backend engineer working with Python and FastAPI."
+
+
+@pytest.mark.asyncio
+async def test_cover_letter_streams_in_fragments():
+    chunks = [
+        chunk async for chunk in stream_cover_letter("Engineer", "Acme", JOB)
+    ]
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == FAKE_COVER_LETTER
+
+    letter = build_cover_letter_response("Engineer", "Acme", "classic", "".join(chunks), "v1")
+    assert letter.word_count == len(FAKE_COVER_LETTER.split())
+    assert letter.prompt_version == "v1"
+
+
+def test_sse_messages_carry_event_name_and_json_payload():
+    message = format_sse("chunk", {"text": "Dear hiring manager,\n"})
+
+    event, data, blank = message.split("\n", 2)
+    assert event == "event: chunk"
+    assert json.loads(data[len("data: "):]) == {"text": "Dear hiring manager,\n"}
+    assert blank == "\n"
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.cover_letter import CoverLetterVariantsRequest
+from app.services.ai import cover_letter_generator
+from app.services.ai.context_cache import CVContext
+
+JOB = "Backend engineer working with Python, PostgreSQL and Docker."
+
+
+@pytest.mark.asyncio
+async def test_variants_generate_one_letter_per_tone_concurrently(monkeypatch):
+    prompts, in_flight, peak = [], 0, 0
+
+    async def fake_generate(prompt, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"  Letter {len(prompts)}  "
+
+    monkeypatch.setattr(cover_letter_generator, "generate_content", fake_generate)
+    context = CVContext(context_id="c", user_id="u", cv_tokens=500, skills=["Python", "Go"])
+
+    letters = await cover_letter_generator.generate_cover_letter_variants(
+        "Engineer", "Acme", JOB, ["startup", "corporate"], context=context
+    )
+
+    assert [letter.tone for letter in letters] == ["startup", "corporate"]
+    assert all(letter.content.startswith("Letter") for letter in letters)
+    assert peak == 2
+    assert len(set(prompts)) == 2
+    assert all("Python" in prompt for prompt in prompts)
+
+
+def test_variants_request_limits_tones():
+    with pytest.raises(ValidationError):
+        CoverLetterVariantsRequest(
+            job_title="Engineer", company_name="Acme", job_description=JOB, tones=["casual"]
+        )
@@ -0,0 +1,70 @@
+import json
+from unittest.mock import AsyncMock
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("onnxruntime")  # the endpoints package imports rembg
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import CurrentUser, get_current_user  # noqa: E402
+from app.api.v1.endpoints import cv  # noqa: E402
+from app.schemas.cv import CVAnalysisResult  # noqa: E402
+from app.services.ai.context_cache import ContextCache  # noqa: E402
+
+CV_TEXT = "Jane Doe\nBackend engineer with Python and PostgreSQL."
+JOB = "Backend engineer building Python services on Kubernetes and PostgreSQL. " * 2
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def analyze_cv_batch(cv_text, job_descriptions, concurrency):
+        for index, _ in enumerate(job_descriptions):
+            yield index, CVAnalysisResult(
+                overall_score=80 - index, ats_compatibility=70, summary=f"Fit {index}."
+            )
+
+    async def save_analysis(user_id, analysis):
+        if analysis.summary == "Fit 1.":
+            raise RuntimeError("Firestore unavailable")
+        return f"an-{analysis.summary}"
+
+    contexts = ContextCache(max_entries=16, ttl_seconds=60)
+    monkeypatch.setattr(cv, "analyze_cv_batch", analyze_cv_batch)
+    monkeypatch.setattr(cv, "context_cache", contexts)
+    monkeypatch.setattr(cv, "set_user_priority", AsyncMock())
+    monkeypatch.setattr(cv, "get_cv_document_text", AsyncMock(return_value=CV_TEXT))
+    monkeypatch.setattr(cv.cv_service, "save_analysis", save_analysis)
+
+    app = FastAPI()
+    app.include_router(cv.router, prefix=f"{settings.API_V1_PREFIX}/cv")
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser("u1", None, True)
+    return TestClient(app), contexts
+
+
+def test_batch_reports_a_failed_save_and_keeps_streaming(client):
+    client, contexts = client
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/cv/analyze/batch",
+        data={"job_descriptions": [JOB] * 3, "cv_document_id": "a" * 64},
+    )
+
+    events = _events(response.text)
+    assert [(name, data.get("index")) for name, data in events] == [
+        ("result", 0),
+        ("error", 1),
+        ("result", 2),
+        ("done", None),
+    ]
+    assert [r["index"] for r in events[-1][1]["ranking"]] == [0, 2]
+
+    # The analyses are remembered for optimize on the same CV
+    assert contexts.get("u1", CV_TEXT).analysis_summary == "Fit 2."
@@ -0,0 +1,54 @@
+import hashlib
+from unittest.mock import MagicMock
+import pytest
+from app.services.firebase.cv_document_service import CVDocumentService
+
+CONTENT_HASH = hashlib.sha256(b"cv").hexdigest()
+
+
+@pytest.fixture
+def service():
+    service = CVDocumentService()
+    service.db = MagicMock()
+    return service
+
+
+def _doc_ref(service):
+    return service._documents_ref("u1").document.return_value
+
+
+@pytest.mark.asyncio
+async def test_new_document_is_stored_under_its_content_hash(service):
+    doc_ref = _doc_ref(service)
+    doc_ref.get.return_value.exists = False
+
+    document = await service.save_document(
+        "u1", "cv.pdf", "application/pdf", 2, CONTENT_HASH, "Jane Doe, engineer"
+    )
+
+    service._documents_ref("u1").document.assert_called_with(CONTENT_HASH)
+    stored = doc_ref.set.call_args.args[0]
+    assert stored["text"] == "Jane Doe, engineer"
+    assert (document.id, document.word_count) == (CONTENT_HASH, 3)
+
+
+@pytest.mark.asyncio
+async def test_same_file_returns_the_existing_document(service):
+    doc_ref = _doc_ref(service)
+    doc_ref.get.return_value.exists = True
+    doc_ref.get.return_value.id = CONTENT_HASH
+    doc_ref.get.return_value.to_dict.return_value = {"filename": "old.pdf", "wordCount": 5}
+
+    document = await service.save_document(
+        "u1", "new.pdf", "application/pdf", 2, CONTENT_HASH, "Jane Doe"
+    )
+
+    assert document.filename == "old.pdf"
+    doc_ref.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_malformed_ids_are_not_looked_up(service):
+    assert await service.get_document_text("u1", "../other-user") is None
+    assert await service.delete_document("u1", "x" * 64) is False
+    service.db.collection.assert_not_called()
@@ -0,0 +1,50 @@
+import io
+import zipfile
+
+import pytest
+
+from app.utils import document_parser
+from app.utils.document_parser import (
+    extract_text_from_docx,
+    extract_text_from_docx_document,
+    extract_text_from_docx_xml,
+)
+from benchmarks.docx_extract import build_plain_cv, build_table_cv
+
+
+@pytest.mark.parametrize("build", [build_plain_cv, build_table_cv])
+def test_streaming_extractor_matches_python_docx(build):
+    content = build(1)
+
+    assert extract_text_from_docx_xml(content) == extract_text_from_docx_document(content)
+
+
+def test_merged_table_cells_appear_once():
+    text = extract_text_from_docx_xml(build_table_cv(1))
+
+    assert text.count("Experience block 0") == 1
+    assert text.count("2019 - 2024") == 6
+    assert "Company 0-1 | Built event-driven pipelines in Python and Go. | Kafka, Kubernetes, AWS" in text
+
+
+def test_text_boxes_and_tab_stops_are_skipped():
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = (
+        f'<w:document xmlns:w="{w}"><w:body>'
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        "<w:r><w:t>Jane</w:t><w:tab/><w:t>Doe</w:t></w:r></w:p>"
+        "<w:p><w:r><w:txbxContent><w:p><w:r><w:t>Sidebar</w:t></w:r></w:p></w:txbxContent></w:r></w:p>"
+        "</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", body)
+
+    assert extract_text_from_docx_xml(buffer.getvalue()) == "Jane\tDoe"
+
+
+def test_empty_fast_path_result_falls_back_to_python_docx(monkeypatch):
+    monkeypatch.setattr(document_parser, "extract_text_from_docx_xml", lambda content: "")
+    content = build_plain_cv(1)
+
+    assert extract_text_from_docx(content) == extract_text_from_docx_document(content)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from app.services.matching.embeddings import HashingEmbedder
+
+CV = """Jane Doe
+Platform engineer
+
+Deployed services on Kubernetes and Redis, with Jenkins pipelines.
+
+Built machine learning models. Advocate of Unit Testing."""
+
+
+@pytest.mark.parametrize(
+    "query", ["k8s", "redis cache", "jenkins", "machine learning", "unit tests"]
+)
+def test_section_embeddings_keep_skill_features(query):
+    embedder = HashingEmbedder()
+    # "k8s" shares no words with the CV, only the canonical skill
+    assert embedder.embed_sections(CV) @ embedder.embed(query) > 0.1
+
+
+def test_section_embedding_is_the_mean_of_raw_paragraphs():
+    embedder = HashingEmbedder()
+    expected = np.mean([embedder.embed(p) for p in CV.split("\n\n")], axis=0)
+    expected /= np.linalg.norm(expected)
+
+    assert np.allclose(embedder.embed_sections(CV), expected)
+
+
+def test_empty_text_embeds_to_zero():
+    assert not HashingEmbedder().embed_sections("\n\n  \n").any()
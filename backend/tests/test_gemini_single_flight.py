@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.core import telemetry
+from app.core.config import settings
+from app.services.ai import gemini_client
+from app.services.ai.scheduler import set_priority
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    charges = []
+    monkeypatch.setattr(settings, "LLM_COST_LEDGER_ENABLED", True)
+    monkeypatch.setattr(
+        gemini_client.usage_ledger,
+        "record_in_background",
+        lambda user_id, feature, *usage: charges.append((user_id, feature)),
+    )
+    return charges
+
+
+async def _generate_as(user_id: str, tier: str, prompt: str) -> str:
+    telemetry.bind_user(user_id)
+    set_priority(tier)
+    return await gemini_client.generate_content(prompt, feature="test")
+
+
+@pytest.mark.asyncio
+async def test_collapsed_call_is_charged_to_every_waiter(ledger):
+    executions = gemini_client._inflight.executions
+    collapsed = gemini_client._inflight.collapsed
+
+    texts = await asyncio.gather(
+        _generate_as("alice", "free", "shared prompt"),
+        _generate_as("bob", "free", "shared prompt"),
+    )
+
+    assert texts[0] == texts[1]
+    assert gemini_client._inflight.executions == executions + 1
+    assert gemini_client._inflight.collapsed == collapsed + 1
+    assert sorted(ledger) == [("alice", "test"), ("bob", "test")]
+
+
+@pytest.mark.asyncio
+async def test_callers_of_different_tiers_do_not_share_a_flight(ledger):
+    executions = gemini_client._inflight.executions
+
+    await asyncio.gather(
+        _generate_as("alice", "free", "tiered prompt"),
+        _generate_as("carol", "premium", "tiered prompt"),
+    )
+
+    assert gemini_client._inflight.executions == executions + 2
+    assert sorted(ledger) == [("alice", "test"), ("carol", "test")]
@@ -0,0 +1,79 @@
+import importlib
+import pytest
+from app.services.matching.job_profiles import JobProfileStore
+
+# The package re-exports the store instance under the module's name
+job_profiles_module = importlib.import_module("app.services.matching.job_profiles")
+
+POSTING = """Senior Backend Engineer
+
+We are a growing fintech company building payment infrastructure used by
+thousands of merchants across Europe. Our platform team owns the services
+that move money, reconcile ledgers and report to regulators.
+
+Requirements:
+- 5+ years of experience with Python in production
+- Experience designing REST APIs and event-driven systems
+- Solid knowledge of PostgreSQL and query tuning
+- Familiarity with Docker and cloud deployments on AWS
+- Clear written communication and a habit of writing design docs
+
+Nice to have:
+- Experience with Kafka
+- Exposure to payment networks or banking regulation
+
+We offer flexible hours, a learning budget and a hybrid office in Berlin.
+Reference: {reference}
+"""
+
+
+@pytest.fixture
+def store():
+    return JobProfileStore(max_entries=100, ttl_seconds=3600, max_distance=3)
+
+
+def test_near_duplicate_with_the_same_skills_reuses_the_profile(store):
+    first = store.get(POSTING.format(reference="BE-1041"))
+    second = store.get(POSTING.format(reference="BE-1042"))
+
+    assert second is first
+    assert store.stats()["near_duplicate_hits"] == 1
+
+
+def test_near_duplicate_naming_other_skills_gets_its_own_profile(store, monkeypatch):
+    builds = []
+    build = job_profiles_module._build_profile
+    monkeypatch.setattr(
+        job_profiles_module,
+        "_build_profile",
+        lambda *args: builds.append(args[0]) or build(*args),
+    )
+
+    first = store.get(POSTING.format(reference="BE-1041"))
+    second = store.get(POSTING.format(reference="BE-1041").replace("Kafka", "Redis"))
+
+    assert second is not first
+    assert {s.skill for s in second.skills} - {s.skill for s in first.skills} == {"Redis"}
+    assert "Redis" in second.job_description
+    assert len(builds) == 2
+
+
+def test_near_duplicate_hit_does_not_build_a_profile(store, monkeypatch):
+    store.get(POSTING.format(reference="BE-1041"))
+    monkeypatch.setattr(
+        job_profiles_module,
+        "_build_profile",
+        lambda *args: pytest.fail("profile built for a near-duplicate"),
+    )
+
+    store.get(POSTING.format(reference="BE-1042"))
+
+
+def test_evicted_profiles_leave_the_simhash_bands():
+    store = JobProfileStore(max_entries=1, ttl_seconds=3600, max_distance=3)
+
+    store.get(POSTING.format(reference="BE-1041"))
+    latest = store.get("Data engineer with Spark, Airflow and Scala experience. " * 3)
+
+    indexed = {fp for band in store._bands for fps in band.values() for fp in fps}
+    assert indexed == {latest.fingerprint}
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.services.ai.scheduler import current_priority, set_priority
+from app.services.jobs.queue import JobQueue
+from app.services.jobs.store import InMemoryJobStore
+
+
+@pytest_asyncio.fixture
+async def queue():
+    queue = JobQueue(InMemoryJobStore(max_entries=16, ttl_seconds=60), workers=1, max_pending=1)
+    yield queue
+    await queue.stop()
+
+
+async def _finished(queue: JobQueue, job_id: str):
+    job = await queue.store.get(job_id)
+    while not job.finished:
+        job = await queue.store.wait_for_update(job_id, job.version, timeout=1)
+    return job
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_the_submitters_context(queue):
+    set_priority("premium")
+
+    async def runner():
+        return {"tier": current_priority()}
+
+    job = await queue.submit("user-1", "cv_analyze", runner)
+    finished = await _finished(queue, job.id)
+
+    assert finished.status == "succeeded"
+    assert finished.result == {"tier": "premium"}
+    assert finished.started_at is not None and finished.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_http_errors_fail_the_job_with_their_detail(queue):
+    async def runner():
+        raise HTTPException(status_code=422, detail="Unreadable CV")
+
+    job = await queue.submit("user-1", "cv_optimize", runner)
+
+    finished = await _finished(queue, job.id)
+    assert (finished.status, finished.error) == ("failed", "Unreadable CV")
+    assert queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_submissions(queue):
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+        return {}
+
+    running = await queue.submit("user-1", "cv_analyze", blocked)
+    while (await queue.store.get(running.id)).status != "running":
+        await asyncio.sleep(0)
+    await queue.submit("user-1", "cv_analyze", blocked)
+
+    with pytest.raises(HTTPException) as error:
+        await queue.submit("user-1", "cv_analyze", blocked)
+    assert error.value.status_code == 503
+    release.set()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url", ["ftp://example.com/hook", "http://127.0.0.1/hook", "http://localhost/hook", "http://10.0.0.5/"]
+)
+async def test_webhooks_must_be_public_http_urls(queue, url):
+    with pytest.raises(HTTPException) as error:
+        await queue.ensure_accepting(url)
+
+    assert error.value.status_code == 400
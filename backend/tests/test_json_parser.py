@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.ai.cv_analyzer import CV_ANALYSIS_SCHEMA
+from app.services.ai.json_parser import (
+    IncrementalJSONParser,
+    parse_llm_json,
+    require_llm_json,
+)
+
+REPLY = {"score": 80, "tips": ["Add metrics", 'Quote "impact"'], "meta": {"ok": True}}
+
+
+def test_chunked_reply_with_fences_parses_completely():
+    text = "Here you go:\n```json\n" + json.dumps(REPLY) + "\n```"
+    parser = IncrementalJSONParser()
+    for start in range(0, len(text), 7):
+        parser.feed(text[start:start + 7])
+
+    assert parser.complete
+    assert parser.result() == REPLY
+
+
+@pytest.mark.parametrize(
+    "cut, expected",
+    [
+        ('{"score": 80, "tips": ["Add met', {"score": 80, "tips": ["Add met"]}),
+        ('{"score": 80, "tips": [], "meta":', {"score": 80, "tips": []}),
+        ('{"score": 80, "ratio": 0.', {"score": 80}),
+        ('{"score": 80, "meta": {"ok": tr', {"score": 80, "meta": {}}),
+    ],
+)
+def test_truncated_reply_is_repaired(cut, expected):
+    data, complete = parse_llm_json(cut, "test")
+
+    assert data == expected
+    assert complete is False
+
+
+def test_unreadable_reply_is_a_bad_gateway():
+    with pytest.raises(HTTPException) as error:
+        require_llm_json("Sorry, I cannot help with that.", "test")
+
+    assert error.value.status_code == 502
+
+
+def test_analysis_schema_requires_generated_fields_only():
+    properties = CV_ANALYSIS_SCHEMA["properties"]
+
+    assert "id" not in properties and "created_at" not in properties
+    assert set(CV_ANALYSIS_SCHEMA["required"]) == set(properties)
+    assert properties["overall_score"]["type"] in ("INTEGER", "NUMBER")
+    assert properties["keyword_matches"]["items"]["type"] == "OBJECT"
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from app.services.ai.llm_backend import FAKE_COVER_LETTER, FakeBackend, TokenUsage
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_answers_in_the_prompts_expected_shape():
+    backend = FakeBackend(latency_mean=0, latency_stddev=0)
+
+    analysis = await backend.generate('Reply with {"overall_score": ...}', 1024)
+    letter = await backend.generate("Write a cover letter.", 1024)
+
+    assert "overall_score" in json.loads(analysis.text)
+    assert letter.text == FAKE_COVER_LETTER
+    assert letter.usage.input_tokens > 0 and letter.usage.output_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_failures_are_seeded_and_retryable():
+    async def outcomes(seed: int) -> list[bool]:
+        backend = FakeBackend(latency_mean=0, latency_stddev=0, error_rate=0.5, seed=seed)
+        results = []
+        for _ in range(20):
+            try:
+                await backend.generate("prompt", 16)
+                results.append(True)
+            except google_exceptions.ServiceUnavailable:
+                results.append(False)
+        return results
+
+    first = await outcomes(seed=7)
+    assert first == await outcomes(seed=7)
+    assert True in first and False in first
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_streams_text_and_reports_usage():
+    backend = FakeBackend(latency_mean=0, latency_stddev=0)
+    usage = TokenUsage()
+
+    chunks = [chunk async for chunk in backend.stream("Write a cover letter.", 1024, usage)]
+
+    assert "".join(chunks) == FAKE_COVER_LETTER
+    assert usage.output_tokens > 0
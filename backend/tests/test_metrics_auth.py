@@ -0,0 +1,34 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.security import require_metrics_token
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+    async def metrics():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_metrics_are_disabled_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
+
+
+def test_metrics_require_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
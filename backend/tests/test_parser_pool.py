@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.services.documents.parser_pool import DocumentParserPool
+from app.services.documents.text_cache import ParsedTextCache
+from app.utils.cache import LRUCache
+from benchmarks.docx_extract import build_plain_cv
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+@pytest.mark.asyncio
+async def test_worker_process_parses_a_memoryview_upload():
+    pool = DocumentParserPool(workers=1, timeout=30, max_pages=10)
+    data = build_plain_cv(2)
+    try:
+        text = await pool.extract_text(memoryview(bytearray(data)).toreadonly(), DOCX)
+    finally:
+        pool.stop()
+
+    assert text.strip()
+    assert pool.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_same_upload_is_parsed_once():
+    pool = DocumentParserPool(
+        workers=0, timeout=30, max_pages=10, cache=ParsedTextCache(LRUCache(8))
+    )
+    data = build_plain_cv(2)
+
+    first, second = await asyncio.gather(
+        pool.parse(data, DOCX), pool.parse(bytes(data), DOCX)
+    )
+    third = await pool.parse(data, DOCX)
+
+    assert first.text == second.text == third.text
+    assert first.format == "docx"
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["collapsed"] == 1
+    assert pool.cache.stats()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unsupported_documents_are_rejected():
+    pool = DocumentParserPool(workers=0, timeout=30, max_pages=10)
+
+    with pytest.raises(ValueError):
+        await pool.extract_text(b"not a document", DOCX)
+
+    assert pool.stats()["rejected"] == 1
@@ -0,0 +1,32 @@
+from app.services.matching import build_preview, prescore_cv
+
+JOB = (
+    "Senior backend engineer. Required: Python, PostgreSQL and Docker. "
+    "You will design APIs and mentor engineers. Python experience is a must."
+)
+
+
+def test_matching_cv_scores_above_unrelated_cv():
+    strong = prescore_cv(
+        "Backend engineer designing Python APIs on PostgreSQL, deployed with Docker.", JOB
+    )
+    weak = prescore_cv("Pastry chef with ten years of bakery experience.", JOB)
+
+    assert strong.overall_score > weak.overall_score
+    assert set(strong.matched_skills) == {"Python", "PostgreSQL", "Docker"}
+    assert set(weak.missing_skills) == {"Python", "PostgreSQL", "Docker"}
+
+
+def test_missing_high_importance_skills_come_first():
+    score = prescore_cv("Docker and PostgreSQL administrator.", JOB)
+
+    first = score.keyword_matches[0]
+    assert (first.keyword, first.importance, first.found) == ("Python", "high", False)
+    assert first.suggestion
+
+
+def test_preview_summarizes_skill_coverage():
+    preview = build_preview(prescore_cv("Python developer.", JOB))
+
+    assert len(preview.preview_keywords) == 3
+    assert preview.summary_preview.startswith("Your CV covers 1 of 3 key skills")
@@ -0,0 +1,49 @@
+from app.core.config import settings
+from app.services.ai.prompt_budget import (
+    estimate_tokens,
+    normalize_document_text,
+    plan_prompt,
+    trim_to_budget,
+)
+
+
+def test_normalize_joins_hyphenation_and_drops_page_furniture():
+    page = "ACME Corp CV\nManaged deploy-\nment pipelines.\nPage 1 of 3\n"
+    text = page + page.replace("pipelines", "teams").replace("1 of", "2 of") + page
+
+    normalized = normalize_document_text(text)
+
+    assert "deployment" in normalized
+    assert "Page" not in normalized
+    assert normalized.count("ACME Corp CV") == 1
+
+
+def test_trim_keeps_lines_relevant_to_the_reference():
+    text = "\n".join(
+        ["Jane Doe", "jane@example.com", "", "Experience:"]
+        + [f"Organised office party number {i} for the team." for i in range(40)]
+        + ["Built Python and Kubernetes services at scale."]
+    )
+
+    trimmed = trim_to_budget(text, 60, reference="Python Kubernetes engineer")
+
+    assert estimate_tokens(trimmed) <= 60
+    assert trimmed.startswith("Jane Doe")
+    assert "Built Python and Kubernetes services" in trimmed
+
+
+def test_plan_fits_the_input_budget(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_INPUT_TOKEN_BUDGET", 500)
+    cv = "\n".join(f"Line {i}: shipped feature {i} in Python." for i in range(400))
+    job = "We need a Python engineer."
+
+    plan = plan_prompt("cv_analysis", cv, job)
+
+    assert plan.input_tokens <= 500
+    assert plan.tokens_saved > 0
+    assert "Python engineer" in plan.job_description
+    assert 1536 <= plan.max_output_tokens <= 4096
+
+
+def test_cover_letter_output_budget_is_fixed():
+    assert plan_prompt("cover_letter", "", "Short job ad.").max_output_tokens == 1024
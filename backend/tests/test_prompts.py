@@ -0,0 +1,51 @@
+import pytest
+
+from app.core import telemetry
+from app.core.config import settings
+from app.services.ai.prompts import PromptRegistry, PromptTemplate
+
+
+def test_render_fills_fields_and_keeps_escaped_braces():
+    template = PromptTemplate.compile("demo", "v1", 'Hello {name}, reply {{"ok": true}}')
+
+    assert template.fields == frozenset({"name"})
+    assert template.render(name="Jane") == 'Hello Jane, reply {"ok": true}'
+    with pytest.raises(KeyError):
+        template.render()
+
+
+def test_version_changes_with_text_and_fragments():
+    base = PromptTemplate.compile("demo", "v1", "Hi {name}")
+
+    assert base.version.startswith("v1.")
+    assert base.version == PromptTemplate.compile("demo", "v1", "Hi {name}").version
+    assert base.version != PromptTemplate.compile("demo", "v1", "Hey {name}").version
+    assert base.version != PromptTemplate.compile("demo", "v1", "Hi {name}", ["tone"]).version
+
+
+def test_unsupported_fields_are_rejected():
+    with pytest.raises(ValueError):
+        PromptTemplate.compile("demo", "v1", "Hi {user.name}")
+    with pytest.raises(ValueError):
+        PromptTemplate.compile("demo", "v1", "Score {score:.2f}")
+
+
+def test_ab_selection_is_sticky_per_user(monkeypatch):
+    registry = PromptRegistry()
+    registry.register("demo", "a", "A {x}")
+    registry.register("demo", "b", "B {x}")
+    assert registry.select("demo").label == "b"
+
+    monkeypatch.setattr(settings, "PROMPT_AB_TESTS", {"demo": {"a": 1, "b": 1}})
+    labels = set()
+    try:
+        for user in range(20):
+            telemetry.bind_user(f"user-{user}")
+            label = registry.select("demo").label
+            assert registry.select("demo").label == label
+            labels.add(label)
+    finally:
+        telemetry.bind_user(None)
+
+    assert labels == {"a", "b"}
+    assert sum(registry.stats()["demo"].values()) == 41
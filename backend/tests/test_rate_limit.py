@@ -0,0 +1,97 @@
+import threading
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import (
+    ROUTE_COSTS,
+    InMemoryRateLimitBackend,
+    RateLimitMiddleware,
+    charge_rate_limit,
+)
+
+
+def _scope(headers=(), client=("10.0.0.9", 1234)):
+    return {"type": "http", "headers": list(headers), "client": client}
+
+
+@pytest.fixture
+def limiter():
+    return RateLimitMiddleware(None, backend=InMemoryRateLimitBackend(100, 120))
+
+
+@pytest.fixture
+def trust_forwarded(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", 1)
+
+
+@pytest.mark.asyncio
+async def test_forwarded_for_uses_the_address_added_by_the_proxy(limiter, trust_forwarded):
+    # The client sent a fake first entry; the proxy appended the real one
+    scope = _scope([(b"x-forwarded-for", b"1.2.3.4, 203.0.113.7")])
+    assert await limiter._client_key(scope) == "ip:203.0.113.7"
+
+
+@pytest.mark.asyncio
+async def test_forwarded_for_with_several_proxies(limiter, trust_forwarded, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", 2)
+    scope = _scope([(b"x-forwarded-for", b"1.2.3.4, 203.0.113.7, 10.0.0.2")])
+    assert await limiter._client_key(scope) == "ip:203.0.113.7"
+
+    # Fewer entries than proxies: the header is not trusted
+    scope = _scope([(b"x-forwarded-for", b"1.2.3.4")])
+    assert await limiter._client_key(scope) == "ip:10.0.0.9"
+
+
+@pytest.mark.asyncio
+async def test_token_is_verified_off_the_event_loop(limiter, monkeypatch):
+    threads = []
+
+    def verify(token):
+        threads.append(threading.get_ident())
+        return {"uid": "u1"}
+
+    monkeypatch.setattr(rate_limit, "verify_firebase_token", verify)
+    scope = _scope([(b"authorization", b"Bearer abc")])
+
+    assert await limiter._client_key(scope) == "user:u1"
+    assert threads and threads[0] != threading.get_ident()
+    assert scope["state"]["firebase_claims"] == ("abc", {"uid": "u1"})
+
+
+def _batch_client(backend):
+    # Same charging as /cv/analyze/batch, without the AI routers
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, backend=backend)
+
+    @app.post(f"{settings.API_V1_PREFIX}/cv/analyze/batch")
+    async def batch(request: Request, jobs: int):
+        await charge_rate_limit(request, ROUTE_COSTS[("POST", "/cv/analyze")] * (jobs - 1))
+        return {}
+
+    return TestClient(app)
+
+
+def _post_batch(client, jobs):
+    return client.post(f"{settings.API_V1_PREFIX}/cv/analyze/batch", params={"jobs": jobs})
+
+
+def test_batch_analysis_is_charged_per_job():
+    backend = InMemoryRateLimitBackend(100, 120)
+    client = _batch_client(backend)
+
+    assert _post_batch(client, 4).status_code == 200
+
+    (tokens, _), = [backend._buckets.get(key) for key in backend._buckets._data]
+    assert tokens == pytest.approx(100 - 4 * 5, abs=0.1)
+
+
+def test_batch_analysis_beyond_the_bucket_is_limited():
+    client = _batch_client(InMemoryRateLimitBackend(100, 120))
+
+    assert _post_batch(client, 15).status_code == 200  # 75 tokens
+    response = _post_batch(client, 10)  # 50 more
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.services.ai.resilience import hedged
+
+
+def _attempts(*outcomes):
+    """Coroutine factory whose n-th attempt sleeps, then returns or raises."""
+    queue = list(outcomes)
+
+    def fn():
+        delay, outcome = queue.pop(0)
+
+        async def attempt():
+            await asyncio.sleep(delay)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+
+        return attempt()
+
+    return fn
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_over_a_cancelled_first_attempt():
+    fn = _attempts((0.05, asyncio.CancelledError()), (0.1, "hedge"))
+
+    assert await hedged(fn, 0.01) == "hedge"
+
+
+@pytest.mark.asyncio
+async def test_real_error_is_raised_over_a_cancelled_attempt():
+    fn = _attempts((0.05, asyncio.CancelledError()), (0.1, ValueError("boom")))
+
+    with pytest.raises(ValueError):
+        await hedged(fn, 0.01)
+
+
+@pytest.mark.asyncio
+async def test_all_attempts_cancelled_raises_cancelled_error():
+    fn = _attempts((0.05, asyncio.CancelledError()), (0.1, asyncio.CancelledError()))
+
+    with pytest.raises(asyncio.CancelledError):
+        await hedged(fn, 0.01)
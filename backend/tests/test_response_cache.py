@@ -0,0 +1,33 @@
+import pytest
+
+from app.services.ai import cv_analyzer
+from app.services.ai.response_cache import ResponseCache
+
+
+def test_cache_key_ignores_whitespace_but_not_prompt_version():
+    key = ResponseCache.make_key("cv_analysis", "v1", cv_text="Jane  Doe\n", job_description="Dev")
+
+    assert key == ResponseCache.make_key("cv_analysis", "v1", cv_text="Jane Doe", job_description=" Dev")
+    assert key != ResponseCache.make_key("cv_analysis", "v2", cv_text="Jane Doe", job_description="Dev")
+    assert key != ResponseCache.make_key("cv_optimize", "v1", cv_text="Jane Doe", job_description="Dev")
+
+
+@pytest.mark.asyncio
+async def test_repeated_analysis_is_served_from_the_cache(monkeypatch):
+    calls = []
+    generate = cv_analyzer.generate_content
+
+    async def counting_generate(prompt, **kwargs):
+        calls.append(prompt)
+        return await generate(prompt, **kwargs)
+
+    monkeypatch.setattr(cv_analyzer, "generate_content", counting_generate)
+    cv_text = "Jane Doe\nPython developer with FastAPI and Docker experience."
+    job = "Backend engineer: Python, FastAPI, Kubernetes."
+
+    first = await cv_analyzer.analyze_cv(cv_text, job)
+    second = await cv_analyzer.analyze_cv(cv_text + "\n\n", job)
+
+    assert len(calls) == 1
+    assert second.overall_score == first.overall_score
+    assert second.summary == first.summary
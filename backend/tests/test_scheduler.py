@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.ai.scheduler import PriorityScheduler, tier_for_plan
+
+
+async def _hold(pool: PriorityScheduler, tier: str, release: asyncio.Event, order: list):
+    async with pool.slot(5, tier):
+        order.append(tier)
+        await release.wait()
+
+
+async def _settle():
+    """Let started tasks run until they hold a slot or wait in the queue."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_plans_map_to_tiers():
+    assert [tier_for_plan(plan) for plan in ("premium", "free", None)] == [
+        "premium", "free", "anonymous",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reserved_slot_is_kept_for_premium_calls():
+    pool = PriorityScheduler(2, weights={}, premium_reserved=1)
+    release, order = asyncio.Event(), []
+
+    tasks = [asyncio.create_task(_hold(pool, "free", release, order)) for _ in range(2)]
+    await _settle()
+    tasks.append(asyncio.create_task(_hold(pool, "premium", release, order)))
+    await _settle()
+
+    assert order == ["free", "premium"]
+    assert pool.stats()["tiers"]["free"]["queue_depth"] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["free", "premium", "free"]
+
+
+@pytest.mark.asyncio
+async def test_queued_calls_are_served_by_weight():
+    pool = PriorityScheduler(1, weights={"premium": 2, "free": 1}, premium_reserved=0)
+    gate, order = asyncio.Event(), []
+    holder = asyncio.create_task(_hold(pool, "anonymous", gate, order))
+    await _settle()
+
+    released = asyncio.Event()
+    released.set()
+    tasks = [
+        asyncio.create_task(_hold(pool, tier, released, order))
+        for tier in ("free", "free", "premium", "premium")
+    ]
+    await _settle()
+    gate.set()
+    await asyncio.gather(holder, *tasks)
+
+    assert order == ["anonymous", "premium", "free", "premium", "free"]
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_is_a_503():
+    pool = PriorityScheduler(1, weights={}, premium_reserved=0)
+    release, order = asyncio.Event(), []
+    holder = asyncio.create_task(_hold(pool, "free", release, order))
+    await _settle()
+
+    with pytest.raises(HTTPException) as error:
+        async with pool.slot(0.01, "free"):
+            pass
+
+    assert error.value.status_code == 503
+    assert pool.stats()["queue_timeouts"] == 1
+    release.set()
+    await holder
@@ -0,0 +1,44 @@
+from app.services.matching.skill_index import SkillIndex
+
+TAXONOMY = {
+    "languages": {
+        "Java": ("java",),
+        "JavaScript": ("javascript", "js"),
+        "C++": ("c++",),
+    },
+    "frameworks": {
+        "React": ("react", "react.js"),
+        "React Native": ("react native",),
+    },
+}
+
+
+def test_scan_matches_whole_words_case_insensitively():
+    index = SkillIndex(TAXONOMY)
+    text = "Wrote JavaScript and Java; later C++ too."
+
+    matches = index.scan(text)
+
+    assert [m.skill for m in matches] == ["JavaScript", "Java", "C++"]
+    assert [text[m.start:m.end] for m in matches] == ["JavaScript", "Java", "C++"]
+
+
+def test_scan_prefers_the_longest_overlapping_match():
+    index = SkillIndex(TAXONOMY)
+    text = "Shipped React\n  Native apps and a React.js site."
+
+    matches = index.scan(text)
+
+    assert [m.skill for m in matches] == ["React Native", "React"]
+    assert text[matches[0].start:matches[0].end] == "React\n  Native"
+
+
+def test_compare_ranks_repeated_job_skills_as_high_importance():
+    index = SkillIndex(TAXONOMY)
+
+    hits = index.compare("I know Java.", "React and Java. More React!")
+
+    assert [(h.skill, h.found, h.importance) for h in hits] == [
+        ("React", False, "high"),
+        ("Java", True, "medium"),
+    ]
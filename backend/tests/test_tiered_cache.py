@@ -0,0 +1,43 @@
+import pytest
+from app.services.ai.response_cache import ResponseCache
+from app.services.documents.text_cache import ParsedDocument, ParsedTextCache
+from app.utils.cache import LRUCache, SQLiteCache, TieredCache
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"))
+
+
+@pytest.mark.asyncio
+async def test_disk_hits_are_copied_into_memory(disk):
+    await TieredCache(LRUCache(8), disk).set("k", {"a": 1})
+
+    # A fresh process: empty memory tier, same file
+    cache = TieredCache(LRUCache(8), disk)
+    assert await cache.get("k") == {"a": 1}
+    assert await cache.get("k") == {"a": 1}
+    assert await cache.get("missing") is None
+
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_parsed_text_cache_round_trips_documents(disk):
+    document = ParsedDocument(text="Jane Doe", format="pdf", size_bytes=10, parse_ms=12.5)
+    await ParsedTextCache(LRUCache(8), disk).set("k", document)
+
+    cache = ParsedTextCache(LRUCache(8), disk)
+    assert await cache.get("k") == document
+    assert cache.stats()["parse_ms_saved"] == 12.5
+
+
+@pytest.mark.asyncio
+async def test_response_cache_counts_tokens_saved():
+    cache = ResponseCache(LRUCache(8))
+    await cache.set("k", {"score": 80}, tokens=1200)
+
+    assert await cache.get("k") == {"score": 80}
+    assert cache.stats()["estimated_tokens_saved"] == 1200
+    assert cache.stats()["memory_hits"] == 1
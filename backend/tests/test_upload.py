@@ -0,0 +1,79 @@
+from tempfile import SpooledTemporaryFile
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+from app.core.upload_limit import RequestSizeLimitMiddleware
+from app.utils.document_parser import extract_text_from_file
+from app.utils.upload import CV_KINDS, CV_TYPE_ERROR, read_upload
+from benchmarks.docx_extract import build_plain_cv
+
+
+def _upload(data: bytes, size="known") -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=1024)  # rolls to disk like a large upload
+    spool.write(data)
+    spool.seek(0)
+    return UploadFile(spool, size=len(data) if size == "known" else None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", ["known", "unknown"])
+async def test_upload_is_read_into_a_view_the_parsers_accept(size):
+    data = build_plain_cv(5)
+    content, content_type = await read_upload(_upload(data, size), CV_KINDS, 10, CV_TYPE_ERROR)
+
+    assert isinstance(content, memoryview) and content.readonly
+    assert content == data
+    assert extract_text_from_file(content, content_type) == extract_text_from_file(
+        data, content_type
+    )
+
+
+@pytest.mark.asyncio
+async def test_wrong_type_is_rejected_after_the_first_chunk():
+    upload = _upload(b"GIF89a" + b"\0" * 1024 * 1024)
+
+    with pytest.raises(HTTPException) as error:
+        await read_upload(upload, CV_KINDS, 10, CV_TYPE_ERROR)
+
+    assert error.value.status_code == 400
+    assert upload.file.tell() <= 64 * 1024
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", ["known", "unknown"])
+async def test_oversized_upload_is_rejected(size):
+    upload = _upload(b"%PDF-" + b"\0" * (2 * 1024 * 1024), size)
+
+    with pytest.raises(HTTPException) as error:
+        await read_upload(upload, CV_KINDS, 1, CV_TYPE_ERROR)
+
+    assert error.value.status_code == 413
+
+
+@pytest.fixture
+def body_client():
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, max_bytes=1024)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(app)
+
+
+def test_chunked_body_over_the_limit_gets_413(body_client):
+    def chunks():
+        for _ in range(8):
+            yield b"x" * 512
+
+    # A generator body is sent without Content-Length
+    response = body_client.post("/echo", content=chunks())
+
+    assert response.status_code == 413
+
+
+def test_declared_length_over_the_limit_gets_413(body_client):
+    assert body_client.post("/echo", content=b"x" * 2048).status_code == 413
+    assert body_client.post("/echo", content=b"x" * 512).json() == {"size": 512}
@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import AsyncMock
+import pytest
+from fastapi import HTTPException
+from app.schemas.user import UserProfile
+from app.services.firebase import usage_gate
+
+
+@pytest.fixture
+def free_user(monkeypatch):
+    """A free user whose Firestore reads yield to the event loop, like real I/O."""
+    remaining = {"uses": 3}
+
+    async def get_user(uid):
+        await asyncio.sleep(0)
+        return UserProfile(uid=uid, plan="free", free_uses_remaining=remaining["uses"])
+
+    async def decrement_free_uses(uid):
+        remaining["uses"] -= 1
+        return remaining["uses"]
+
+    decrement = AsyncMock(side_effect=decrement_free_uses)
+    monkeypatch.setattr(usage_gate.user_service, "get_user", get_user)
+    monkeypatch.setattr(usage_gate.user_service, "decrement_free_uses", decrement)
+    monkeypatch.setattr(usage_gate, "_held_charges", {})
+    return remaining, decrement
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_charged_once(free_user):
+    _, decrement = free_user
+    started = asyncio.Event()
+
+    async def request():
+        with await usage_gate.authorize_ai_feature("u1", "free", request_key="k"):
+            # The AI call is still running when the duplicate arrives
+            started.set()
+            await asyncio.sleep(0.05)
+
+    first = asyncio.create_task(request())
+    await started.wait()
+    await asyncio.gather(request(), first)
+
+    assert decrement.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_repeat_after_the_first_request_finishes_is_charged_again(free_user):
+    _, decrement = free_user
+
+    for _ in range(2):
+        with await usage_gate.authorize_ai_feature("u1", "free", request_key="k"):
+            pass
+
+    assert decrement.await_count == 2
+    assert usage_gate._held_charges == {}
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_charged_separately(free_user):
+    _, decrement = free_user
+
+    holds = await asyncio.gather(
+        usage_gate.authorize_ai_feature("u1", "free", request_key="a"),
+        usage_gate.authorize_ai_feature("u1", "free", request_key="b"),
+    )
+    for hold in holds:
+        hold.release()
+
+    assert decrement.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicates_share_a_rejected_charge(free_user):
+    remaining, decrement = free_user
+    remaining["uses"] = 0
+
+    results = await asyncio.gather(
+        usage_gate.authorize_ai_feature("u1", "free", request_key="k"),
+        usage_gate.authorize_ai_feature("u1", "free", request_key="k"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, HTTPException) and r.status_code == 402 for r in results)
+    assert decrement.await_count == 0
+    assert usage_gate._held_charges == {}
+
+
+@pytest.mark.asyncio
+async def test_premium_users_are_not_charged(free_user):
+    _, decrement = free_user
+
+    with await usage_gate.authorize_ai_feature("u1", "premium", request_key="k"):
+        pass
+
+    assert decrement.await_count == 0